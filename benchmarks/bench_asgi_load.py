@@ -0,0 +1,427 @@
+"""In-process load harness for FastJWT protected FastAPI routes
+
+The application mirrors `examples/base.py`: a subject getter, a blocklist
+callback, `FastJWT.handle_errors` and routes protected by
+`access_token_required`. Requests are sent straight to the ASGI app, with
+no network, by a fixed number of concurrent clients. Each scenario
+combines a middleware, a token location and a token state:
+
+- valid: token far from expiry
+- refresh: valid token within `JWT_IMPLICIT_REFRESH_DELTATIME`
+- expired, revoked: rejected tokens
+- missing: no token
+- mixed: valid, refresh, expired, revoked & missing tokens, interleaved
+
+Allocations are measured on a separate sequential pass with tracemalloc:
+`alloc_peak_bytes` is the mean peak of memory allocated by a request and
+`retained_blocks` the memory blocks still allocated after it, from the
+difference of two tracemalloc snapshots.
+
+Usage:
+    python benchmarks/bench_asgi_load.py [--requests N] [--concurrency C]
+        [--middleware http,asgi,none] [-k FILTER] [--json PATH|-]
+"""
+
+import gc
+import sys
+import json
+import time
+import asyncio
+import argparse
+import datetime
+import platform
+import statistics
+import tracemalloc
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+from typing import NamedTuple
+from pathlib import Path
+from urllib.parse import urlencode
+
+from fastapi import Depends
+from fastapi import FastAPI
+from starlette.types import ASGIApp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastjwt import FastJWT  # noqa: E402
+from fastjwt import FJWTConfig  # noqa: E402
+from fastjwt.middleware import FastJWTMiddleware  # noqa: E402
+
+SECRET = "SECRET" * 11
+MIDDLEWARES = ("none", "http", "asgi")
+LOCATIONS = ("headers", "cookies", "json", "query")
+STATES = ("valid", "refresh", "expired", "revoked", "missing", "mixed")
+MIXED_STATES = ("valid", "refresh", "expired", "revoked", "missing")
+EXPECTED_STATUS = {
+    "valid": 200,
+    "refresh": 200,
+    # FastJWT.handle_errors maps JWTDecodeError to 422
+    "expired": 422,
+    "revoked": 401,
+    "missing": 401,
+}
+USERS = {
+    "john.doe@test.com": {"name": "John Doe", "email": "john.doe@test.com"},
+}
+UID = "john.doe@test.com"
+
+
+class Scenario(NamedTuple):
+    """A load scenario
+
+    Args:
+        middleware (str): "none", "http" (`implicit_refresh_middleware`)
+            or "asgi" (`FastJWTMiddleware`)
+        location (str): Token location
+        state (str): Token state
+    """
+
+    middleware: str
+    location: str
+    state: str
+
+    @property
+    def name(self) -> str:
+        return "/".join(self)
+
+
+class Probe(NamedTuple):
+    """A request & its expected response
+
+    Args:
+        scope (Dict[str, Any]): ASGI scope
+        body (bytes): Request body
+        status (int): Expected response status
+        refreshed (bool): Whether a refreshed cookie is expected
+    """
+
+    scope: Dict[str, Any]
+    body: bytes
+    status: int
+    refreshed: bool
+
+
+def build_app(middleware: str) -> Tuple[FastAPI, FastJWT, set]:
+    """Build an `examples/base.py` style application
+
+    Args:
+        middleware (str): "none", "http" or "asgi"
+
+    Returns:
+        Tuple[FastAPI, FastJWT, set]: Application, FastJWT instance &
+            revoked tokens
+    """
+    config = FJWTConfig(
+        JWT_SECRET_KEY=SECRET,
+        JWT_COOKIE_SECURE=False,
+        JWT_TOKEN_LOCATION=list(LOCATIONS),
+    )
+    security = FastJWT(config=config)
+    revoked: set = set()
+    security.set_callback_get_model_instance(USERS.get)
+    security.set_callback_token_blocklist(revoked.__contains__)
+
+    app = FastAPI()
+    security.handle_errors(app)
+    if middleware == "http":
+        app.middleware("http")(security.implicit_refresh_middleware)
+    elif middleware == "asgi":
+        app.add_middleware(FastJWTMiddleware, security=security)
+
+    @app.get("/protected", dependencies=[Depends(security.access_token_required)])
+    def protected():
+        return "You have access to this protected route"
+
+    @app.post("/protected", dependencies=[Depends(security.access_token_required)])
+    def protected_json():
+        return "You have access to this protected route"
+
+    @app.get("/me")
+    def profile(user=Depends(security.get_current_subject)):
+        return {"name": user["name"]}
+
+    return app, security, revoked
+
+
+def make_token(security: FastJWT, revoked: set, state: str) -> Optional[str]:
+    if state == "missing":
+        return None
+    expiry = {
+        "valid": datetime.timedelta(hours=1),
+        "refresh": datetime.timedelta(minutes=5),
+        "expired": datetime.timedelta(minutes=-5),
+        "revoked": datetime.timedelta(hours=1),
+    }[state]
+    token = security.create_access_token(uid=UID, expiry=expiry)
+    if state == "revoked":
+        revoked.add(token)
+    return token
+
+
+def make_request(
+    security: FastJWT, location: str, token: Optional[str]
+) -> Tuple[Dict[str, Any], bytes]:
+    """Return the ASGI scope & body of a request carrying a token
+
+    Args:
+        security (FastJWT): FastJWT instance
+        location (str): Token location
+        token (Optional[str]): Encoded token
+
+    Returns:
+        Tuple[Dict[str, Any], bytes]: Scope & body
+    """
+    config = security.config
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"host", b"testserver"),
+        (b"user-agent", b"fastjwt-load"),
+        (b"accept", b"*/*"),
+    ]
+    query = b""
+    body = b""
+    method = "GET"
+    if location == "json":
+        method = "POST"
+        body = json.dumps({config.JWT_JSON_KEY: token} if token else {}).encode()
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+    elif token is not None:
+        if location == "headers":
+            value = f"{config.JWT_HEADER_TYPE} {token}"
+            headers.append((config.JWT_HEADER_NAME.lower().encode(), value.encode()))
+        elif location == "cookies":
+            cookie = f"{config.JWT_ACCESS_COOKIE_NAME}={token}"
+            headers.append((b"cookie", cookie.encode()))
+        else:
+            query = urlencode({config.JWT_QUERY_STRING_NAME: token}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+        "root_path": "",
+        "path": "/protected",
+        "raw_path": b"/protected",
+        "query_string": query,
+        "headers": headers,
+    }
+    return scope, body
+
+
+def make_probes(security: FastJWT, revoked: set, scenario: Scenario) -> List[Probe]:
+    """Return the requests sent by a scenario, in order
+
+    Args:
+        security (FastJWT): FastJWT instance
+        revoked (set): Revoked tokens
+        scenario (Scenario): Load scenario
+
+    Returns:
+        List[Probe]: One request per token state, cycled by the clients
+    """
+    states = MIXED_STATES if scenario.state == "mixed" else (scenario.state,)
+    probes = []
+    for state in states:
+        token = make_token(security, revoked, state)
+        scope, body = make_request(security, scenario.location, token)
+        # Only access cookies about to expire are refreshed, by a middleware
+        refreshed = (
+            state == "refresh"
+            and scenario.location == "cookies"
+            and scenario.middleware != "none"
+        )
+        probes.append(Probe(scope, body, EXPECTED_STATUS[state], refreshed))
+    return probes
+
+
+async def call(app: ASGIApp, scope: Dict[str, Any], body: bytes) -> Tuple[int, bool]:
+    """Send a request to an ASGI application
+
+    Args:
+        app (ASGIApp): Application
+        scope (Dict[str, Any]): Request scope, copied
+        body (bytes): Request body
+
+    Returns:
+        Tuple[int, bool]: Response status & whether a cookie was set
+    """
+    received = False
+    status = 0
+    cookie = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, cookie
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            cookie = any(name == b"set-cookie" for name, _ in message["headers"])
+
+    await app(dict(scope), receive, send)
+    return status, cookie
+
+
+async def load(
+    app: ASGIApp, probes: List[Probe], requests: int, concurrency: int
+) -> Tuple[List[float], float, int]:
+    """Send requests from concurrent clients
+
+    Args:
+        app (ASGIApp): Application
+        probes (List[Probe]): Requests, sent in turn
+        requests (int): Number of requests
+        concurrency (int): Number of clients
+
+    Returns:
+        Tuple[List[float], float, int]: Latencies in seconds, total
+            duration in seconds & number of unexpected responses
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def client() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            probe = probes[remaining % len(probes)]
+            start = time.perf_counter()
+            status, cookie = await call(app, probe.scope, probe.body)
+            latencies.append(time.perf_counter() - start)
+            if status != probe.status or cookie != probe.refreshed:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start, errors
+
+
+async def allocations(
+    app: ASGIApp, probes: List[Probe], requests: int
+) -> Tuple[float, float]:
+    """Measure the memory allocated by sequential requests
+
+    Note:
+        Retained blocks are the difference of two tracemalloc snapshots,
+        ignoring the allocations of tracemalloc itself.
+
+    Returns:
+        Tuple[float, float]: Mean peak allocated bytes & retained blocks
+            per request
+    """
+    peaks = []
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(ignored)
+        for index in range(requests):
+            probe = probes[index % len(probes)]
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            await call(app, probe.scope, probe.body)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(ignored)
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.count_diff for stat in stats) / requests
+    return statistics.mean(peaks), retained
+
+
+async def run_scenario(scenario: Scenario, args: argparse.Namespace) -> Dict[str, Any]:
+    app, security, revoked = build_app(scenario.middleware)
+    probes = make_probes(security, revoked, scenario)
+    await load(app, probes, args.warmup, args.concurrency)
+    latencies, duration, errors = await load(
+        app, probes, args.requests, args.concurrency
+    )
+    alloc_peak, retained = await allocations(app, probes, args.alloc_requests)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "scenario": scenario.name,
+        "middleware": scenario.middleware,
+        "location": scenario.location,
+        "state": scenario.state,
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "unexpected": errors,
+        "rps": len(latencies) / duration,
+        "p50_us": percentiles[49] * 1e6,
+        "p95_us": percentiles[94] * 1e6,
+        "p99_us": percentiles[98] * 1e6,
+        "alloc_peak_bytes": alloc_peak,
+        "retained_blocks": retained,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    header = (
+        f"{'scenario':<26} {'rps':>8} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9}"
+        f" {'alloc B':>9} {'blocks':>7} {'bad':>4}"
+    )
+    print(header, file=sys.stderr)
+    for middleware in args.middleware.split(","):
+        for location in LOCATIONS:
+            for state in STATES:
+                scenario = Scenario(middleware, location, state)
+                if args.filter not in scenario.name:
+                    continue
+                result = await run_scenario(scenario, args)
+                results.append(result)
+                print(
+                    f"{result['scenario']:<26} {result['rps']:>8.0f}"
+                    f" {result['p50_us']:>9.0f} {result['p95_us']:>9.0f}"
+                    f" {result['p99_us']:>9.0f} {result['alloc_peak_bytes']:>9.0f}"
+                    f" {result['retained_blocks']:>7.1f} {result['unexpected']:>4}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--alloc-requests", type=int, default=200)
+    parser.add_argument("--middleware", default="http,asgi")
+    parser.add_argument("-k", "--filter", default="", help="Run scenarios containing")
+    parser.add_argument("--json", help="Write the results as JSON, '-' for stdout")
+    args = parser.parse_args()
+    unknown = set(args.middleware.split(",")) - set(MIDDLEWARES)
+    if unknown:
+        parser.error(f"Unknown middleware {unknown}, choose from {MIDDLEWARES}")
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        report = json.dumps(
+            {"python": platform.python_version(), "results": results}, indent=2
+        )
+        if args.json == "-":
+            print(report)
+        else:
+            Path(args.json).write_text(report + "\n")
+    if any(result["unexpected"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Event loop lag of concurrent RS256 issuance & verification, per offload mode
+
+Usage:
+    python benchmarks/bench_crypto_offload.py [--concurrency N] [--requests N]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import datetime
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastjwt.config import FJWTConfig  # noqa: E402
+from fastjwt.models import RequestToken  # noqa: E402
+from fastjwt.fastjwt import FastJWT  # noqa: E402
+
+
+def make_keys(key_size: int):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+async def worker(fjwt: FastJWT, requests: int) -> None:
+    for i in range(requests):
+        token = await fjwt.create_access_token_async(uid=f"user-{i}")
+        await fjwt.verify_token_async(RequestToken(token=token, location="headers"))
+
+
+async def run(fjwt: FastJWT, concurrency: int, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(fjwt, requests) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--key-size", type=int, default=3072)
+    args = parser.parse_args()
+
+    keys = make_keys(args.key_size)
+    print(f"{'mode':>8} {'tokens/s':>9} {'lag mean ms':>12} {'lag max ms':>11}")
+    for mode in ("inline", "thread", "process"):
+        config = FJWTConfig(
+            JWT_ALGORITHM="RS256",
+            JWT_CRYPTO_OFFLOAD=mode,
+            JWT_CRYPTO_OFFLOAD_LAG_INTERVAL=datetime.timedelta(milliseconds=5),
+        )
+        config.JWT_PRIVATE_KEY, config.JWT_PUBLIC_KEY = keys
+        fjwt = FastJWT(config=config)
+        elapsed = asyncio.run(run(fjwt, args.concurrency, args.requests))
+        stats = fjwt.crypto_offload.stats
+        fjwt.crypto_offload.shutdown()
+        print(
+            f"{mode:>8} {args.concurrency * args.requests / elapsed:>9.0f} "
+            f"{stats.loop_lag.mean * 1e3:>12.2f} {stats.loop_lag.max * 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""HS256 token encode/decode latency, PyJWT versus the native HMAC engine
+
+Usage:
+    python benchmarks/bench_hmac_engine.py [--number N]
+"""
+
+import sys
+import timeit
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastjwt.codec import CODECS  # noqa: E402
+from fastjwt.codec import get_codec  # noqa: E402
+from fastjwt.token import decode_token  # noqa: E402
+from fastjwt.token import create_claims  # noqa: E402
+from fastjwt.token import encode_claims  # noqa: E402
+from fastjwt.engine import HMACEngine  # noqa: E402
+
+KEY = b"SECRET" * 11
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = create_claims(uid="user", type="access", expiry=4_000_000_000)
+    print(f"{'codec':>8} {'engine':>7} {'encode us':>10} {'decode us':>10}")
+    for name, (_, module) in CODECS.items():
+        if module is None:
+            continue
+        codec = get_codec(name)
+        for engine in (None, HMACEngine("HS256", KEY, codec)):
+            token = encode_claims(claims, key=KEY, codec=codec, engine=engine)
+            encode = timeit.timeit(
+                lambda: encode_claims(claims, key=KEY, codec=codec, engine=engine),
+                number=args.number,
+            )
+            decode = timeit.timeit(
+                lambda: decode_token(token, key=KEY, codec=codec, engine=engine),
+                number=args.number,
+            )
+            print(
+                f"{name:>8} {'native' if engine else 'pyjwt':>7} "
+                f"{encode / args.number * 1e6:>10.1f} "
+                f"{decode / args.number * 1e6:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Token encode/decode throughput per JSON codec and payload size
+
+Usage:
+    python benchmarks/bench_json_codec.py [--number N]
+"""
+
+import sys
+import timeit
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastjwt.codec import CODECS  # noqa: E402
+from fastjwt.codec import get_codec  # noqa: E402
+from fastjwt.token import decode_token  # noqa: E402
+from fastjwt.token import create_claims  # noqa: E402
+from fastjwt.token import encode_claims  # noqa: E402
+
+KEY = "SECRET" * 6
+SIZES = (0, 10, 100, 1000)
+
+
+def make_claims(size: int) -> dict:
+    return create_claims(
+        uid="user",
+        type="access",
+        expiry=4_000_000_000,
+        csrf="CSRF",
+        additional_data={f"claim_{i}": [i, f"value-{i}", True] for i in range(size)},
+    )
+
+
+def bench(codec, claims: dict, number: int):
+    token = encode_claims(claims, key=KEY, codec=codec)
+    encode = timeit.timeit(
+        lambda: encode_claims(claims, key=KEY, codec=codec), number=number
+    )
+    decode = timeit.timeit(
+        lambda: decode_token(token, key=KEY, verify=True, codec=codec), number=number
+    )
+    return len(token), encode / number * 1e6, decode / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = [get_codec(n) for n, (_, module) in CODECS.items() if module is not None]
+    print(
+        f"{'claims':>6} {'bytes':>7} {'codec':>8} {'encode us':>10} {'decode us':>10}"
+    )
+    for size in SIZES:
+        claims = make_claims(size)
+        number = max(args.number // max(size // 10, 1), 20)
+        baseline = None
+        for codec in reversed(codecs):
+            length, encode, decode = bench(codec, claims, number)
+            if baseline is None:
+                baseline = (encode, decode)
+            gain = f"x{baseline[0] / encode:.2f} / x{baseline[1] / decode:.2f}"
+            print(
+                f"{size:>6} {length:>7} {codec.name:>8} "
+                f"{encode:>10.1f} {decode:>10.1f}  {gain}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Token, header & cookie sizes per token profile
+
+Usage:
+    python benchmarks/bench_token_size.py [--claims N]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from starlette.responses import Response
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastjwt.config import FJWTConfig  # noqa: E402
+from fastjwt.fastjwt import FastJWT  # noqa: E402
+
+KEY = "SECRET" * 6
+PROFILES = {
+    "standard": {},
+    "standard+compact ids": {"JWT_ID_FORMAT": "compact"},
+    "compact": {"JWT_TOKEN_PROFILE": "compact"},
+    "compact+compact ids": {"JWT_TOKEN_PROFILE": "compact", "JWT_ID_FORMAT": "compact"},
+}
+
+
+def measure(options: dict, data: dict):
+    config = FJWTConfig(
+        JWT_SECRET_KEY=KEY, JWT_TOKEN_LOCATION=["headers", "cookies"], **options
+    )
+    fjwt = FastJWT(config=config)
+    bundle = fjwt.create_token_pair(uid="user-42", data=data)
+    header = len(f"Authorization: Bearer {bundle.access_token}")
+    response = Response()
+    fjwt.set_access_cookies(bundle, response)
+    fjwt.set_refresh_cookies(bundle, response)
+    cookies = sum(
+        len(name) + len(value) + 4
+        for name, value in response.raw_headers
+        if name == b"set-cookie"
+    )
+    return len(bundle.access_token), len(bundle.refresh_token), header, cookies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=3)
+    args = parser.parse_args()
+
+    data = {f"claim_{i}": f"value-{i}" for i in range(args.claims)}
+    aliases = {name: f"c{i}" for i, name in enumerate(data)}
+
+    print(f"{args.claims} custom claims, sizes in bytes")
+    print(f"{'profile':<28} {'access':>7} {'refresh':>8} {'header':>7} {'cookies':>8}")
+    rows = [(name, options) for name, options in PROFILES.items()]
+    if data:
+        rows.append(
+            (
+                "compact+ids+aliases",
+                {**PROFILES["compact+compact ids"], "JWT_CLAIM_ALIASES": aliases},
+            )
+        )
+    baseline = None
+    for name, options in rows:
+        sizes = measure(options, data)
+        baseline = baseline or sizes
+        saved = 100 * (1 - sizes[3] / baseline[3])
+        print(
+            f"{name:<28} {sizes[0]:>7} {sizes[1]:>8} {sizes[2]:>7} {sizes[3]:>8}"
+            f"  (-{saved:.0f}% cookies)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Micro-benchmark suite of the token, model & core hot paths
+
+Cases are parameterized over every AlgorithmType, payload sizes & token
+locations. Each case reports the best per-call time of several repeats.
+The baseline stores costs relative to a pure Python calibration loop,
+measured alternately with each case, so that a baseline recorded on one
+machine can be compared on another.
+
+Usage:
+    python benchmarks/suite.py                      # compare to the baseline
+    python benchmarks/suite.py --save               # record a new baseline
+    python benchmarks/suite.py -k decode --threshold 0.5
+
+Exits with status 1 when a case is slower than its baseline by more than
+the threshold (25% by default).
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import datetime
+import platform
+import warnings
+import statistics
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+from typing import NamedTuple
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.requests import Request  # noqa: E402
+
+from fastjwt.core import _get_token_from_request  # noqa: E402
+from fastjwt.token import create_token  # noqa: E402
+from fastjwt.token import decode_token  # noqa: E402
+from fastjwt.types import AlgorithmType  # noqa: E402
+from fastjwt.config import FJWTConfig  # noqa: E402
+from fastjwt.models import RequestToken  # noqa: E402
+from fastjwt.models import TokenPayload  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SECRET = "SECRET" * 11
+ALGORITHMS: List[AlgorithmType] = [
+    "HS256",
+    "HS384",
+    "HS512",
+    "ES256",
+    "ES256K",
+    "ES384",
+    "ES512",
+    "RS256",
+    "RS384",
+    "RS512",
+    "PS256",
+    "PS384",
+    "PS512",
+]
+SIZES = (0, 10, 100)
+LOCATIONS = ("headers", "cookies", "json", "query")
+CURVES = {
+    "ES256": ec.SECP256R1,
+    "ES256K": ec.SECP256K1,
+    "ES384": ec.SECP384R1,
+    "ES512": ec.SECP521R1,
+}
+
+# Seconds per call measured by a runner for `number` calls
+Runner = Callable[[int], float]
+
+
+class Case(NamedTuple):
+    """A benchmark case
+
+    Args:
+        name (str): Unique case name, `function[parameters]`
+        make (Callable[[], Runner]): Prepares the case and returns its runner
+    """
+
+    name: str
+    make: Callable[[], Runner]
+
+
+def sync_runner(func: Callable[[], Any]) -> Runner:
+    def run(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    return run
+
+
+def async_runner(func: Callable[[], Any]) -> Runner:
+    loop = asyncio.new_event_loop()
+
+    async def batch(number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - start
+
+    return lambda number: loop.run_until_complete(batch(number))
+
+
+def calibration_workload() -> None:
+    """Pure Python reference workload"""
+    data = {str(i): i for i in range(200)}
+    sorted(data.items(), key=lambda item: -item[1])
+
+
+CALIBRATION = sync_runner(calibration_workload)
+
+
+def autorange(run: Runner, min_time: float) -> int:
+    """Return the number of calls lasting at least `min_time` seconds"""
+    number = 1
+    while True:
+        elapsed = run(number)
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+
+def measure(run: Runner, repeat: int, min_time: float) -> Tuple[float, float]:
+    """Measure a case against the calibration workload
+
+    Note:
+        Each measure of the case is paired with a measure of the
+        calibration workload, the relative cost is the median ratio of
+        the pairs. Pairs absorb the speed drifts of shared machines.
+
+    Args:
+        run (Runner): Case runner
+        repeat (int): Number of measures
+        min_time (float): Minimal duration of a measure in seconds
+
+    Returns:
+        Tuple[float, float]: Best time per call in seconds & relative cost
+    """
+    # Calibrating the number of calls warms both runners up
+    number = autorange(run, min_time)
+    reference = autorange(CALIBRATION, min_time / 4)
+    best, ratios = float("inf"), []
+    for _ in range(repeat):
+        seconds = run(number) / number
+        calibration = CALIBRATION(reference) / reference
+        best = min(best, seconds)
+        ratios.append(seconds / calibration)
+    return best, statistics.median(ratios)
+
+
+def _pem(private_key: Any) -> Dict[str, str]:
+    return {
+        "private": private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode(),
+        "public": private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode(),
+    }
+
+
+_KEYS: Dict[str, Dict[str, str]] = {}
+
+
+def keys(algorithm: AlgorithmType) -> Dict[str, str]:
+    """Return the signing & verifying keys of an algorithm, generated once"""
+    family = algorithm if algorithm in CURVES else algorithm[:2]
+    if family not in _KEYS:
+        if family == "HS":
+            _KEYS[family] = {"private": SECRET, "public": SECRET}
+        elif family in ("RS", "PS"):
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            _KEYS["RS"] = _KEYS["PS"] = _pem(key)
+        else:
+            _KEYS[family] = _pem(ec.generate_private_key(CURVES[family]()))
+    return _KEYS[family]
+
+
+def make_data(size: int) -> Dict[str, Any]:
+    return {f"claim_{i}": [i, f"value-{i}", True] for i in range(size)}
+
+
+def make_token(algorithm: AlgorithmType, size: int, csrf: bool = True) -> str:
+    return create_token(
+        uid="user",
+        key=keys(algorithm)["private"],
+        type="access",
+        expiry=datetime.timedelta(days=1),
+        csrf=csrf,
+        algorithm=algorithm,
+        additional_data=make_data(size),
+    )
+
+
+def bench_create_token(algorithm: AlgorithmType, size: int) -> Runner:
+    key = keys(algorithm)["private"]
+    data = make_data(size)
+    expiry = datetime.timedelta(minutes=15)
+    return sync_runner(
+        lambda: create_token(
+            uid="user",
+            key=key,
+            type="access",
+            expiry=expiry,
+            algorithm=algorithm,
+            additional_data=data,
+        )
+    )
+
+
+def bench_decode_token(algorithm: AlgorithmType, size: int) -> Runner:
+    key = keys(algorithm)["public"]
+    token = make_token(algorithm, size)
+    algorithms = [algorithm]
+    return sync_runner(lambda: decode_token(token, key=key, algorithms=algorithms))
+
+
+def bench_request_token_verify(algorithm: AlgorithmType) -> Runner:
+    key = keys(algorithm)["public"]
+    request_token = RequestToken(token=make_token(algorithm, 10), location="headers")
+    algorithms = [algorithm]
+    return sync_runner(
+        lambda: request_token.verify(key=key, algorithms=algorithms, verify_csrf=False)
+    )
+
+
+def bench_payload_parse_obj(size: int) -> Runner:
+    claims = decode_token(make_token("HS256", size), key=SECRET)
+    return sync_runner(lambda: TokenPayload.parse_obj(claims))
+
+
+def bench_core_getter(location: str) -> Runner:
+    config = FJWTConfig(JWT_SECRET_KEY=SECRET, JWT_TOKEN_LOCATION=[location])
+    token = make_token("HS256", 0, csrf=False)
+    headers: List[Any] = [(b"host", b"localhost"), (b"user-agent", b"bench")]
+    query = b""
+    body = b""
+    if location == "headers":
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    elif location == "cookies":
+        cookie = f"session=abc; {config.JWT_ACCESS_COOKIE_NAME}={token}"
+        headers.append((b"cookie", cookie.encode()))
+    elif location == "query":
+        query = f"page=1&{config.JWT_QUERY_STRING_NAME}={token}".encode()
+    else:
+        body = json.dumps({config.JWT_JSON_KEY: token}).encode()
+        headers.append((b"content-type", b"application/json"))
+    method = "POST" if location == "json" else "GET"
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "query_string": query,
+        "headers": headers,
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def get_token() -> RequestToken:
+        return await _get_token_from_request(Request(dict(scope), receive), config)
+
+    return async_runner(get_token)
+
+
+def cases() -> List[Case]:
+    """Return every benchmark case"""
+    suite = []
+    for algorithm in ALGORITHMS:
+        for size in SIZES:
+            suite.append(
+                Case(
+                    f"create_token[{algorithm}-{size}]",
+                    lambda a=algorithm, s=size: bench_create_token(a, s),
+                )
+            )
+            suite.append(
+                Case(
+                    f"decode_token[{algorithm}-{size}]",
+                    lambda a=algorithm, s=size: bench_decode_token(a, s),
+                )
+            )
+        suite.append(
+            Case(
+                f"RequestToken.verify[{algorithm}]",
+                lambda a=algorithm: bench_request_token_verify(a),
+            )
+        )
+    for size in SIZES:
+        suite.append(
+            Case(
+                f"TokenPayload.parse_obj[{size}]",
+                lambda s=size: bench_payload_parse_obj(s),
+            )
+        )
+    for location in LOCATIONS:
+        suite.append(
+            Case(
+                f"core._get_token_from_request[{location}]",
+                lambda loc=location: bench_core_getter(loc),
+            )
+        )
+    return suite
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="Run cases containing")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.02)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Record the baseline")
+    args = parser.parse_args()
+    # TokenPayload.parse_obj is the pydantic v1 API used by fastjwt
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    results: Dict[str, float] = {}
+    regressions = []
+    print(f"{'case':<44} {'us':>10} {'baseline':>10} {'ratio':>7}")
+    for case in cases():
+        if args.filter not in case.name:
+            continue
+        seconds, results[case.name] = measure(case.make(), args.repeat, args.min_time)
+        line = f"{case.name:<44} {seconds * 1e6:>10.2f}"
+        reference = baseline["results"].get(case.name) if baseline else None
+        if reference is not None:
+            ratio = results[case.name] / reference
+            line += f" {seconds / ratio * 1e6:>10.2f} {ratio:>7.2f}"
+            if ratio > 1 + args.threshold:
+                regressions.append(case.name)
+                line += "  SLOWER"
+        print(line, flush=True)
+
+    if args.save:
+        previous = load_baseline(args.baseline) if args.filter else None
+        if previous is not None:
+            results = {**previous["results"], **results}
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "unit": "calibration loop runs",
+                    "results": results,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save to record one")
+        return 0
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) slower than the baseline by more than "
+            f"{args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
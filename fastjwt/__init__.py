@@ -1,6 +1,8 @@
 from fastjwt.config import FJWTConfig
+from fastjwt.models import TokenBundle
 from fastjwt.models import RequestToken
 from fastjwt.models import TokenPayload
+from fastjwt.models import VerifiedClaims
 from fastjwt.fastjwt import FastJWT
 from fastjwt.dependencies import FastJWTDeps
 
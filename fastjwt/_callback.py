@@ -1,9 +1,12 @@
+import inspect
 from typing import Generic
 from typing import TypeVar
 from typing import Optional
 
 from .types import ModelCallback
 from .types import TokenCallback
+from .blocklist import TokenBlocklist
+from .blocklist import RevocationFilter
 
 T = TypeVar("T")
 
@@ -33,6 +36,9 @@ class _CallbackHandler(Generic[T]):
         # Callbcaks
         self.callback_get_model_instance: Optional[ModelCallback[T]] = None
         self.callback_is_token_in_blocklist: Optional[TokenCallback] = None
+        # Backends
+        self.token_blocklist: Optional[TokenBlocklist] = None
+        self.token_blocklist_filter: Optional[RevocationFilter] = None
 
         # Exceptions
         self._callback_model_set_exception = AttributeError(
@@ -94,6 +100,29 @@ class _CallbackHandler(Generic[T]):
         """
         self.callback_is_token_in_blocklist = callback
 
+    def set_token_blocklist_backend(self, backend: TokenBlocklist) -> None:
+        """Set the backend storing revoked token identifiers
+
+        Args:
+            backend (TokenBlocklist): Blocklist backend, checked against
+                the `jti` claim of verified tokens
+        """
+        self.token_blocklist = backend
+
+    def set_token_blocklist_filter(self, revocation_filter: RevocationFilter) -> None:
+        """Set the in-memory filter answering lookups of non revoked tokens
+
+        Note:
+            With a filter, tokens which are definitely not revoked skip the
+            blocklist backend lookup. The filter is synced from the backend,
+            which must implement `TokenBlocklist.revoked`, and is not used
+            without one. The blocklist callback is always called.
+
+        Args:
+            revocation_filter (RevocationFilter): Filter of revoked `jti`
+        """
+        self.token_blocklist_filter = revocation_filter
+
     def set_subject_getter(self, callback: ModelCallback[T]) -> None:
         """Set the callback to run for subject retrieval and serialization
 
@@ -118,6 +147,15 @@ class _CallbackHandler(Generic[T]):
         callback: ModelCallback[T] = self.callback_get_model_instance
         return callback(uid, **kwargs)
 
+    async def _get_current_subject_async(self, uid: str, **kwargs) -> T:
+        """Get the current subject instance, supporting `async def` callbacks"""
+        self._check_model_callback_is_set()
+        callback: ModelCallback[T] = self.callback_get_model_instance
+        result = callback(uid, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
     def is_token_in_blocklist(self, token: str, **kwargs) -> bool:
         """Check if a given token is revoked
 
@@ -130,10 +168,61 @@ class _CallbackHandler(Generic[T]):
         Args:
             token (str): token to check
 
+        Raises:
+            TypeError: The callback is asynchronous,
+                use `_CallbackHandler.is_token_in_blocklist_async`
+
         Returns:
             bool: True if the token is revoked
         """
         if self._check_token_callback_is_set(ignore_errors=True):
             callback: TokenCallback = self.callback_is_token_in_blocklist
-            return callback(token, **kwargs)
+            result = callback(token, **kwargs)
+            if inspect.isawaitable(result):
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise TypeError(
+                    "Asynchronous blocklist callback,"
+                    f" use `{self.__class__.__name__}.is_token_in_blocklist_async`"
+                )
+            return result
         return False
+
+    async def is_token_in_blocklist_async(self, token: str, **kwargs) -> bool:
+        """Check if a given token is revoked, supporting `async def` callbacks
+
+        Note:
+            This method will always return `False`
+            if the token blocklist callback is not set first.
+
+        Args:
+            token (str): token to check
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        if self._check_token_callback_is_set(ignore_errors=True):
+            callback: TokenCallback = self.callback_is_token_in_blocklist
+            result = callback(token, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        return False
+
+    async def is_jti_in_blocklist(self, jti: Optional[str]) -> bool:
+        """Check if a token identifier is stored in the blocklist backend
+
+        Note:
+            This method will always return `False`
+            if no blocklist backend is set.
+            Use `_CallbackHandler.set_token_blocklist_backend` first.
+
+        Args:
+            jti (Optional[str]): token unique identifier
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        if self.token_blocklist is None or jti is None:
+            return False
+        return await self.token_blocklist.contains(jti)
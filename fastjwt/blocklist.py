@@ -0,0 +1,664 @@
+import math
+import time
+import heapq
+import asyncio
+import hashlib
+from abc import ABC
+from abc import abstractmethod
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Set
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Awaitable
+from typing import NamedTuple
+
+if TYPE_CHECKING:
+    from .config import FJWTConfig
+
+LN2_SQUARED = math.log(2) ** 2
+
+
+class _BatchedLookup:
+    """Coalesce concurrent lookups into a single batched call
+
+    Note:
+        Lookups issued during the same event loop iteration are gathered
+        and resolved by one call to `fetch`, which receives the unique keys
+        and returns one result per key, in order. When `fetch` raises or
+        returns another number of results, every lookup of the batch fails.
+
+    Args:
+        fetch (Callable[[List[str]], Awaitable[Sequence[Any]]]): Batched lookup
+    """
+
+    def __init__(self, fetch: Callable[[List[str]], Awaitable[Sequence[Any]]]) -> None:
+        """See help(_BatchedLookup) for more info
+
+        Args:
+            fetch (Callable[[List[str]], Awaitable[Sequence[Any]]]): Batched lookup
+        """
+        self._fetch = fetch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[Dict[str, asyncio.Future]] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, key: str) -> Any:
+        """Lookup a key, batched with concurrent lookups
+
+        Args:
+            key (str): Key to lookup
+
+        Returns:
+            Any: The lookup result
+        """
+        loop = asyncio.get_running_loop()
+        if self._pending is None or self._loop is not loop:
+            self._loop = loop
+            self._pending = {}
+            loop.call_soon(self._dispatch)
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+        # Cancelling one lookup must not cancel the others sharing the future
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Start a lookup of the keys queued since the last batch"""
+        pending, self._pending = self._pending, None
+        task = self._loop.create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[str, asyncio.Future]) -> None:
+        """Fetch a batch of keys and resolve their futures"""
+        keys = list(pending)
+        try:
+            results = list(await self._fetch(keys))
+            if len(results) != len(keys):
+                raise ValueError(
+                    f"Batched lookup returned {len(results)} results"
+                    f" for {len(keys)} keys"
+                )
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, result in zip(keys, results):
+            future = pending[key]
+            if not future.done():
+                future.set_result(result)
+
+
+class TokenBlocklist(ABC):
+    """Base class for revoked token storage backends
+
+    Note:
+        Revoked tokens are identified by their `jti` claim. Backends must
+        implement `revoke` and `contains_many`. Concurrent `contains`
+        calls are coalesced into a single `contains_many` call per event
+        loop iteration. Backends implementing `revoked` can be used with a
+        `RevocationFilter`.
+    """
+
+    def __init__(self) -> None:
+        """Base class for revoked token storage backends"""
+        self._lookup = _BatchedLookup(self.contains_many)
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Add a token to the blocklist
+
+        Args:
+            jti (str): Token unique identifier
+            expires_at (Optional[float], optional): Token expiry timestamp,
+                after which the entry can be discarded. Defaults to None.
+        """
+
+    @abstractmethod
+    async def contains_many(self, jtis: Sequence[str]) -> List[bool]:
+        """Check if tokens are revoked
+
+        Args:
+            jtis (Sequence[str]): Token unique identifiers
+
+        Returns:
+            List[bool]: Whether each token is revoked, in order
+        """
+
+    async def contains(self, jti: str) -> bool:
+        """Check if a token is revoked
+
+        Args:
+            jti (str): Token unique identifier
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        return await self._lookup.get(jti)
+
+    async def revoked(self) -> List[Tuple[str, Optional[float]]]:
+        """List the revoked tokens
+
+        Raises:
+            NotImplementedError: The backend can not list its entries
+
+        Returns:
+            List[Tuple[str, Optional[float]]]: Revoked token identifiers and
+                their expiry timestamp
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} can not list the revoked tokens"
+        )
+
+
+class InMemoryTokenBlocklist(TokenBlocklist):
+    """In-process blocklist storing `jti` with their expiry
+
+    Note:
+        Expired entries are purged on every operation,
+        in O(log n) per purged entry.
+
+    Args:
+        timer (Callable[[], float], optional): Clock used for expiry.
+            Defaults to `time.time`.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.time) -> None:
+        """See help(InMemoryTokenBlocklist) for more info
+
+        Args:
+            timer (Callable[[], float], optional): Clock used for expiry.
+                Defaults to `time.time`.
+        """
+        super().__init__()
+        self.timer = timer
+        self._entries: Dict[str, Optional[float]] = {}
+        self._expiries: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        self._purge()
+        return len(self._entries)
+
+    def _purge(self) -> None:
+        """Remove the entries whose token has expired"""
+        expiries = self._expiries
+        if not expiries:
+            return
+        now = self.timer()
+        while expiries and expiries[0][0] <= now:
+            expires_at, jti = heapq.heappop(expiries)
+            # The jti may have been revoked again with another expiry
+            if self._entries.get(jti, None) == expires_at:
+                del self._entries[jti]
+
+    def _contains(self, jti: str) -> bool:
+        """Whether a token is revoked, without awaiting"""
+        self._purge()
+        return jti in self._entries
+
+    async def revoke(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Add a token to the blocklist
+
+        Args:
+            jti (str): Token unique identifier
+            expires_at (Optional[float], optional): Token expiry timestamp.
+                Defaults to None (never purged).
+        """
+        self._purge()
+        self._entries[jti] = expires_at
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, jti))
+
+    async def contains_many(self, jtis: Sequence[str]) -> List[bool]:
+        """Check if tokens are revoked
+
+        Args:
+            jtis (Sequence[str]): Token unique identifiers
+
+        Returns:
+            List[bool]: Whether each token is revoked
+        """
+        return [self._contains(jti) for jti in jtis]
+
+    async def contains(self, jti: str) -> bool:
+        """Check if a token is revoked
+
+        Note:
+            In-memory lookups are not batched
+
+        Args:
+            jti (str): Token unique identifier
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        return self._contains(jti)
+
+    async def revoked(self) -> List[Tuple[str, Optional[float]]]:
+        """List the revoked tokens
+
+        Returns:
+            List[Tuple[str, Optional[float]]]: Revoked token identifiers and
+                their expiry timestamp
+        """
+        self._purge()
+        return list(self._entries.items())
+
+
+class RedisTokenBlocklist(TokenBlocklist):
+    """Blocklist stored in Redis
+
+    Note:
+        The client must implement the asynchronous `redis.asyncio.Redis`
+        `set` & `mget` methods, and `scan_iter` & `ttl` to list the revoked
+        tokens. Entries are stored with an expiry so that
+        Redis discards them once the token expired. Concurrent lookups are
+        sent as a single `MGET` command.
+
+    Args:
+        client (Any): Asynchronous Redis client
+        prefix (str, optional): Prefix of the stored keys.
+            Defaults to "fastjwt:blocklist:".
+    """
+
+    def __init__(self, client: Any, prefix: str = "fastjwt:blocklist:") -> None:
+        """See help(RedisTokenBlocklist) for more info
+
+        Args:
+            client (Any): Asynchronous Redis client
+            prefix (str, optional): Prefix of the stored keys.
+                Defaults to "fastjwt:blocklist:".
+        """
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+
+    async def revoke(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Add a token to the blocklist
+
+        Args:
+            jti (str): Token unique identifier
+            expires_at (Optional[float], optional): Token expiry timestamp.
+                Defaults to None (never expires).
+        """
+        if expires_at is None:
+            await self.client.set(f"{self.prefix}{jti}", 1)
+            return
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self.client.set(f"{self.prefix}{jti}", 1, ex=ttl)
+
+    async def contains_many(self, jtis: Sequence[str]) -> List[bool]:
+        """Check if tokens are revoked with a single `MGET` command
+
+        Args:
+            jtis (Sequence[str]): Token unique identifiers
+
+        Returns:
+            List[bool]: Whether each token is revoked
+        """
+        values = await self.client.mget([f"{self.prefix}{jti}" for jti in jtis])
+        return [value is not None for value in values]
+
+    async def revoked(self) -> List[Tuple[str, Optional[float]]]:
+        """List the revoked tokens with `SCAN` & `TTL` commands
+
+        Returns:
+            List[Tuple[str, Optional[float]]]: Revoked token identifiers and
+                their expiry timestamp
+        """
+        revoked: List[Tuple[str, Optional[float]]] = []
+        start = len(self.prefix)
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            if isinstance(key, bytes):
+                key = key.decode()
+            ttl = await self.client.ttl(key)
+            if ttl == -2:
+                # Expired while listing
+                continue
+            expires_at = None if ttl < 0 else time.time() + ttl
+            revoked.append((key[start:], expires_at))
+        return revoked
+
+
+class BloomFilter:
+    """Fixed size Bloom filter of strings
+
+    Args:
+        capacity (int): Expected number of items
+        error_rate (float): False positive rate at full capacity
+    """
+
+    __slots__ = ("capacity", "error_rate", "size", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """See help(BloomFilter) for more info
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): False positive rate at full capacity
+        """
+        if capacity <= 0:
+            raise ValueError("Bloom filter 'capacity' must be a positive integer")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter 'error_rate' must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / LN2_SQUARED))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, item: str) -> Iterator[int]:
+        """Bit positions of an item, by double hashing"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % size
+
+    def add(self, item: str) -> None:
+        """Add an item
+
+        Args:
+            item (str): Item to add
+        """
+        bits = self._bits
+        for index in self._indexes(item):
+            bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for index in self._indexes(item):
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+
+class _ExpiringBloomFilter(BloomFilter):
+    """Bloom filter tracking the latest expiry of its items"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """See help(BloomFilter) for more info
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): False positive rate at full capacity
+        """
+        super().__init__(capacity, error_rate)
+        self.expires_at = -math.inf
+
+    @property
+    def full(self) -> bool:
+        """Whether the filter holds as many items as its capacity"""
+        return self.count >= self.capacity
+
+
+def _add_to_filters(
+    filters: List[_ExpiringBloomFilter],
+    item: str,
+    expires_at: float,
+    capacity: int,
+    error_rate: float,
+) -> None:
+    """Add an item to the last filter, starting a new one when it is full"""
+    if not filters or filters[-1].full:
+        filters.append(_ExpiringBloomFilter(capacity, error_rate))
+    filters[-1].add(item)
+    filters[-1].expires_at = max(filters[-1].expires_at, expires_at)
+
+
+class FilterInfo(NamedTuple):
+    """Statistics of a RevocationFilter
+
+    Args:
+        checks (int): Number of lookups
+        saved (int): Lookups answered as "not revoked" without blocklist call
+        false_positives (int): Possible hits the blocklist reported as not revoked
+        generations (int): Number of live generations
+    """
+
+    checks: int
+    saved: int
+    false_positives: int
+    generations: int
+
+
+class RevocationFilter:
+    """Time partitioned Bloom filter of revoked `jti`
+
+    Note:
+        The filter answers "definitely not revoked" without calling the
+        blocklist backend. It is built from the backend with `sync`, then
+        kept up to date with `add` (e.g. via `FastJWT.revoke_token`).
+        Revocations made by other processes, or directly in the backend,
+        are only known after the next `sync`.
+
+    Note:
+        Revoked identifiers are stored in the generation covering their
+        expiry. Generations span `period` seconds and are dropped once
+        the tokens they hold are expired. Identifiers expiring beyond the
+        last generation, or without expiry, are stored in filters holding
+        up to `capacity` identifiers each, so that the false positive rate
+        of every filter stays under `error_rate`. A filter of identifiers
+        expiring later is dropped once its last identifier is expired.
+        Filters of identifiers without expiry are kept until `reset`,
+        which rebuilds the filter from the revocations of a blocklist.
+
+    Args:
+        capacity (int): Expected number of revocations per generation
+        error_rate (float, optional): False positive rate at full capacity.
+            Defaults to 0.001.
+        period (float, optional): Generation span in seconds.
+            Defaults to 900.
+        generations (int, optional): Number of rotating generations.
+            Defaults to 2.
+        timer (Callable[[], float], optional): Clock used for rotation.
+            Defaults to `time.time`.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        period: float = 900,
+        generations: int = 2,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        """See help(RevocationFilter) for more info
+
+        Args:
+            capacity (int): Expected number of revocations per generation
+            error_rate (float, optional): False positive rate at full capacity.
+                Defaults to 0.001.
+            period (float, optional): Generation span in seconds.
+                Defaults to 900.
+            generations (int, optional): Number of rotating generations.
+                Defaults to 2.
+            timer (Callable[[], float], optional): Clock used for rotation.
+                Defaults to `time.time`.
+        """
+        if period <= 0:
+            raise ValueError("Revocation filter 'period' must be positive")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.period = period
+        self.generations = max(1, generations)
+        self.timer = timer
+        self.checks = 0
+        self.saved = 0
+        self.false_positives = 0
+        self.synced_at: Optional[float] = None
+        # Revocations added while syncing, None if not syncing
+        self._pending: Optional[List[Tuple[str, Optional[float]]]] = None
+        self._epoch = self._get_epoch(timer())
+        self._rotating: Dict[int, BloomFilter] = {}
+        self._long_lived: List[_ExpiringBloomFilter] = []
+        self._persistent: List[_ExpiringBloomFilter] = []
+
+    @classmethod
+    def from_config(cls, config: "FJWTConfig") -> Optional["RevocationFilter"]:
+        """Build the filter described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_BLOCKLIST_FILTER_*`
+                options and `JWT_ACCESS_TOKEN_EXPIRES` as rotation period
+
+        Returns:
+            Optional[RevocationFilter]: The filter, None if disabled
+        """
+        if config.JWT_BLOCKLIST_FILTER_CAPACITY <= 0:
+            return None
+        period = config.JWT_ACCESS_TOKEN_EXPIRES
+        return cls(
+            capacity=config.JWT_BLOCKLIST_FILTER_CAPACITY,
+            error_rate=config.JWT_BLOCKLIST_FILTER_ERROR_RATE,
+            period=period.total_seconds() if period else 900,
+        )
+
+    def _get_epoch(self, timestamp: float) -> int:
+        """Rotation period holding a timestamp"""
+        return int(timestamp // self.period)
+
+    def _rotate(self) -> None:
+        """Drop the filters whose tokens have all expired"""
+        epoch = self._get_epoch(self.timer())
+        if epoch != self._epoch:
+            self._epoch = epoch
+            for expired in [e for e in self._rotating if e < epoch]:
+                del self._rotating[expired]
+            self._long_lived = [
+                bloom
+                for bloom in self._long_lived
+                if self._get_epoch(bloom.expires_at) >= epoch
+            ]
+
+    def reset(self, revoked: Iterable[Tuple[str, Optional[float]]] = ()) -> None:
+        """Drop every registered identifier and register new revocations
+
+        Note:
+            Use it to rebuild the filter from the blocklist store on a
+            schedule, e.g. to forget tokens without expiry which are no
+            longer revoked.
+
+        Args:
+            revoked (Iterable[Tuple[str, Optional[float]]], optional): Revoked
+                identifiers and their expiry timestamp. Defaults to ().
+        """
+        self._rotating = {}
+        self._long_lived = []
+        self._persistent = []
+        for jti, expires_at in revoked:
+            self.add(jti, expires_at=expires_at)
+
+    @property
+    def syncing(self) -> bool:
+        """Whether a `sync` is running"""
+        return self._pending is not None
+
+    async def sync(self, blocklist: TokenBlocklist) -> None:
+        """Rebuild the filter from the revocations of a blocklist backend
+
+        Note:
+            Revocations added while the backend is listed are kept.
+
+        Args:
+            blocklist (TokenBlocklist): Backend listing the revoked tokens
+
+        Raises:
+            NotImplementedError: The backend can not list its entries
+        """
+        self._pending = []
+        try:
+            revoked = await blocklist.revoked()
+        finally:
+            pending, self._pending = self._pending, None
+        self.reset([*revoked, *pending])
+        self.synced_at = self.timer()
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Register a revoked token identifier
+
+        Args:
+            jti (str): Token unique identifier
+            expires_at (Optional[float], optional): Token expiry timestamp.
+                Defaults to None.
+        """
+        if self._pending is not None:
+            self._pending.append((jti, expires_at))
+        self._rotate()
+        if expires_at is None:
+            _add_to_filters(
+                self._persistent, jti, math.inf, self.capacity, self.error_rate
+            )
+            return
+        epoch = self._get_epoch(expires_at)
+        if epoch < self._epoch:
+            # Already expired
+            return
+        if epoch >= self._epoch + self.generations:
+            _add_to_filters(
+                self._long_lived, jti, expires_at, self.capacity, self.error_rate
+            )
+            return
+        generation = self._rotating.get(epoch)
+        if generation is None:
+            generation = self._rotating[epoch] = BloomFilter(
+                self.capacity, self.error_rate
+            )
+        generation.add(jti)
+
+    def might_contain(self, jti: Optional[str]) -> bool:
+        """Check if a token identifier might be revoked
+
+        Args:
+            jti (Optional[str]): Token unique identifier
+
+        Returns:
+            bool: False if the token is definitely not revoked
+        """
+        self.checks += 1
+        if jti is None:
+            return True
+        self._rotate()
+        if (
+            any(jti in generation for generation in self._rotating.values())
+            or any(jti in bloom for bloom in self._long_lived)
+            or any(jti in bloom for bloom in self._persistent)
+        ):
+            return True
+        self.saved += 1
+        return False
+
+    def record_lookup(self, revoked: bool) -> None:
+        """Record the blocklist answer for a possible hit
+
+        Args:
+            revoked (bool): Whether the blocklist reported the token as revoked
+        """
+        if not revoked:
+            self.false_positives += 1
+
+    def info(self) -> FilterInfo:
+        """Return the filter statistics
+
+        Returns:
+            FilterInfo: checks, saved lookups, false positives & generations
+        """
+        return FilterInfo(
+            self.checks, self.saved, self.false_positives, len(self._rotating)
+        )
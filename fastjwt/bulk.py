@@ -0,0 +1,250 @@
+import time
+import functools
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import NamedTuple
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from .codec import JSONCodec
+from .token import encode_claims
+from .types import StrOrSeq
+from .types import TokenType
+from .types import AlgorithmType
+from .types import DateTimeExpression
+from .engine import HMACEngine
+
+# Signing job: claims & headers of one token
+SigningJob = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+class TokenSpec(NamedTuple):
+    """Description of a token to issue with `FastJWT.create_tokens_bulk`
+
+    Args:
+        uid (str): Unique identifier to generate token for
+        type (TokenType, optional): Token type. Defaults to "access".
+        fresh (bool, optional): Generate fresh token. Defaults to False.
+        headers (Optional[Dict[str, Any]], optional): Additional headers.
+            Defaults to None.
+        expiry (Optional[DateTimeExpression], optional): User defined expiry claim.
+            Defaults to None.
+        data (Optional[Dict[str, Any]], optional): Additional data store in token.
+            Defaults to None.
+        audience (Optional[StrOrSeq], optional): Audience claim. Defaults to None.
+    """
+
+    uid: str
+    type: TokenType = "access"
+    fresh: bool = False
+    headers: Optional[Dict[str, Any]] = None
+    expiry: Optional[DateTimeExpression] = None
+    data: Optional[Dict[str, Any]] = None
+    audience: Optional[StrOrSeq] = None
+
+
+class BulkStats(NamedTuple):
+    """Throughput of a bulk issuance
+
+    Args:
+        count (int): Number of tokens issued
+        elapsed (float): Time elapsed since the first token, in seconds
+    """
+
+    count: int
+    elapsed: float
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Number of tokens issued per second"""
+        return self.count / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@functools.lru_cache(maxsize=16)
+def _prepare_key(algorithm: AlgorithmType, key: Union[str, bytes]) -> Any:
+    """Parse a signing key, run once per worker process"""
+    return jwt.get_algorithm_by_name(algorithm).prepare_key(key)
+
+
+def _sign_chunk(
+    algorithm: AlgorithmType,
+    key: Any,
+    jobs: List[SigningJob],
+    codec: Optional[JSONCodec] = None,
+) -> List[str]:
+    """Sign a chunk of tokens, run by the executor workers"""
+    if isinstance(key, (str, bytes)):
+        # Parsed once per worker
+        key = _prepare_key(algorithm, key)
+    return [
+        encode_claims(
+            claims, key=key, algorithm=algorithm, headers=headers, codec=codec
+        )
+        for claims, headers in jobs
+    ]
+
+
+def _export_key(key: Any) -> Union[str, bytes]:
+    """Serialize a parsed key to send it to worker processes"""
+    if isinstance(key, (str, bytes)):
+        return key
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+class BulkTokens(Iterator[str]):
+    """Iterator over tokens issued in bulk, in input order
+
+    Note:
+        Jobs are consumed lazily. When an executor is provided, at most
+        `window` chunks of `chunksize` tokens are signed ahead of the
+        consumer.
+
+    Args:
+        jobs (Iterable[SigningJob]): Claims & headers of the tokens
+        algorithm (AlgorithmType): Signing algorithm
+        key (Any): Prepared signing key
+        codec (Optional[JSONCodec], optional): Claims serialization.
+            Defaults to None.
+        engine (Optional[HMACEngine], optional): Native HMAC engine used
+            for inline signing. Defaults to None.
+        executor (Optional[Executor], optional): Pool used to sign tokens.
+            Defaults to None (inline signing).
+        chunksize (int, optional): Tokens per executor job. Defaults to 64.
+        window (int, optional): Maximum pending executor jobs.
+            Defaults to 16.
+        timer (Callable[[], float], optional): Clock used for throughput.
+            Defaults to `time.perf_counter`.
+
+    Attributes:
+        stats (BulkStats): Throughput of the tokens issued so far
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[SigningJob],
+        algorithm: AlgorithmType,
+        key: Any,
+        codec: Optional[JSONCodec] = None,
+        engine: Optional[HMACEngine] = None,
+        executor: Optional[Executor] = None,
+        chunksize: int = 64,
+        window: int = 16,
+        timer: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """See help(BulkTokens) for more info
+
+        Args:
+            jobs (Iterable[SigningJob]): Claims & headers of the tokens
+            algorithm (AlgorithmType): Signing algorithm
+            key (Any): Prepared signing key
+            codec (Optional[JSONCodec], optional): Claims serialization.
+                Defaults to None.
+            engine (Optional[HMACEngine], optional): Native HMAC engine used
+                for inline signing. Defaults to None.
+            executor (Optional[Executor], optional): Pool used to sign tokens.
+                Defaults to None (inline signing).
+            chunksize (int, optional): Tokens per executor job. Defaults to 64.
+            window (int, optional): Maximum pending executor jobs.
+                Defaults to 16.
+            timer (Callable[[], float], optional): Clock used for throughput.
+                Defaults to `time.perf_counter`.
+        """
+        if chunksize <= 0 or window <= 0:
+            raise ValueError("'chunksize' and 'window' must be positive integers")
+        self.timer = timer
+        self._count = 0
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+        if executor is None:
+            self._tokens = self._sign_inline(jobs, algorithm, key, codec, engine)
+        else:
+            if isinstance(executor, ProcessPoolExecutor):
+                key = _export_key(key)
+            self._tokens = self._sign_in_executor(
+                jobs, algorithm, key, codec, executor, chunksize, window
+            )
+
+    @property
+    def stats(self) -> BulkStats:
+        """Throughput of the tokens issued so far"""
+        if self._started is None:
+            return BulkStats(0, 0.0)
+        stopped = self._stopped if self._stopped is not None else self.timer()
+        return BulkStats(self._count, stopped - self._started)
+
+    def __iter__(self) -> "BulkTokens":
+        return self
+
+    def __next__(self) -> str:
+        if self._started is None:
+            self._started = self.timer()
+        try:
+            token = next(self._tokens)
+        except StopIteration:
+            if self._stopped is None:
+                self._stopped = self.timer()
+            raise
+        self._count += 1
+        return token
+
+    @staticmethod
+    def _sign_inline(
+        jobs: Iterable[SigningJob],
+        algorithm: AlgorithmType,
+        key: Any,
+        codec: Optional[JSONCodec],
+        engine: Optional[HMACEngine],
+    ) -> Iterator[str]:
+        """Sign the tokens one by one in the calling thread"""
+        for claims, headers in jobs:
+            yield encode_claims(
+                claims,
+                key=key,
+                algorithm=algorithm,
+                headers=headers,
+                codec=codec,
+                engine=engine,
+            )
+
+    @staticmethod
+    def _sign_in_executor(
+        jobs: Iterable[SigningJob],
+        algorithm: AlgorithmType,
+        key: Any,
+        codec: Optional[JSONCodec],
+        executor: Executor,
+        chunksize: int,
+        window: int,
+    ) -> Iterator[str]:
+        """Sign the tokens by chunks, keeping a window of chunks in flight"""
+        pending: "deque[Future[List[str]]]" = deque()
+        chunk: List[SigningJob] = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) == chunksize:
+                pending.append(
+                    executor.submit(_sign_chunk, algorithm, key, chunk, codec)
+                )
+                chunk = []
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(executor.submit(_sign_chunk, algorithm, key, chunk, codec))
+        while pending:
+            yield from pending.popleft().result()
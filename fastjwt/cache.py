@@ -0,0 +1,372 @@
+import time
+import asyncio
+import hashlib
+import threading
+from typing import Any
+from typing import Tuple
+from typing import Generic
+from typing import TypeVar
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import Awaitable
+from typing import NamedTuple
+from collections import OrderedDict
+
+from .config import FJWTConfig
+from .models import IssuedToken
+from .models import VerifiedClaims
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a FastJWT cache
+
+    Args:
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups not found or expired
+        maxsize (int): Maximum number of entries
+        currsize (int): Current number of entries
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU mapping whose entries expire at an absolute timestamp
+
+    Args:
+        maxsize (int): Maximum number of entries. The least recently used
+            entry is evicted once the cache is full.
+        ttl (Optional[float], optional): Default time to live in seconds.
+            Defaults to None (entries only expire at their own deadline).
+        timer (Callable[[], float], optional): Clock used for expiry.
+            Defaults to `time.time`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        """See help(TTLCache) for more info
+
+        Args:
+            maxsize (int): Maximum number of entries
+            ttl (Optional[float], optional): Default time to live in seconds.
+                Defaults to None.
+            timer (Callable[[], float], optional): Clock used for expiry.
+                Defaults to `time.time`.
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache 'maxsize' must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return the value stored for a key if it has not expired
+
+        Args:
+            key (K): Entry key
+            default (Optional[V], optional): Value to return on miss.
+                Defaults to None.
+
+        Returns:
+            Optional[V]: The cached value or `default`
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self.timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """Store a value
+
+        Args:
+            key (K): Entry key
+            value (V): Entry value
+            expires_at (Optional[float], optional): Absolute expiry timestamp.
+                The earliest of `expires_at` and the cache `ttl` is used.
+                Defaults to None.
+        """
+        if self.ttl is not None:
+            deadline = self.timer() + self.ttl
+            expires_at = deadline if expires_at is None else min(expires_at, deadline)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove an entry
+
+        Args:
+            key (K): Entry key
+            default (Optional[V], optional): Value to return if the key is
+                not cached. Defaults to None.
+
+        Returns:
+            Optional[V]: The removed value or `default`
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics
+
+        Returns:
+            CacheInfo: hits, misses, maxsize and current size
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+class VerifiedTokenCache(TTLCache[bytes, VerifiedClaims]):
+    """Cache of verified token payloads keyed by a digest of the encoded token
+
+    Note:
+        Only tokens which passed the signature & claims verification are
+        stored. Entries expire at the token `exp` claim (plus leeway) or
+        after the cache `ttl`, whichever comes first. Every entry is
+        dropped when the verifying keys change, see `set_key_version`.
+
+    Args:
+        maxsize (int): Maximum number of cached tokens
+        ttl (Optional[float], optional): Time to live in seconds.
+            Defaults to None.
+        leeway (float, optional): Leeway in seconds added to the `exp` claim.
+            Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        leeway: float = 0,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        """See help(VerifiedTokenCache) for more info
+
+        Args:
+            maxsize (int): Maximum number of cached tokens
+            ttl (Optional[float], optional): Time to live in seconds.
+                Defaults to None.
+            leeway (float, optional): Leeway in seconds added to the `exp` claim.
+                Defaults to 0.
+            timer (Callable[[], float], optional): Clock used for expiry.
+                Defaults to `time.time`.
+        """
+        super().__init__(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.leeway = leeway
+        self.key_version: Hashable = None
+
+    @classmethod
+    def from_config(cls, config: FJWTConfig) -> Optional["VerifiedTokenCache"]:
+        """Build the cache described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_DECODE_CACHE_*` options
+
+        Returns:
+            Optional[VerifiedTokenCache]: The cache, None if caching is disabled
+        """
+        if config.JWT_DECODE_CACHE_SIZE <= 0:
+            return None
+        ttl = config.JWT_DECODE_CACHE_TTL
+        return cls(
+            maxsize=config.JWT_DECODE_CACHE_SIZE,
+            ttl=ttl.total_seconds() if ttl is not None else None,
+            leeway=config.JWT_DECODE_LEEWAY or 0,
+        )
+
+    def set_key_version(self, version: Hashable) -> None:
+        """Drop every entry if the verifying keys changed
+
+        Note:
+            Tokens verified with a retired key must not be served from the
+            cache, e.g. after a key ring reload removing their `kid`.
+
+        Args:
+            version (Hashable): Version of the verifying keys
+        """
+        if version == self.key_version:
+            return
+        with self._lock:
+            self._data.clear()
+            self.key_version = version
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Cache key of a token"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_payload(self, token: str) -> Optional[VerifiedClaims]:
+        """Return the verified claims of a token if cached
+
+        Args:
+            token (str): Encoded token
+
+        Returns:
+            Optional[VerifiedClaims]: The verified claims, None on miss
+        """
+        payload = self.get(self._digest(token))
+        if payload is None:
+            return None
+        return payload.copy()
+
+    def set_payload(self, token: str, payload: VerifiedClaims) -> None:
+        """Store the verified claims of a token
+
+        Args:
+            token (str): Encoded token
+            payload (VerifiedClaims): Claims of the verified token
+        """
+        expires_at = None
+        if isinstance(payload.exp, (int, float)):
+            expires_at = payload.exp + self.leeway
+        self.set(self._digest(token), payload, expires_at=expires_at)
+
+    def pop_payload(self, token: str) -> Optional[VerifiedClaims]:
+        """Remove a token from the cache
+
+        Args:
+            token (str): Encoded token
+
+        Returns:
+            Optional[VerifiedClaims]: The removed claims if they were cached
+        """
+        return self.pop(self._digest(token))
+
+
+class SubjectCache(TTLCache[str, Any]):
+    """Cache of subjects returned by the subject getter, keyed by `sub`
+
+    Note:
+        Entries expire after the cache `ttl`. Subjects updated or deleted
+        in your store must be invalidated with `FastJWT.invalidate_subject`.
+
+    Args:
+        maxsize (int): Maximum number of cached subjects
+        ttl (Optional[float], optional): Time to live in seconds.
+            Defaults to None.
+    """
+
+    @classmethod
+    def from_config(cls, config: FJWTConfig) -> Optional["SubjectCache"]:
+        """Build the cache described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_SUBJECT_CACHE_*` options
+
+        Returns:
+            Optional[SubjectCache]: The cache, None if caching is disabled
+        """
+        if config.JWT_SUBJECT_CACHE_SIZE <= 0:
+            return None
+        return cls(
+            maxsize=config.JWT_SUBJECT_CACHE_SIZE,
+            ttl=config.JWT_SUBJECT_CACHE_TTL.total_seconds(),
+        )
+
+
+class RefreshRegistry(TTLCache[str, "asyncio.Future[IssuedToken]"]):
+    """Single-flight registry of implicit refreshes, keyed by the old `jti`
+
+    Note:
+        The first request refreshing an access token mints the new token,
+        concurrent requests carrying the same token wait for it instead of
+        signing their own. The new token is then reused for `ttl` seconds,
+        so that a burst of parallel requests sets a single cookie. Entries
+        also expire with the old token.
+
+    Args:
+        maxsize (int): Maximum number of tracked refreshes
+        ttl (Optional[float], optional): Grace window in seconds during
+            which a refreshed token is reused. Defaults to None.
+    """
+
+    @classmethod
+    def from_config(cls, config: FJWTConfig) -> Optional["RefreshRegistry"]:
+        """Build the registry described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_IMPLICIT_REFRESH_*` options
+
+        Returns:
+            Optional[RefreshRegistry]: The registry, None if disabled
+        """
+        grace = config.JWT_IMPLICIT_REFRESH_GRACE.total_seconds()
+        if config.JWT_IMPLICIT_REFRESH_REGISTRY_SIZE <= 0 or grace <= 0:
+            return None
+        return cls(maxsize=config.JWT_IMPLICIT_REFRESH_REGISTRY_SIZE, ttl=grace)
+
+    async def get_or_issue(
+        self,
+        payload: VerifiedClaims,
+        issue: Callable[[], Awaitable[IssuedToken]],
+    ) -> IssuedToken:
+        """Return the token replacing an access token, issuing it once
+
+        Args:
+            payload (VerifiedClaims): Claims of the access token to replace
+            issue (Callable[[], Awaitable[IssuedToken]]): Issues the new token
+
+        Returns:
+            IssuedToken: The new token, shared by the requests carrying the
+                same access token
+        """
+        jti = payload.jti
+        if jti is None:
+            return await issue()
+        loop = asyncio.get_running_loop()
+        pending = self.get(jti)
+        if pending is not None:
+            if not pending.done():
+                if pending.get_loop() is loop:
+                    return await asyncio.shield(pending)
+            elif not pending.cancelled() and pending.exception() is None:
+                return pending.result()
+
+        future: "asyncio.Future[IssuedToken]" = loop.create_future()
+        expires_at = payload.exp if isinstance(payload.exp, (int, float)) else None
+        self.set(jti, future, expires_at=expires_at)
+        try:
+            token = await issue()
+        except BaseException as e:
+            if self.get(jti) is future:
+                self.pop(jti)
+            future.set_exception(e)
+            # Waiters get the error, do not report it as never retrieved
+            future.exception()
+            raise
+        future.set_result(token)
+        return token
@@ -0,0 +1,97 @@
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from .types import StrOrSeq
+from .exceptions import JWTDecodeError
+
+
+def _timestamp(claims: Dict[str, Any], name: str, message: str) -> int:
+    """Return a timestamp claim as an integer"""
+    try:
+        return int(claims[name])
+    except (ValueError, TypeError, OverflowError):
+        raise JWTDecodeError(message)
+
+
+def _validate_issuer(claims: Dict[str, Any], issuer: StrOrSeq) -> None:
+    """Check the `iss` claim against the expected issuers"""
+    if "iss" not in claims:
+        raise JWTDecodeError("iss")
+    iss = claims["iss"]
+    if not isinstance(iss, str):
+        raise JWTDecodeError("Payload Issuer (iss) must be a string")
+    if iss not in ([issuer] if isinstance(issuer, str) else issuer):
+        raise JWTDecodeError("Invalid issuer")
+
+
+def _validate_audience(claims: Dict[str, Any], audience: Optional[StrOrSeq]) -> None:
+    """Check the `aud` claim against the expected audiences"""
+    aud = claims.get("aud")
+    if audience is None:
+        if aud:
+            raise JWTDecodeError("Invalid audience")
+        return
+    if not aud:
+        raise JWTDecodeError("aud")
+    if isinstance(aud, str):
+        aud = [aud]
+    if not isinstance(aud, list) or not all(isinstance(a, str) for a in aud):
+        raise JWTDecodeError("Invalid claim format in token")
+    if isinstance(audience, str):
+        audience = [audience]
+    if all(a not in aud for a in audience):
+        raise JWTDecodeError("Audience doesn't match")
+
+
+def validate_claims(
+    claims: Dict[str, Any],
+    audience: Optional[StrOrSeq] = None,
+    issuer: Optional[StrOrSeq] = None,
+    leeway: float = 0,
+    now: Optional[float] = None,
+) -> None:
+    """Validate the registered claims of a verified token
+
+    Note:
+        Mirrors the checks of `jwt.decode` with default options. Errors
+        carry the same arguments as the PyJWT exceptions, e.g. a missing
+        required claim raises `JWTDecodeError("aud")`.
+
+    Args:
+        claims (Dict[str, Any]): Token claims
+        audience (Optional[StrOrSeq], optional): Audiences to verify.
+            Defaults to None.
+        issuer (Optional[StrOrSeq], optional): Issuers to verify.
+            Defaults to None.
+        leeway (float, optional): Time margin in seconds. Defaults to 0.
+        now (Optional[float], optional): Current timestamp.
+            Defaults to `time.time()`.
+
+    Raises:
+        JWTDecodeError: Some claim is invalid
+    """
+    if now is None:
+        now = time.time()
+    if "iat" in claims:
+        iat = _timestamp(claims, "iat", "Issued At claim (iat) must be an integer.")
+        if iat > now + leeway:
+            raise JWTDecodeError("The token is not yet valid (iat)")
+    if "nbf" in claims:
+        nbf = _timestamp(claims, "nbf", "Not Before claim (nbf) must be an integer.")
+        if nbf > now + leeway:
+            raise JWTDecodeError("The token is not yet valid (nbf)")
+    if "exp" in claims:
+        exp = _timestamp(
+            claims, "exp", "Expiration Time claim (exp) must be an integer."
+        )
+        if exp <= now - leeway:
+            raise JWTDecodeError("Signature has expired")
+    if issuer is not None:
+        _validate_issuer(claims, issuer)
+    _validate_audience(claims, audience)
+    if "sub" in claims and not isinstance(claims["sub"], str):
+        raise JWTDecodeError("Subject must be a string")
+    if "jti" in claims and not isinstance(claims["jti"], str):
+        raise JWTDecodeError("JWT ID must be a string")
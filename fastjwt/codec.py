@@ -0,0 +1,260 @@
+import json
+import datetime
+from typing import Any
+from typing import Dict
+from typing import Type
+from typing import Tuple
+from typing import Union
+from typing import Optional
+from typing import Sequence
+
+from jwt import api_jws
+from jwt.exceptions import DecodeError
+
+from .types import StrOrSeq
+from .types import JSONCodecName
+from .claims import validate_claims
+from .exceptions import BadConfigurationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+if orjson is not None:
+    # Types the standard library does not serialize raise a TypeError
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+
+class _CodecJWT:
+    """JWT decoding parsing token payloads with a JSONCodec
+
+    Note:
+        Signatures are verified by PyJWT `api_jws`, the registered claims
+        are validated as `jwt.decode` does with default options.
+    """
+
+    def __init__(self, codec: "JSONCodec") -> None:
+        """See help(_CodecJWT) for more info"""
+        self.codec = codec
+
+    def decode(
+        self,
+        jwt: Union[bytes, str],
+        key: Any = "",
+        algorithms: Optional[Sequence[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+        issuer: Optional[StrOrSeq] = None,
+        leeway: Union[float, datetime.timedelta] = 0,
+    ) -> Dict[str, Any]:
+        """Verify a token and return its claims
+
+        Args:
+            jwt (Union[bytes, str]): Token to decode
+            key (Any, optional): Verifying key. Defaults to "".
+            algorithms (Optional[Sequence[str]], optional): Algorithms allowed.
+                Defaults to None.
+            options (Optional[Dict[str, Any]], optional): Only
+                `verify_signature` is supported, claims are not validated
+                when disabled. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audiences to verify.
+                Defaults to None.
+            issuer (Optional[StrOrSeq], optional): Issuers to verify.
+                Defaults to None.
+            leeway (Union[float, datetime.timedelta], optional): Time margin
+                for expiration checks. Defaults to 0.
+
+        Raises:
+            DecodeError: The token or its payload is malformed
+            JWTDecodeError: Some claim is invalid
+
+        Returns:
+            Dict[str, Any]: The decoded claims
+        """
+        verify = (options or {}).get("verify_signature", True)
+        decoded = api_jws.decode_complete(
+            jwt,
+            key=key,
+            algorithms=algorithms,
+            options={"verify_signature": verify},
+        )
+        try:
+            payload = self.codec.loads(decoded["payload"])
+        except (ValueError, RecursionError) as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        if verify:
+            if isinstance(leeway, datetime.timedelta):
+                leeway = leeway.total_seconds()
+            validate_claims(payload, audience=audience, issuer=issuer, leeway=leeway)
+        return payload
+
+
+class JSONCodec:
+    """JSON serialization of the token claims
+
+    Note:
+        Claims are serialized without whitespace. The token headers are
+        always serialized by PyJWT.
+
+    Attributes:
+        name (str): Codec name, as used by `JWT_JSON_CODEC`
+    """
+
+    name = "json"
+
+    def __init__(self) -> None:
+        """See help(JSONCodec) for more info"""
+        self._jwt: Optional[_CodecJWT] = None
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return get_codec, (self.name,)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    @property
+    def jwt(self) -> _CodecJWT:
+        """JWT decoder parsing payloads with this codec"""
+        if self._jwt is None:
+            self._jwt = _CodecJWT(self)
+        return self._jwt
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize claims
+
+        Args:
+            obj (Any): Claims to serialize
+
+        Raises:
+            TypeError: The claims are not JSON serializable
+
+        Returns:
+            bytes: UTF-8 JSON document
+        """
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Parse claims
+
+        Args:
+            data (Union[bytes, str]): JSON document
+
+        Raises:
+            ValueError: The document is not valid JSON
+
+        Returns:
+            Any: Parsed claims
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """`orjson` serialization of the token claims
+
+    Note:
+        Claims holding non-ASCII strings, integers over 64 bits, datetimes,
+        dataclasses or subclasses of builtin types are serialized by the
+        standard library, as PyJWT does.
+    """
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize claims, see `JSONCodec.dumps`"""
+        try:
+            data = orjson.dumps(obj, option=ORJSON_OPTIONS)
+        except TypeError:
+            return super().dumps(obj)
+        # The standard library escapes non-ASCII characters
+        return data if data.isascii() else super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Parse claims, see `JSONCodec.loads`"""
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """`msgspec` serialization of the token claims
+
+    Note:
+        Claims holding non-ASCII strings or values `msgspec` can not encode
+        are serialized by the standard library, as PyJWT does.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """See help(MsgspecCodec) for more info"""
+        super().__init__()
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize claims, see `JSONCodec.dumps`"""
+        try:
+            data = self._encoder.encode(obj)
+        except (TypeError, ValueError, msgspec.EncodeError):
+            return super().dumps(obj)
+        return data if data.isascii() else super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Parse claims, see `JSONCodec.loads`"""
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(*e.args)
+
+
+CODECS: Dict[str, Tuple[Type[JSONCodec], Any]] = {
+    "orjson": (OrjsonCodec, orjson),
+    "msgspec": (MsgspecCodec, msgspec),
+    "json": (JSONCodec, json),
+}
+_INSTANCES: Dict[str, JSONCodec] = {}
+
+
+def get_codec(name: JSONCodecName = "auto") -> JSONCodec:
+    """Return a JSON codec by name
+
+    Note:
+        "auto" selects the fastest installed codec: `orjson`, then
+        `msgspec`, then the standard library `json` module.
+
+    Args:
+        name (JSONCodecName, optional): Codec name. Defaults to "auto".
+
+    Raises:
+        BadConfigurationError: The codec is unknown or not installed
+
+    Returns:
+        JSONCodec: Shared codec instance
+    """
+    if name == "auto":
+        name = next(n for n, (_, module) in CODECS.items() if module is not None)
+    codec = _INSTANCES.get(name)
+    if codec is not None:
+        return codec
+    if name not in CODECS:
+        raise BadConfigurationError(
+            f"Unknown JSON codec '{name}'. Value allowed are {['auto', *CODECS]}"
+        )
+    cls, module = CODECS[name]
+    if module is None:
+        raise BadConfigurationError(
+            f"JSON codec '{name}' requires `pip install fastjwt[{name}]`"
+        )
+    codec = _INSTANCES[name] = cls()
+    return codec
@@ -1,20 +1,32 @@
+from typing import Any
+from typing import Dict
 from typing import List
+from typing import TypeVar
+from typing import Callable
 from typing import Optional
 from typing import Sequence
 from datetime import timedelta
 
 from pydantic import Field
+from pydantic import PrivateAttr
 from jwt.algorithms import requires_cryptography
 from jwt.algorithms import get_default_algorithms
 from pydantic_settings import BaseSettings
 
+from .types import IDFormat
 from .types import StrOrSeq
 from .types import HTTPMethods
+from .types import TokenProfile
 from .types import AlgorithmType
+from .types import JSONCodecName
+from .types import HMACEngineName
 from .types import SameSitePolicy
 from .types import TokenLocations
+from .types import CryptoOffloadMode
 from .exceptions import BadConfigurationError
 
+T = TypeVar("T")
+
 
 class FJWTConfig(BaseSettings):
     """FastJWT Base Configuration Object"""
@@ -22,22 +34,42 @@ class FJWTConfig(BaseSettings):
     # General Options
     JWT_ACCESS_TOKEN_EXPIRES: Optional[timedelta] = timedelta(minutes=15)
     JWT_ALGORITHM: AlgorithmType = "HS256"
+    JWT_BLOCKLIST_FILTER_CAPACITY: int = 0
+    JWT_BLOCKLIST_FILTER_ERROR_RATE: float = 0.001
+    JWT_BLOCKLIST_FILTER_SYNC_INTERVAL: Optional[timedelta] = timedelta(seconds=60)
+    JWT_CLAIM_ALIASES: Dict[str, str] = Field(default_factory=dict)
+    JWT_CRYPTO_OFFLOAD: CryptoOffloadMode = "inline"
+    JWT_CRYPTO_OFFLOAD_LAG_INTERVAL: Optional[timedelta] = None
+    JWT_CRYPTO_OFFLOAD_THRESHOLD: timedelta = timedelta(microseconds=100)
+    JWT_CRYPTO_OFFLOAD_WORKERS: Optional[int] = None
     JWT_DECODE_ALGORITHMS: Sequence[AlgorithmType] = Field(
         default_factory=lambda: ["HS256"]
     )
     JWT_DECODE_AUDIENCE: Optional[StrOrSeq] = None
+    JWT_DECODE_CACHE_SIZE: int = 0
+    JWT_DECODE_CACHE_TTL: Optional[timedelta] = None
     JWT_DECODE_ISSUER: Optional[str] = None
     JWT_DECODE_LEEWAY: Optional[int] = 0
     JWT_ENCODE_AUDIENCE: Optional[StrOrSeq] = None
     JWT_ENCODE_ISSUER: Optional[str] = None
     JWT_ENCODE_NBF: bool = True
     JWT_ERROR_MESSAGE_KEY: str = "msg"
+    JWT_HMAC_ENGINE: HMACEngineName = "pyjwt"
+    JWT_ID_FORMAT: IDFormat = "uuid"
     JWT_IDENTITY_CLAIM: str = "sub"
+    JWT_JSON_CODEC: JSONCodecName = "json"
+    JWT_JWKS: Optional[Dict[str, Any]] = None
+    JWT_JWKS_FILE: Optional[str] = None
+    JWT_JWKS_REFRESH_INTERVAL: timedelta = timedelta(seconds=1)
+    JWT_JWKS_SIGNING_KID: Optional[str] = None
     JWT_PRIVATE_KEY: Optional[str] = None
     JWT_PUBLIC_KEY: Optional[str] = None
     JWT_REFRESH_TOKEN_EXPIRES: Optional[timedelta] = timedelta(days=20)
     JWT_SECRET_KEY: Optional[str] = None
+    JWT_SUBJECT_CACHE_SIZE: int = 0
+    JWT_SUBJECT_CACHE_TTL: timedelta = timedelta(minutes=1)
     JWT_TOKEN_LOCATION: TokenLocations = Field(["headers"])
+    JWT_TOKEN_PROFILE: TokenProfile = "standard"
     # Header Options
     JWT_HEADER_NAME: str = "Authorization"
     JWT_HEADER_TYPE: str = "Bearer"
@@ -78,6 +110,67 @@ class FJWTConfig(BaseSettings):
     JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE: HTTPMethods = Field(default_factory=list)
     JWT_IMPLICIT_REFRESH_METHOD_INCLUDE: HTTPMethods = Field(default_factory=list)
     JWT_IMPLICIT_REFRESH_DELTATIME: timedelta = timedelta(minutes=10)
+    JWT_IMPLICIT_REFRESH_GRACE: timedelta = timedelta(seconds=10)
+    JWT_IMPLICIT_REFRESH_REGISTRY_SIZE: int = 1024
+
+    # Objects derived from the configuration, reset on every option update
+    _compiled: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    # Release the resources of discarded derived objects, by name
+    _disposers: Dict[str, Callable[[Any], None]] = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._discard_compiled()
+
+    def _discard_compiled(self) -> None:
+        """Drop the memoized objects, disposing of them"""
+        compiled, disposers = self._compiled, self._disposers
+        self._compiled, self._disposers = {}, {}
+        for name, dispose in disposers.items():
+            if compiled.get(name) is not None:
+                dispose(compiled[name])
+
+    def __copy__(self) -> "FJWTConfig":
+        copied = super().__copy__()
+        copied._compiled = {}
+        copied._disposers = {}
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "FJWTConfig":
+        copied = super().__deepcopy__(memo)
+        copied._compiled = {}
+        copied._disposers = {}
+        return copied
+
+    def _memoize(
+        self,
+        name: str,
+        factory: Callable[["FJWTConfig"], T],
+        dispose: Optional[Callable[[T], None]] = None,
+    ) -> T:
+        """Return an object derived from the configuration, building it once
+
+        Note:
+            Memoized objects are discarded as soon as any `JWT_*` option
+            is updated, and rebuilt on next access.
+
+        Args:
+            name (str): Unique name of the derived object
+            factory (Callable[[FJWTConfig], T]): Builder called with the
+                configuration when no object is memoized yet
+            dispose (Optional[Callable[[T], None]], optional): Called with
+                the object, if not None, when it is discarded. Defaults to None.
+
+        Returns:
+            T: The memoized object
+        """
+        compiled = self._compiled
+        if name not in compiled:
+            compiled[name] = factory(self)
+            if dispose is not None:
+                self._disposers[name] = dispose
+        return compiled[name]
 
     @property
     def is_algo_symmetric(self) -> bool:
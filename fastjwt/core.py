@@ -1,9 +1,20 @@
+import re
+import fnmatch
+from http import cookies as http_cookies
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Type
+from typing import Tuple
+from typing import Union
+from typing import Pattern
 from typing import Callable
+from typing import Iterable
+from typing import NoReturn
 from typing import Optional
+from typing import Sequence
 from typing import Awaitable
+from functools import lru_cache
 
 try:
     from typing import ParamSpecKwargs
@@ -19,6 +30,611 @@ from .models import RequestToken
 from .exceptions import MissingTokenError
 from .exceptions import MissingCSRFTokenError
 
+SCANNED_HEADERS_SCOPE_KEY = "fastjwt.headers"
+
+
+class _HeaderNames:
+    """Lowercase header & cookie names of a configuration, as bytes"""
+
+    __slots__ = (
+        "authorization",
+        "header_type",
+        "access_cookie",
+        "refresh_cookie",
+        "access_csrf",
+        "refresh_csrf",
+    )
+
+    def __init__(self, config: FJWTConfig) -> None:
+        """Lowercase header & cookie names of a configuration, as bytes
+
+        Args:
+            config (FJWTConfig): Configuration to read names from
+        """
+        self.authorization = config.JWT_HEADER_NAME.lower().encode("latin-1")
+        self.header_type: Optional[bytes] = None
+        if config.JWT_HEADER_TYPE:
+            self.header_type = config.JWT_HEADER_TYPE.lower().encode("latin-1")
+        self.access_cookie = config.JWT_ACCESS_COOKIE_NAME.encode("latin-1") + b"="
+        self.refresh_cookie = config.JWT_REFRESH_COOKIE_NAME.encode("latin-1") + b"="
+        self.access_csrf = config.JWT_ACCESS_CSRF_HEADER_NAME.lower().encode("latin-1")
+        self.refresh_csrf = config.JWT_REFRESH_CSRF_HEADER_NAME.lower().encode(
+            "latin-1"
+        )
+
+
+class _ScannedHeaders:
+    """Raw values of the headers relevant to a configuration"""
+
+    __slots__ = (
+        "names",
+        "authorization",
+        "cookie",
+        "access_csrf",
+        "refresh_csrf",
+    )
+
+    def __init__(self, names: _HeaderNames, headers: Iterable[Sequence[bytes]]) -> None:
+        """Scan raw ASGI headers once, keeping only the configured names
+
+        Args:
+            names (_HeaderNames): Configured names
+            headers (Iterable[Sequence[bytes]]): Raw ASGI `(name, value)` headers
+        """
+        self.names = names
+        self.authorization: Optional[bytes] = None
+        self.cookie: Optional[bytes] = None
+        self.access_csrf: Optional[bytes] = None
+        self.refresh_csrf: Optional[bytes] = None
+        authorization = names.authorization
+        access_csrf = names.access_csrf
+        refresh_csrf = names.refresh_csrf
+        for name, value in headers:
+            if name == b"cookie":
+                # HTTP/2 clients may split cookies over several headers
+                self.cookie = (
+                    value if self.cookie is None else self.cookie + b"; " + value
+                )
+            elif name == authorization:
+                self.authorization = (
+                    value
+                    if self.authorization is None
+                    else self.authorization + b"," + value
+                )
+            else:
+                if name == access_csrf and self.access_csrf is None:
+                    self.access_csrf = value
+                if name == refresh_csrf and self.refresh_csrf is None:
+                    self.refresh_csrf = value
+
+    def get_authorization_token(self) -> Optional[str]:
+        """Return the token of the authorization header
+
+        Note:
+            The header may hold several comma delimited credentials,
+            the first one of the configured type is used.
+            The type is compared case-insensitively.
+
+        Returns:
+            Optional[str]: The token, None if missing
+        """
+        value = self.authorization
+        if value is None:
+            return None
+        header_type = self.names.header_type
+        if header_type is None:
+            token = value.strip()
+            return token.decode("latin-1") if token else None
+        size = len(header_type)
+        start = size + 1
+        for credentials in value.split(b","):
+            credentials = credentials.strip()
+            if (
+                len(credentials) > size
+                and credentials[size] == 0x20
+                and credentials[:size].lower() == header_type
+            ):
+                token = credentials[start:].strip()
+                if token:
+                    return token.decode("latin-1")
+        return None
+
+    def get_cookie(self, refresh: bool = False) -> Optional[str]:
+        """Return the value of the access or refresh token cookie
+
+        Note:
+            Only the configured cookie is looked up, other cookies are not
+            parsed. As with Starlette, the last occurrence is used.
+
+        Args:
+            refresh (bool, optional): Look for the refresh token cookie.
+                Defaults to False.
+
+        Returns:
+            Optional[str]: The cookie value, None if missing
+        """
+        cookie = self.cookie
+        if cookie is None:
+            return None
+        needle = self.names.refresh_cookie if refresh else self.names.access_cookie
+        found: Optional[bytes] = None
+        index = cookie.find(needle)
+        while index >= 0:
+            # The name must start a cookie pair
+            if index == 0 or cookie[index - 1] in b"; \t":
+                start = index + len(needle)
+                end = cookie.find(b";", start)
+                if end < 0:
+                    end = len(cookie)
+                found = cookie[start:end].strip()
+            index = cookie.find(needle, index + 1)
+        if found is None:
+            return None
+        value = found.decode("latin-1")
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = http_cookies._unquote(value)
+        return value
+
+    def get_csrf(self, refresh: bool = False) -> Optional[str]:
+        """Return the value of the access or refresh CSRF header
+
+        Args:
+            refresh (bool, optional): Look for the refresh CSRF header.
+                Defaults to False.
+
+        Returns:
+            Optional[str]: The CSRF token, None if missing
+        """
+        value = self.refresh_csrf if refresh else self.access_csrf
+        return None if value is None else value.decode("latin-1")
+
+
+def _scan_headers(scope: Dict[str, Any], config: FJWTConfig) -> _ScannedHeaders:
+    """Return the configured headers of a request, scanned once per request
+
+    Args:
+        scope (Dict[str, Any]): ASGI scope of the request
+        config (FJWTConfig): Configuration defining the header & cookie names
+
+    Returns:
+        _ScannedHeaders: The raw values of the configured headers
+    """
+    names: _HeaderNames = config._memoize("header_names", _HeaderNames)
+    scanned: Optional[_ScannedHeaders] = scope.get(SCANNED_HEADERS_SCOPE_KEY)
+    if scanned is None or scanned.names is not names:
+        scanned = _ScannedHeaders(names, scope.get("headers", ()))
+        scope[SCANNED_HEADERS_SCOPE_KEY] = scanned
+    return scanned
+
+
+class _CookieTemplate:
+    """Set-Cookie header lines of a cookie, compiled from its attributes
+
+    Note:
+        Attributes are laid out like `http.cookies.Morsel.OutputString`,
+        so the lines match Starlette's `Response.set_cookie` &
+        `Response.delete_cookie` byte for byte.
+    """
+
+    __slots__ = ("key", "head", "tail", "deleted_head", "deleted_tail")
+
+    def __init__(
+        self,
+        key: str,
+        path: Optional[str],
+        domain: Optional[str],
+        samesite: Optional[str],
+        secure: bool,
+        httponly: bool,
+    ) -> None:
+        """Compile the static attributes of a cookie
+
+        Args:
+            key (str): Cookie name
+            path (Optional[str]): Cookie path
+            domain (Optional[str]): Cookie domain
+            samesite (Optional[str]): SameSite policy
+            secure (bool): Secure flag
+            httponly (bool): HttpOnly flag
+
+        Raises:
+            CookieError: The cookie name is not valid
+        """
+        http_cookies.Morsel().set(key, "", "")
+        domain_attr = "" if domain is None else f"; Domain={domain}"
+        path_attr = "" if path is None else f"; Path={path}"
+        self.key = key
+        self.head = domain_attr + ("; HttpOnly" if httponly else "")
+        self.tail = (
+            path_attr
+            + ("" if samesite is None else f"; SameSite={samesite}")
+            + ("; Secure" if secure else "")
+        )
+        self.deleted_head = f'{key}=""{domain_attr}; expires='
+        self.deleted_tail = f"; Max-Age=0{path_attr}; SameSite=lax".encode("latin-1")
+
+    def set_cookie(self, value: str, max_age: Optional[int] = None) -> bytes:
+        """Return the Set-Cookie line setting the cookie
+
+        Args:
+            value (str): Cookie value
+            max_age (Optional[int], optional): Cookie lifetime in seconds.
+                Defaults to None.
+
+        Returns:
+            bytes: Header value
+        """
+        max_age_attr = "" if max_age is None else "; Max-Age=%d" % max_age
+        return (
+            f"{self.key}={http_cookies._quote(value)}{self.head}"
+            f"{max_age_attr}{self.tail}"
+        ).encode("latin-1")
+
+    def delete_cookie(self) -> bytes:
+        """Return the Set-Cookie line expiring the cookie
+
+        Returns:
+            bytes: Header value
+        """
+        deleted = self.deleted_head + http_cookies._getdate()
+        return deleted.encode("latin-1") + self.deleted_tail
+
+
+class _CookieTemplates:
+    """Set-Cookie templates of the token & CSRF cookies of a configuration"""
+
+    __slots__ = ("cookies", "max_age")
+
+    def __init__(self, config: FJWTConfig) -> None:
+        """Set-Cookie templates of the token & CSRF cookies of a configuration
+
+        Args:
+            config (FJWTConfig): Configuration to read cookie options from
+        """
+        csrf = config.JWT_COOKIE_CSRF_PROTECT and config.JWT_CSRF_IN_COOKIES
+        self.max_age = config.JWT_COOKIE_MAX_AGE
+        self.cookies: Dict[str, Tuple[_CookieTemplate, Optional[_CookieTemplate]]] = {}
+        options = {
+            "domain": config.JWT_COOKIE_DOMAIN,
+            "samesite": config.JWT_COOKIE_SAMESITE,
+            "secure": config.JWT_COOKIE_SECURE,
+        }
+        for type, names in (
+            (
+                "access",
+                (
+                    config.JWT_ACCESS_COOKIE_NAME,
+                    config.JWT_ACCESS_COOKIE_PATH,
+                    config.JWT_ACCESS_CSRF_COOKIE_NAME,
+                    config.JWT_ACCESS_CSRF_COOKIE_PATH,
+                ),
+            ),
+            (
+                "refresh",
+                (
+                    config.JWT_REFRESH_COOKIE_NAME,
+                    config.JWT_REFRESH_COOKIE_PATH,
+                    config.JWT_REFRESH_CSRF_COOKIE_NAME,
+                    config.JWT_REFRESH_CSRF_COOKIE_PATH,
+                ),
+            ),
+        ):
+            token_key, token_path, csrf_key, csrf_path = names
+            self.cookies[type] = (
+                _CookieTemplate(token_key, token_path, httponly=True, **options),
+                (
+                    _CookieTemplate(csrf_key, csrf_path, httponly=False, **options)
+                    if csrf
+                    else None
+                ),
+            )
+
+    def get(self, type: str) -> Tuple[_CookieTemplate, Optional[_CookieTemplate]]:
+        """Return the templates of a token type
+
+        Args:
+            type (str): "access" or "refresh"
+
+        Raises:
+            ValueError: Unknown token type
+
+        Returns:
+            Tuple[_CookieTemplate, Optional[_CookieTemplate]]: Token cookie
+                & CSRF cookie templates, None if CSRF is not set in cookies
+        """
+        try:
+            return self.cookies[type]
+        except KeyError:
+            raise ValueError("Token type must be 'access' | 'refresh'")
+
+
+# Bit of each HTTP method in the implicit refresh method masks
+METHOD_BITS = {
+    method: 1 << index
+    for index, method in enumerate(
+        ("GET", "HEAD", "POST", "PUT", "DELETE", "OPTIONS", "PATCH")
+    )
+}
+
+
+def _method_mask(methods: Iterable[str]) -> int:
+    """Bit mask of a set of HTTP methods"""
+    mask = 0
+    for method in methods:
+        mask |= METHOD_BITS.get(method.upper(), 0)
+    return mask
+
+
+class _RouteRules:
+    """Path rules compiled into an exact path table & a single regex
+
+    Note:
+        Rules are exact paths or glob patterns, where `*` matches any
+        sequence of characters (`/api/*` matches every path below `/api/`),
+        `?` a single character and `[...]` a character set.
+    """
+
+    __slots__ = ("exact", "pattern")
+
+    def __init__(self, rules: Iterable[str]) -> None:
+        """Compile path rules
+
+        Args:
+            rules (Iterable[str]): Exact paths & glob patterns
+        """
+        self.exact = frozenset(rule for rule in rules if not _is_glob(rule))
+        patterns = [fnmatch.translate(rule) for rule in rules if _is_glob(rule)]
+        self.pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(patterns)) if patterns else None
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.exact) or self.pattern is not None
+
+    def match(self, path: str) -> bool:
+        """Whether a path matches one of the rules
+
+        Args:
+            path (str): Request path
+
+        Returns:
+            bool: True if the path matches
+        """
+        return path in self.exact or (
+            self.pattern is not None and self.pattern.match(path) is not None
+        )
+
+
+def _is_glob(rule: str) -> bool:
+    """Whether a route rule is a glob pattern"""
+    return any(char in rule for char in "*?[")
+
+
+class _ImplicitRefreshRules:
+    """Implicit refresh route & method rules of a configuration
+
+    Note:
+        Route rules take precedence over method rules, and exclusions over
+        inclusions: an included route is refreshed whatever its method.
+        When method inclusions are set, only the included methods are
+        refreshed. Requests matching no other rule are refreshed.
+
+    Note:
+        With glob route rules, the route decision of the last `cache_size`
+        request paths is memoized. Paths holding identifiers
+        (`/items/42`) take one entry each, on cache misses the rules are
+        matched again.
+
+    Args:
+        config (FJWTConfig): Configuration with `JWT_IMPLICIT_REFRESH_*` options
+        cache_size (int, optional): Number of memoized paths. Defaults to 1024.
+    """
+
+    def __init__(self, config: FJWTConfig, cache_size: int = 1024) -> None:
+        """See help(_ImplicitRefreshRules) for more info
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_IMPLICIT_REFRESH_*`
+                options
+            cache_size (int, optional): Number of memoized paths.
+                Defaults to 1024.
+        """
+        self.route_exclude = _RouteRules(config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE)
+        self.route_include = _RouteRules(config.JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE)
+        self.method_exclude = _method_mask(config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE)
+        self.method_include = _method_mask(config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE)
+        self.route_decision: Callable[[str], Optional[bool]] = self._route_decision
+        if self.route_exclude.pattern or self.route_include.pattern:
+            # Exact paths are a set lookup, only glob matches are memoized
+            self.route_decision = lru_cache(maxsize=cache_size)(self._route_decision)
+
+    def _route_decision(self, path: str) -> Optional[bool]:
+        """Whether the route rules include or exclude a path, None if neither"""
+        if self.route_exclude.match(path):
+            return False
+        if self.route_include.match(path):
+            return True
+        return None
+
+    def enabled(self, path: str, method: str) -> bool:
+        """Whether implicit refresh applies to a request
+
+        Args:
+            path (str): Request path
+            method (str): Request method
+
+        Returns:
+            bool: True if the access cookie may be refreshed
+        """
+        if self.route_exclude or self.route_include:
+            decision = self.route_decision(path)
+            if decision is not None:
+                return decision
+        bit = METHOD_BITS.get(method.upper(), 0)
+        if bit & self.method_exclude:
+            return False
+        return not self.method_include or bool(bit & self.method_include)
+
+
+class _Miss:
+    """Reason why a location holds no token
+
+    Note:
+        Token finders return shared _Miss instances instead of raising,
+        the error message is only formatted when every location missed.
+
+    Args:
+        template (str): Message template, formatted with `config`
+            and the `cookie_key` of the requested token type
+        error (Type[MissingTokenError], optional): Error raised by the
+            single location getters. Defaults to MissingTokenError.
+    """
+
+    __slots__ = ("template", "error")
+
+    def __init__(
+        self, template: str, error: Type[MissingTokenError] = MissingTokenError
+    ) -> None:
+        """See help(_Miss) for more info
+
+        Args:
+            template (str): Message template
+            error (Type[MissingTokenError], optional): Error raised by the
+                single location getters. Defaults to MissingTokenError.
+        """
+        self.template = template
+        self.error = error
+
+    def message(self, config: FJWTConfig, refresh: bool = False) -> str:
+        """Format the error message
+
+        Args:
+            config (FJWTConfig): Configuration of the lookup
+            refresh (bool, optional): Refresh token lookup. Defaults to False.
+
+        Returns:
+            str: The error message
+        """
+        cookie_key = config.JWT_ACCESS_COOKIE_NAME
+        if refresh:
+            cookie_key = config.JWT_REFRESH_COOKIE_NAME
+        return self.template.format(config=config, cookie_key=cookie_key)
+
+    def raise_error(self, config: FJWTConfig, refresh: bool = False) -> NoReturn:
+        """Raise the error of this miss
+
+        Args:
+            config (FJWTConfig): Configuration of the lookup
+            refresh (bool, optional): Refresh token lookup. Defaults to False.
+
+        Raises:
+            MissingTokenError: The token is missing
+        """
+        raise self.error(self.message(config, refresh=refresh))
+
+
+MISSING_HEADER = _Miss(
+    "Missing '{config.JWT_HEADER_TYPE}' in '{config.JWT_HEADER_NAME}' header."
+)
+MISSING_COOKIE = _Miss("Missing cookie '{cookie_key}'.")
+MISSING_CSRF = _Miss("Missing CSRF token", error=MissingCSRFTokenError)
+MISSING_QUERY = _Miss("Missing '{config.JWT_QUERY_STRING_NAME}' in query parameters")
+INVALID_CONTENT_TYPE = _Miss("Invalid content-type. Must be application/json")
+UNPARSABLE_JSON = _Miss("Token is not parsable")
+MISSING_JSON = _Miss("Missing token in json data")
+
+TokenResult = Union[RequestToken, _Miss]
+
+
+async def _find_token_in_headers(
+    request: Request, config: FJWTConfig, refresh: bool = False
+) -> TokenResult:
+    """Find the token of the authorization header, see `_get_token_from_headers`"""
+    token = _scan_headers(request.scope, config).get_authorization_token()
+    if token is None:
+        return MISSING_HEADER
+    return RequestToken(token=token, csrf=None, location="headers")
+
+
+async def _find_token_in_cookies(
+    request: Request, config: FJWTConfig, refresh: bool = False
+) -> TokenResult:
+    """Find the token of the token cookie, see `_get_token_from_cookies`"""
+    headers = _scan_headers(request.scope, config)
+    cookie_token = headers.get_cookie(refresh=refresh)
+    if not cookie_token:
+        return MISSING_COOKIE
+
+    csrf_token = None
+    if (
+        config.JWT_COOKIE_CSRF_PROTECT
+        and request.method.upper() in config.JWT_CSRF_METHODS
+    ):
+        # If the CSRF cookie protection is enabled
+        # and the request's method should enforce CSRF checking
+        csrf_token = headers.get_csrf(refresh=refresh)
+        if not csrf_token and config.JWT_CSRF_CHECK_FORM:
+            form_data = await request.form()
+            if form_data is not None:
+                csrf_token = form_data.get(
+                    config.JWT_REFRESH_CSRF_FIELD_NAME
+                    if refresh
+                    else config.JWT_ACCESS_CSRF_FIELD_NAME
+                )
+        if not csrf_token:
+            return MISSING_CSRF
+
+    return RequestToken(
+        token=cookie_token,
+        csrf=csrf_token,
+        type=("refresh" if refresh else "access"),
+        location="cookies",
+    )
+
+
+async def _find_token_in_query(
+    request: Request, config: FJWTConfig, refresh: bool = False
+) -> TokenResult:
+    """Find the token of the query string, see `_get_token_from_query`"""
+    query_token = request.query_params.get(config.JWT_QUERY_STRING_NAME)
+    if query_token is None:
+        return MISSING_QUERY
+    return RequestToken(token=query_token, location="query")
+
+
+async def _find_token_in_json(
+    request: Request, config: FJWTConfig, refresh: bool = False
+) -> TokenResult:
+    """Find the token of the json body, see `_get_token_from_json`"""
+    if not (request.headers.get("content-type") == "application/json"):
+        return INVALID_CONTENT_TYPE
+
+    key = config.JWT_JSON_KEY
+    token_type = "access"
+    if refresh:
+        token_type = "refresh"
+        key = config.JWT_REFRESH_JSON_KEY
+
+    try:
+        json_data: Dict[str, Any] = await request.json()
+        json_token = json_data.get(key)
+    except Exception:
+        return UNPARSABLE_JSON
+    if isinstance(json_token, str):
+        return RequestToken(token=json_token, type=token_type, location="json")
+    return MISSING_JSON
+
+
+TOKEN_FINDERS: Dict[
+    TokenLocation,
+    Callable[[Request, FJWTConfig, bool], Awaitable[TokenResult]],
+] = {
+    "json": _find_token_in_json,
+    "query": _find_token_in_query,
+    "cookies": _find_token_in_cookies,
+    "headers": _find_token_in_headers,
+}
+
 
 async def _get_token_from_headers(
     request: Request, config: FJWTConfig, **kwargs
@@ -38,24 +654,10 @@ async def _get_token_from_headers(
     Returns:
         RequestToken: the token available in headers
     """
-    # Get Header
-    auth_header: Optional[str] = request.headers.get(config.JWT_HEADER_NAME)
-    if auth_header is None:
-        raise MissingTokenError(
-            f"Missing '{config.JWT_HEADER_TYPE}' in '{config.JWT_HEADER_NAME}' header."
-        )
-
-    if config.JWT_HEADER_TYPE:
-        # Authorization Header has a type
-        # e.g '<HEADER_NAME>: <HEADER_TYPE> $TOKEN'
-        # TODO Handle comma delimited header
-        token = auth_header.replace(f"{config.JWT_HEADER_TYPE} ", "")
-    else:
-        # Authorization Header has no type
-        # e.g '<HEADER_NAME>: $TOKEN'
-        token = auth_header
-
-    return RequestToken(token=token, csrf=None, location="headers")
+    result = await _find_token_in_headers(request, config, refresh=False)
+    if isinstance(result, _Miss):
+        result.raise_error(config, refresh=False)
+    return result
 
 
 async def _get_token_from_cookies(
@@ -80,39 +682,10 @@ async def _get_token_from_cookies(
     Returns:
         RequestToken: the token available in cookies
     """
-    cookie_key = config.JWT_ACCESS_COOKIE_NAME
-    csrf_header_key = config.JWT_ACCESS_CSRF_HEADER_NAME
-    csrf_field_key = config.JWT_ACCESS_CSRF_FIELD_NAME
-    if refresh:
-        cookie_key = config.JWT_REFRESH_COOKIE_NAME
-        csrf_header_key = config.JWT_REFRESH_CSRF_HEADER_NAME
-        csrf_field_key = config.JWT_REFRESH_CSRF_FIELD_NAME
-
-    cookie_token = request.cookies.get(cookie_key)
-    if not cookie_token:
-        raise MissingTokenError(f"Missing cookie '{cookie_key}'.")
-
-    csrf_token = None
-    if (
-        config.JWT_COOKIE_CSRF_PROTECT
-        and request.method.upper() in config.JWT_CSRF_METHODS
-    ):
-        # If the CSRF cookie protection is enabled
-        # and the request's method should enforce CSRF checking
-        csrf_token = request.headers.get(csrf_header_key.lower())
-        if not csrf_token and config.JWT_CSRF_CHECK_FORM:
-            form_data = await request.form()
-            if form_data is not None:
-                csrf_token = form_data.get(csrf_field_key)
-        if not csrf_token:
-            raise MissingCSRFTokenError("Missing CSRF token")
-
-    return RequestToken(
-        token=cookie_token,
-        csrf=csrf_token,
-        type=("refresh" if refresh else "access"),
-        location="cookies",
-    )
+    result = await _find_token_in_cookies(request, config, refresh=refresh)
+    if isinstance(result, _Miss):
+        result.raise_error(config, refresh=refresh)
+    return result
 
 
 async def _get_token_from_query(
@@ -130,13 +703,10 @@ async def _get_token_from_query(
     Returns:
         RequestToken: the token available in query
     """
-    query_token = request.query_params.get(config.JWT_QUERY_STRING_NAME)
-    if query_token is None:
-        raise MissingTokenError(
-            f"Missing '{config.JWT_QUERY_STRING_NAME}' in query parameters"
-        )
-
-    return RequestToken(token=query_token, location="query")
+    result = await _find_token_in_query(request, config, refresh=False)
+    if isinstance(result, _Miss):
+        result.raise_error(config, refresh=False)
+    return result
 
 
 async def _get_token_from_json(
@@ -156,27 +726,10 @@ async def _get_token_from_json(
     Returns:
         Optional[RequestToken]: _description_
     """
-    if not (request.headers.get("content-type") == "application/json"):
-        raise MissingTokenError("Invalid content-type. Must be application/json")
-
-    key = config.JWT_JSON_KEY
-    token_type = "access"
-    if refresh:
-        token_type = "refresh"
-        key = config.JWT_REFRESH_JSON_KEY
-
-    try:
-        json_data: Dict[str, Any] = await request.json()
-        json_token = json_data.get(key)
-        if isinstance(json_token, str):
-            return RequestToken(
-                token=json_token,
-                type=token_type,
-                location="json",
-            )
-    except Exception:
-        raise MissingTokenError("Token is not parsable")
-    raise MissingTokenError("Missing token in json data")
+    result = await _find_token_in_json(request, config, refresh=refresh)
+    if isinstance(result, _Miss):
+        result.raise_error(config, refresh=refresh)
+    return result
 
 
 TOKEN_GETTERS: Dict[
@@ -190,6 +743,95 @@ TOKEN_GETTERS: Dict[
 }
 
 
+class _TokenResolver:
+    """Ordered token finders of a configuration
+
+    Note:
+        Chains are compiled once per configuration. Refresh tokens are
+        only looked up in cookies and json data.
+
+    Args:
+        config (FJWTConfig): Configuration defining the token locations
+    """
+
+    __slots__ = ("config", "access", "refresh")
+
+    def __init__(self, config: FJWTConfig) -> None:
+        """See help(_TokenResolver) for more info
+
+        Args:
+            config (FJWTConfig): Configuration defining the token locations
+        """
+        self.config = config
+        self.access = self.compile(config.JWT_TOKEN_LOCATION)
+        self.refresh = self.compile(
+            [
+                location
+                for location in config.JWT_TOKEN_LOCATION
+                if location in ("cookies", "json")
+            ]
+        )
+
+    @staticmethod
+    def compile(
+        locations: TokenLocations,
+    ) -> Tuple[Tuple[TokenLocation, Callable[..., Awaitable[TokenResult]]], ...]:
+        """Build the chain of finders of given locations
+
+        Args:
+            locations (TokenLocations): Ordered locations
+
+        Returns:
+            Tuple[Tuple[TokenLocation, Callable[..., Awaitable[TokenResult]]], ...]:
+                The ordered `(location, finder)` pairs
+        """
+        return tuple((location, TOKEN_FINDERS[location]) for location in locations)
+
+    async def resolve(
+        self,
+        request: Request,
+        refresh: bool = False,
+        locations: Optional[TokenLocations] = None,
+    ) -> RequestToken:
+        """Return the first token found in request
+
+        Args:
+            request (Request): Request to look the token up in
+            refresh (bool, optional): Look for a refresh token.
+                Defaults to False.
+            locations (Optional[TokenLocations], optional): Locations to use
+                instead of the configured ones. Defaults to None.
+
+        Raises:
+            MissingTokenError: No location holds a token
+
+        Returns:
+            RequestToken: The token
+        """
+        if locations is not None:
+            chain = self.compile(locations)
+        else:
+            chain = self.refresh if refresh else self.access
+        config = self.config
+        misses: Optional[List[_Miss]] = None
+        for _, finder in chain:
+            result = await finder(request, config, refresh)
+            if not isinstance(result, _Miss):
+                return result
+            if misses is None:
+                misses = [result]
+            else:
+                misses.append(result)
+
+        if misses is None:
+            raise MissingTokenError(
+                f"No token found in request from '{[loc for loc, _ in chain]}'"
+            )
+        raise MissingTokenError(
+            *(miss.message(config, refresh=refresh) for miss in misses)
+        )
+
+
 async def _get_token_from_request(
     request: Request,
     config: FJWTConfig,
@@ -197,20 +839,5 @@ async def _get_token_from_request(
     locations: Optional[TokenLocations] = None,
     **kwargs,
 ) -> RequestToken:
-    errors: List[MissingTokenError] = []
-
-    if locations is None:
-        locations = config.JWT_TOKEN_LOCATION
-
-    for location in locations:
-        try:
-            getter = TOKEN_GETTERS[location]
-            token = await getter(request, config=config, refresh=refresh)
-            if token is not None:
-                return token
-        except MissingTokenError as e:
-            errors.append(e)
-
-    if errors:
-        raise MissingTokenError(*(str(err) for err in errors))
-    raise MissingTokenError(f"No token found in request from '{locations}'")
+    resolver: _TokenResolver = config._memoize("token_resolver", _TokenResolver)
+    return await resolver.resolve(request, refresh=refresh, locations=locations)
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
+from typing import Union
 from typing import Generic
 from typing import TypeVar
 from typing import Optional
@@ -10,6 +11,8 @@ from fastapi import Response
 
 from .types import StrOrSeq
 from .types import DateTimeExpression
+from .models import IssuedToken
+from .models import TokenBundle
 
 if TYPE_CHECKING:
     from .fastjwt import FastJWT
@@ -122,13 +125,53 @@ class FastJWTDeps(Generic[T]):
             uid, headers, expiry, data, audience, *args, **kwargs
         )
 
+    def create_token_pair(
+        self,
+        uid: str,
+        fresh: bool = False,
+        headers: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+        access_expiry: Optional[DateTimeExpression] = None,
+        refresh_expiry: Optional[DateTimeExpression] = None,
+    ) -> TokenBundle:
+        """Generate an access token & a refresh token
+
+        Args:
+            uid (str): Unique identifier to generate tokens for
+            fresh (bool, optional): Generate fresh access token. Defaults to False.
+            headers (Dict[str, Any], optional): Additional headers. Defaults to None.
+            data (Dict[str, Any], optional): Additional data store in tokens.
+                Defaults to None.
+            audience (StrOrSeq, optional): Audience claim. Defaults to None.
+            access_expiry (DateTimeExpression, optional): User defined access
+                token expiry claim. Defaults to None.
+            refresh_expiry (DateTimeExpression, optional): User defined refresh
+                token expiry claim. Defaults to None.
+
+        Returns:
+            TokenBundle: Access & refresh tokens
+        """
+        return self._security.create_token_pair(
+            uid,
+            fresh=fresh,
+            headers=headers,
+            data=data,
+            audience=audience,
+            access_expiry=access_expiry,
+            refresh_expiry=refresh_expiry,
+        )
+
     def set_access_cookies(
-        self, token, response: Optional[Response] = None, max_age: Optional[int] = None
+        self,
+        token: Union[str, IssuedToken, TokenBundle],
+        response: Optional[Response] = None,
+        max_age: Optional[int] = None,
     ):
         """Add 'Set-Cookie' for access token in response header
 
         Args:
-            token (str): Access token
+            token (Union[str, IssuedToken, TokenBundle]): Access token
             response (Response, optional): Response to set cookie on.
                 Defaults to None
             max_age (int, optional): Max Age cookie paramater.
@@ -143,12 +186,15 @@ class FastJWTDeps(Generic[T]):
         )
 
     def set_refresh_cookies(
-        self, token, response: Optional[Response] = None, max_age: Optional[int] = None
+        self,
+        token: Union[str, IssuedToken, TokenBundle],
+        response: Optional[Response] = None,
+        max_age: Optional[int] = None,
     ):
         """Add 'Set-Cookie' for refresh token in response header
 
         Args:
-            token (str): Refresh token
+            token (Union[str, IssuedToken, TokenBundle]): Refresh token
             response (Response): Response to set cookie on.
                 Defaults to None
             max_age (int, optional): Max Age cookie paramater.
@@ -0,0 +1,253 @@
+import hmac
+import json
+import hashlib
+import binascii
+import datetime
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Optional
+from typing import Sequence
+
+from jwt import api_jws
+
+from .codec import JSONCodec
+from .types import StrOrSeq
+from .types import SymmetricAlgorithmType
+from .claims import validate_claims
+from .exceptions import JWTDecodeError
+from .exceptions import BadConfigurationError
+
+DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+_ENCODE_TABLE = bytes.maketrans(b"+/", b"-_")
+_DECODE_TABLE = bytes.maketrans(b"-_", b"+/")
+
+
+def base64url_encode(data: bytes) -> bytes:
+    """Encode bytes as unpadded base64url
+
+    Args:
+        data (bytes): Data to encode
+
+    Returns:
+        bytes: base64url segment
+    """
+    return (
+        binascii.b2a_base64(data, newline=False).translate(_ENCODE_TABLE).rstrip(b"=")
+    )
+
+
+def base64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url segment
+
+    Args:
+        segment (bytes): base64url segment
+
+    Raises:
+        ValueError: The segment is not valid base64url
+
+    Returns:
+        bytes: Decoded data
+    """
+    return binascii.a2b_base64(segment.translate(_DECODE_TABLE) + b"==")
+
+
+class HMACEngine:
+    """Native HMAC signature & verification of tokens
+
+    Note:
+        The engine keeps an `hmac` object keyed once and copied for each
+        token, and precomputes the header segment of tokens without
+        additional headers. Signatures are compared in constant time.
+
+    Note:
+        Claims are validated like `decode_token` does (`exp`, `nbf`,
+        `iat`, `iss`, `aud`, `sub`, `jti`). Tokens the engine does not
+        handle natively (`crit`/`b64` headers, another algorithm,
+        malformed segments) are delegated to PyJWT, so that the result
+        and the error messages stay identical.
+
+    Args:
+        algorithm (SymmetricAlgorithmType): HMAC algorithm
+        key (Union[str, bytes]): Secret key
+        codec (JSONCodec): Claims serialization
+
+    Attributes:
+        algorithm (SymmetricAlgorithmType): HMAC algorithm
+        key (bytes): Secret key
+        codec (JSONCodec): Claims serialization
+    """
+
+    def __init__(
+        self,
+        algorithm: SymmetricAlgorithmType,
+        key: Union[str, bytes],
+        codec: JSONCodec,
+    ) -> None:
+        """See help(HMACEngine) for more info
+
+        Args:
+            algorithm (SymmetricAlgorithmType): HMAC algorithm
+            key (Union[str, bytes]): Secret key
+            codec (JSONCodec): Claims serialization
+
+        Raises:
+            BadConfigurationError: The algorithm is not an HMAC algorithm
+        """
+        if algorithm not in DIGESTS:
+            raise BadConfigurationError(
+                f"Bad Algorithm. Value allowed are '{list(DIGESTS)}'"
+            )
+        self.algorithm = algorithm
+        self.key = key.encode() if isinstance(key, str) else key
+        self.codec = codec
+        self._hmac = hmac.new(self.key, digestmod=DIGESTS[algorithm])
+        self._header = self._encode_header({})
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, bytes, JSONCodec]]:
+        return self.__class__, (self.algorithm, self.key, self.codec)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.algorithm!r}, codec={self.codec!r})"
+
+    def _encode_header(self, headers: Dict[str, Any]) -> bytes:
+        """Encode a token header, as PyJWT does"""
+        header = {"typ": "JWT", "alg": self.algorithm, **headers}
+        return base64url_encode(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        """Return the base64url signature of a signing input"""
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return base64url_encode(mac.digest())
+
+    def encode(
+        self, claims: Dict[str, Any], headers: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Sign claims
+
+        Args:
+            claims (Dict[str, Any]): Token claims
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+
+        Returns:
+            str: encoded token
+        """
+        if not headers:
+            header = self._header
+        elif (
+            "alg" in headers
+            or "b64" in headers
+            or not headers.get("typ", True)
+            or not isinstance(headers.get("kid", ""), str)
+        ):
+            return api_jws.encode(
+                self.codec.dumps(claims),
+                key=self.key,
+                algorithm=self.algorithm,
+                headers=headers,
+            )
+        else:
+            header = self._encode_header(headers)
+        signing_input = header + b"." + base64url_encode(self.codec.dumps(claims))
+        return (signing_input + b"." + self._sign(signing_input)).decode()
+
+    def _decode_fallback(
+        self,
+        token: str,
+        algorithms: Sequence[str],
+        audience: Optional[StrOrSeq],
+        issuer: Optional[str],
+        leeway: float,
+    ) -> Dict[str, Any]:
+        """Decode a token the engine can not handle with PyJWT"""
+        try:
+            return self.codec.jwt.decode(
+                jwt=token,
+                key=self.key,
+                algorithms=algorithms,
+                audience=audience,
+                issuer=issuer,
+                leeway=leeway,
+            )
+        except Exception as e:
+            raise JWTDecodeError(*e.args)
+
+    def _verify_header(self, segment: bytes) -> bool:
+        """Whether a header segment can be verified by the engine"""
+        if segment == self._header:
+            return True
+        try:
+            header = json.loads(base64url_decode(segment))
+        except ValueError:
+            return False
+        return (
+            isinstance(header, dict)
+            and header.get("alg") == self.algorithm
+            and "crit" not in header
+            and "b64" not in header
+            and isinstance(header.get("kid", ""), str)
+        )
+
+    def decode(
+        self,
+        token: str,
+        algorithms: Optional[Sequence[str]] = None,
+        audience: Optional[StrOrSeq] = None,
+        issuer: Optional[str] = None,
+        leeway: Union[float, datetime.timedelta] = 0,
+    ) -> Dict[str, Any]:
+        """Verify a token and return its claims
+
+        Args:
+            token (str): Token to decode
+            algorithms (Optional[Sequence[str]], optional): Algorithms allowed.
+                Defaults to the engine algorithm.
+            audience (Optional[StrOrSeq], optional): Audiences to verify.
+                Defaults to None.
+            issuer (Optional[str], optional): Issuer to verify. Defaults to None.
+            leeway (Union[float, datetime.timedelta], optional): Time margin
+                for expiration checks. Defaults to 0.
+
+        Raises:
+            JWTDecodeError: The token signature or claims are invalid
+
+        Returns:
+            Dict[str, Any]: The decoded claims
+        """
+        if isinstance(leeway, datetime.timedelta):
+            leeway = leeway.total_seconds()
+        if algorithms is None:
+            algorithms = [self.algorithm]
+        try:
+            data = token.encode()
+            signing_input, signature = data.rsplit(b".", 1)
+            header, payload = signing_input.split(b".", 1)
+        except (AttributeError, ValueError):
+            return self._decode_fallback(token, algorithms, audience, issuer, leeway)
+        if (
+            self.algorithm not in algorithms
+            or b"." in payload
+            or b"=" in signature
+            or not self._verify_header(header)
+        ):
+            return self._decode_fallback(token, algorithms, audience, issuer, leeway)
+        if not hmac.compare_digest(self._sign(signing_input), signature):
+            raise JWTDecodeError("Signature verification failed")
+        try:
+            claims = self.codec.loads(base64url_decode(payload))
+        except (ValueError, RecursionError):
+            return self._decode_fallback(token, algorithms, audience, issuer, leeway)
+        if not isinstance(claims, dict):
+            raise JWTDecodeError("Invalid payload string: must be a json object")
+        validate_claims(claims, audience=audience, issuer=issuer, leeway=leeway)
+        return claims
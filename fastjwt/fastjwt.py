@@ -1,34 +1,64 @@
 from typing import Any
 from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
 from typing import Literal
+from typing import Mapping
 from typing import TypeVar
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
+from typing import Sequence
 from typing import Coroutine
 from typing import overload
+from functools import partial
+from concurrent.futures import Executor
 
 from fastapi import Depends
 from fastapi import Request
 from fastapi import Response
 
+from .bulk import TokenSpec
+from .bulk import BulkTokens
+from .bulk import SigningJob
+from .core import _CookieTemplates
+from .core import _ImplicitRefreshRules
 from .core import _get_token_from_request
+from .cache import SubjectCache
+from .cache import RefreshRegistry
+from .cache import VerifiedTokenCache
+from .token import create_claims
+from .token import encode_claims
 from .types import StrOrSeq
 from .types import TokenType
 from .types import TokenLocations
 from .types import DateTimeExpression
-from .utils import get_uuid
+from .utils import get_now_ts
+from .utils import get_id_factory
 from .config import FJWTConfig
+from .models import IssuedToken
+from .models import TokenBundle
 from .models import RequestToken
 from .models import TokenPayload
+from .models import VerifiedClaims
+from .signer import TokenSigner
 from ._errors import _ErrorHandler
+from .offload import CryptoOffloader
 from ._callback import _CallbackHandler
+from .blocklist import RevocationFilter
 from .exceptions import FastJWTException
 from .exceptions import MissingTokenError
 from .exceptions import RevokedTokenError
 from .dependencies import FastJWTDeps
+from .instrumentation import StageListener
+from .instrumentation import Instrumentation
 
 T = TypeVar("T")
 
+VERIFIED_TOKENS_SCOPE_KEY = "fastjwt.verified_tokens"
+
 
 class FastJWT(_CallbackHandler[T], _ErrorHandler):
     """The base FastJWT object
@@ -63,15 +93,44 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         super().__init__(model=model)
         super(_CallbackHandler, self).__init__()
         self._config = config
+        self.instrumentation = Instrumentation()
 
     def load_config(self, config: FJWTConfig) -> None:
         """Loads a FJWTConfig as the new configuration
 
+        Note:
+            Objects derived from the previous configuration are discarded,
+            the crypto offloader executors are shut down.
+
         Args:
             config (FJWTConfig): Configuration to load
         """
+        if config is not self._config:
+            self._config._discard_compiled()
         self._config = config
 
+    def add_stage_listener(self, listener: StageListener) -> None:
+        """Register a listener of the authentication stage timings
+
+        Note:
+            The listener receives a `fastjwt.instrumentation.StageEvent` for
+            each stage of the authentication pipeline: token extraction,
+            decoding, claims verification, blocklist lookups and subject
+            retrieval.
+
+        Args:
+            listener (StageListener): Callable receiving each StageEvent
+        """
+        self.instrumentation.add_listener(listener)
+
+    def remove_stage_listener(self, listener: StageListener) -> None:
+        """Unregister a listener of the authentication stage timings
+
+        Args:
+            listener (StageListener): A registered listener
+        """
+        self.instrumentation.remove_listener(listener)
+
     @property
     def config(self) -> FJWTConfig:
         """FastJWT Configuration getter
@@ -81,6 +140,133 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         """
         return self._config
 
+    @property
+    def token_cache(self) -> Optional[VerifiedTokenCache]:
+        """Cache of verified token payloads
+
+        Note:
+            The cache is disabled by default. Set `JWT_DECODE_CACHE_SIZE`
+            to a positive integer to enable it. The cache is rebuilt
+            empty whenever the configuration changes, and emptied when
+            the JWKS key ring is reloaded.
+
+        Returns:
+            Optional[VerifiedTokenCache]: The cache, None if disabled
+        """
+        cache = self.config._memoize("token_cache", VerifiedTokenCache.from_config)
+        if cache is not None:
+            cache.set_key_version(self._signer.key_version)
+        return cache
+
+    @property
+    def subject_cache(self) -> Optional[SubjectCache]:
+        """Cache of subjects returned by the subject getter
+
+        Note:
+            The cache is disabled by default. Set `JWT_SUBJECT_CACHE_SIZE`
+            to a positive integer to enable it.
+
+        Returns:
+            Optional[SubjectCache]: The cache, None if disabled
+        """
+        return self.config._memoize("subject_cache", SubjectCache.from_config)
+
+    @property
+    def crypto_offload(self) -> Optional[CryptoOffloader]:
+        """Executor offload of asymmetric signatures & verifications
+
+        Note:
+            Enabled by `JWT_CRYPTO_OFFLOAD`, or by
+            `JWT_CRYPTO_OFFLOAD_LAG_INTERVAL` to measure the event loop lag
+            with inline crypto. Its `stats` expose the offloaded operations
+            and the loop lag. It is shut down, without waiting for pending
+            operations, when a configuration option is updated.
+
+        Returns:
+            Optional[CryptoOffloader]: The offloader, None if disabled
+        """
+        return self.config._memoize(
+            "crypto_offload",
+            CryptoOffloader.from_config,
+            partial(CryptoOffloader.shutdown, wait=False),
+        )
+
+    @property
+    def refresh_registry(self) -> Optional[RefreshRegistry]:
+        """Single-flight registry of implicit refreshes
+
+        Note:
+            Requests carrying the same access token share the token
+            issued by the first implicit refresh for
+            `JWT_IMPLICIT_REFRESH_GRACE`. Set
+            `JWT_IMPLICIT_REFRESH_REGISTRY_SIZE` to 0 to disable it.
+
+        Returns:
+            Optional[RefreshRegistry]: The registry, None if disabled
+        """
+        return self.config._memoize("refresh_registry", RefreshRegistry.from_config)
+
+    def invalidate_subject(self, uid: Optional[str] = None) -> None:
+        """Remove a subject from the subject cache
+
+        Args:
+            uid (Optional[str], optional): Subject identifier to remove.
+                Defaults to None (remove every subject).
+        """
+        cache = self.subject_cache
+        if cache is None:
+            return
+        if uid is None:
+            cache.clear()
+        else:
+            cache.pop(uid)
+
+    async def _get_token_blocklist_filter(self) -> Optional[RevocationFilter]:
+        """Return the revocation filter, synced with the blocklist backend
+
+        Note:
+            The filter is only used with a backend listing its revoked
+            tokens. Until its first sync completes, lookups go to the
+            backend. It is synced again every
+            `JWT_BLOCKLIST_FILTER_SYNC_INTERVAL`.
+
+        Returns:
+            Optional[RevocationFilter]: The synced filter, None if the
+                backend must be called
+        """
+        if (
+            self.token_blocklist_filter is None
+            and self.config.JWT_BLOCKLIST_FILTER_CAPACITY > 0
+        ):
+            # Built once, revoked entries must survive configuration changes
+            self.token_blocklist_filter = RevocationFilter.from_config(self.config)
+        revocation_filter = self.token_blocklist_filter
+        if revocation_filter is None or self.token_blocklist is None:
+            return None
+        synced_at = revocation_filter.synced_at
+        if revocation_filter.syncing:
+            return None if synced_at is None else revocation_filter
+        interval = self.config.JWT_BLOCKLIST_FILTER_SYNC_INTERVAL
+        if synced_at is None or (
+            interval is not None
+            and revocation_filter.timer() - synced_at >= interval.total_seconds()
+        ):
+            try:
+                await revocation_filter.sync(self.token_blocklist)
+            except NotImplementedError:
+                return None
+        return revocation_filter
+
+    @property
+    def _cookie_templates(self) -> _CookieTemplates:
+        """Set-Cookie templates compiled from the configuration"""
+        return self.config._memoize("cookie_templates", _CookieTemplates)
+
+    @property
+    def _signer(self) -> TokenSigner:
+        """Token signer of the current configuration"""
+        return self.config._memoize("signer", TokenSigner)
+
     # region Core methods
 
     def _create_payload(
@@ -91,7 +277,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         expiry: Optional[DateTimeExpression] = None,
         data: Optional[Dict[str, Any]] = None,
         audience: Optional[StrOrSeq] = None,
-        **kwargs
+        **kwargs,
     ) -> TokenPayload:
         """Create a token payload
 
@@ -108,9 +294,9 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         Returns:
             TokenPayload: Token Payload instance
         """
+        new_id = get_id_factory(self.config.JWT_ID_FORMAT)
         # Handle additional data
-        if data is None:
-            data = {}
+        data = {"jti": new_id(), **(data or {})}
         # Handle expiry date
         exp = expiry
         if exp is None:
@@ -122,7 +308,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         # Handle CSRF
         csrf = None
         if self.config.has_location("cookies") and self.config.JWT_COOKIE_CSRF_PROTECT:
-            csrf = get_uuid()
+            csrf = new_id()
         # Handle audience
         aud = audience
         if aud is None:
@@ -137,7 +323,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
             csrf=csrf,
             # Handle NBF
             nbf=None,
-            **data
+            **data,
         )
         return payload
 
@@ -150,7 +336,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         expiry: Optional[DateTimeExpression] = None,
         data: Optional[Dict[str, Any]] = None,
         audience: Optional[StrOrSeq] = None,
-        **kwargs
+        **kwargs,
     ) -> str:
         """Generate a token
 
@@ -175,13 +361,9 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
             expiry=expiry,
             data=data,
             audience=audience,
-            **kwargs
-        )
-        token = payload.encode(
-            key=self.config.PRIVATE_KEY,
-            algorithm=self.config.JWT_ALGORITHM,
-            headers=headers,
+            **kwargs,
         )
+        token = payload.encode(**self._signer.encode_options(headers=headers))
 
         return token
 
@@ -205,57 +387,43 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         """
         return TokenPayload.decode(
             token=token,
-            key=self.config.PUBLIC_KEY,
-            algorithms=[self.config.JWT_ALGORITHM],
             verify=verify,
-            audience=audience if audience else self.config.JWT_DECODE_AUDIENCE,
-            issuer=issuer if issuer else self.config.JWT_DECODE_ISSUER,
+            **self._signer.decode_options(
+                token=token, audience=audience, issuer=issuer
+            ),
         )
 
     def _set_cookies(
         self,
-        token: str,
+        token: Union[str, IssuedToken],
         type: str,
         response: Response,
         max_age: Optional[int] = None,
         *args,
-        **kwargs
+        **kwargs,
     ) -> None:
-        if type == "access":
-            token_key = self.config.JWT_ACCESS_COOKIE_NAME
-            token_path = self.config.JWT_ACCESS_COOKIE_PATH
-            csrf_key = self.config.JWT_ACCESS_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_ACCESS_CSRF_COOKIE_PATH
-        elif type == "refresh":
-            token_key = self.config.JWT_REFRESH_COOKIE_NAME
-            token_path = self.config.JWT_REFRESH_COOKIE_PATH
-            csrf_key = self.config.JWT_REFRESH_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_REFRESH_CSRF_COOKIE_PATH
+        templates = self._cookie_templates
+        token_cookie, csrf_cookie = templates.get(type)
+        max_age = max_age if max_age else templates.max_age
+
+        if isinstance(token, IssuedToken):
+            issued, token = token, token.token
         else:
-            raise ValueError("Token type must be 'access' | 'refresh'")
+            issued = None
 
         # Set cookie
-        response.set_cookie(
-            key=token_key,
-            value=token,
-            path=token_path,
-            domain=self.config.JWT_COOKIE_DOMAIN,
-            samesite=self.config.JWT_COOKIE_SAMESITE,
-            secure=self.config.JWT_COOKIE_SECURE,
-            httponly=True,
-            max_age=max_age if max_age else self.config.JWT_COOKIE_MAX_AGE,
+        response.raw_headers.append(
+            (b"set-cookie", token_cookie.set_cookie(token, max_age))
         )
         # Set CSRF
-        if self.config.JWT_COOKIE_CSRF_PROTECT and self.config.JWT_CSRF_IN_COOKIES:
-            response.set_cookie(
-                key=csrf_key,
-                value=self._decode_token(token=token, verify=True).csrf,
-                path=csrf_path,
-                domain=self.config.JWT_COOKIE_DOMAIN,
-                samesite=self.config.JWT_COOKIE_SAMESITE,
-                secure=self.config.JWT_COOKIE_SECURE,
-                httponly=False,
-                max_age=max_age if max_age else self.config.JWT_COOKIE_MAX_AGE,
+        if csrf_cookie is not None:
+            csrf = (
+                issued.csrf
+                if issued is not None
+                else self._decode_token(token=token, verify=True).csrf
+            )
+            response.raw_headers.append(
+                (b"set-cookie", csrf_cookie.set_cookie(csrf, max_age))
             )
 
     def _unset_cookies(
@@ -263,30 +431,11 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         type: str,
         response: Response,
     ) -> None:
-        if type == "access":
-            token_key = self.config.JWT_ACCESS_COOKIE_NAME
-            token_path = self.config.JWT_ACCESS_COOKIE_PATH
-            csrf_key = self.config.JWT_ACCESS_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_ACCESS_CSRF_COOKIE_PATH
-        elif type == "refresh":
-            token_key = self.config.JWT_REFRESH_COOKIE_NAME
-            token_path = self.config.JWT_REFRESH_COOKIE_PATH
-            csrf_key = self.config.JWT_REFRESH_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_REFRESH_CSRF_COOKIE_PATH
-        else:
-            raise ValueError("Token type must be 'access' | 'refresh'")
+        token_cookie, csrf_cookie = self._cookie_templates.get(type)
         # Unset cookie
-        response.delete_cookie(
-            key=token_key,
-            path=token_path,
-            domain=self.config.JWT_COOKIE_DOMAIN,
-        )
-        if self.config.JWT_COOKIE_CSRF_PROTECT and self.config.JWT_CSRF_IN_COOKIES:
-            response.delete_cookie(
-                key=csrf_key,
-                path=csrf_path,
-                domain=self.config.JWT_COOKIE_DOMAIN,
-            )
+        response.raw_headers.append((b"set-cookie", token_cookie.delete_cookie()))
+        if csrf_cookie is not None:
+            response.raw_headers.append((b"set-cookie", csrf_cookie.delete_cookie()))
 
     @overload
     async def _get_token_from_request(  # noqa: E704
@@ -313,19 +462,14 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         refresh: bool = False,
         optional: bool = False,
     ) -> Optional[RequestToken]:
-        if refresh and locations is None:
-            locations = list(
-                set(self.config.JWT_TOKEN_LOCATION).intersection(["cookies", "json"])
-            )
-        elif (not refresh) and locations is None:
-            locations = list(self.config.JWT_TOKEN_LOCATION)
         try:
-            token = await _get_token_from_request(
-                request=request,
-                refresh=refresh,
-                locations=locations,
-                config=self.config,
-            )
+            with self.instrumentation.stage("extract"):
+                token = await _get_token_from_request(
+                    request=request,
+                    refresh=refresh,
+                    locations=locations,
+                    config=self.config,
+                )
             return token
         except MissingTokenError as e:
             if optional:
@@ -367,7 +511,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         verify_type: bool = True,
         verify_fresh: bool = False,
         verify_csrf: Optional[bool] = None,
-    ) -> TokenPayload:
+    ) -> VerifiedClaims:
         if type == "access":
             method = self.get_access_token_from_request
         elif type == "refresh":
@@ -379,20 +523,72 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
                 request.method.upper() in self.config.JWT_CSRF_METHODS
             )
 
+        # Tokens are verified once per request
+        verified = self.get_verified_token(request, type=type)
+        if verified is not None:
+            request_token, payload = verified
+            with self.instrumentation.stage("claims"):
+                return request_token.verify_payload(
+                    payload,
+                    verify_type=verify_type,
+                    verify_fresh=verify_fresh,
+                    verify_csrf=verify_csrf,
+                )
+
         request_token = await method(
             request=request,
         )
+        return await self._verify_request_token(
+            request,
+            request_token,
+            type=type,
+            verify_type=verify_type,
+            verify_fresh=verify_fresh,
+            verify_csrf=verify_csrf,
+        )
 
-        if self.is_token_in_blocklist(request_token.token):
-            raise RevokedTokenError("Token has been revoked")
-
-        return self.verify_token(
+    async def _verify_request_token(
+        self,
+        request: Request,
+        request_token: RequestToken,
+        type: str = "access",
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        verify_csrf: bool = True,
+    ) -> VerifiedClaims:
+        """Verify a token extracted from a request, including the blocklist,
+        and attach it to the request scope"""
+        with self.instrumentation.stage("blocklist"):
+            if await self.is_token_in_blocklist_async(request_token.token):
+                raise RevokedTokenError("Token has been revoked")
+
+        payload = await self.verify_token_async(
             request_token,
             verify_type=verify_type,
             verify_fresh=verify_fresh,
             verify_csrf=verify_csrf,
         )
 
+        with self.instrumentation.stage("blocklist") as stage:
+            revocation_filter = await self._get_token_blocklist_filter()
+            if revocation_filter is None:
+                revoked = await self.is_jti_in_blocklist(payload.jti)
+            elif revocation_filter.might_contain(payload.jti):
+                # Possible hit, confirmed by the backend
+                revoked = await self.is_jti_in_blocklist(payload.jti)
+                revocation_filter.record_lookup(revoked)
+            else:
+                revoked = False
+                stage.mark("filtered")
+            if revoked:
+                raise RevokedTokenError("Token has been revoked")
+
+        request.scope.setdefault(VERIFIED_TOKENS_SCOPE_KEY, {})[type] = (
+            request_token,
+            payload,
+        )
+        return payload
+
     # endregion
 
     # region Token methods
@@ -403,7 +599,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         verify_type: bool = True,
         verify_fresh: bool = False,
         verify_csrf: bool = True,
-    ) -> TokenPayload:
+    ) -> VerifiedClaims:
         """Verify a request token
 
         Args:
@@ -415,16 +611,106 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
             verify_csrf (bool, optional): Apply token CSRF verification.
                 Defaults to True
 
+        Note:
+            When `JWT_DECODE_CACHE_SIZE` is set, tokens already verified
+            skip the signature verification and payload parsing steps.
+
         Returns:
-            TokenPayload: _description_
+            VerifiedClaims: The verified claims
         """
-        return token.verify(
-            key=self.config.PUBLIC_KEY,
-            algorithms=[self.config.JWT_ALGORITHM],
-            verify_fresh=verify_fresh,
-            verify_type=verify_type,
-            verify_csrf=verify_csrf,
-        )
+        instrumentation = self.instrumentation
+        cache = self.token_cache
+        with instrumentation.stage("decode") as stage:
+            payload = None if cache is None else cache.get_payload(token.token)
+            if payload is None:
+                payload = token.decode(**self._signer.decode_options(token.token))
+                if cache is not None:
+                    cache.set_payload(token.token, payload)
+            else:
+                stage.mark("cached")
+        with instrumentation.stage("claims"):
+            return token.verify_payload(
+                payload,
+                verify_fresh=verify_fresh,
+                verify_type=verify_type,
+                verify_csrf=verify_csrf,
+            )
+
+    async def verify_token_async(
+        self,
+        token: RequestToken,
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        verify_csrf: bool = True,
+    ) -> VerifiedClaims:
+        """Verify a request token without blocking the event loop
+
+        Note:
+            Same as `verify_token`. When `JWT_CRYPTO_OFFLOAD` is enabled,
+            costly signature verifications run in the offload executor.
+
+        Args:
+            token (RequestToken): RequestToken instance
+            verify_type (bool, optional): Apply token type verification.
+                Defaults to True
+            verify_fresh (bool, optional): Apply token freshness verification.
+                Defaults to False
+            verify_csrf (bool, optional): Apply token CSRF verification.
+                Defaults to True
+
+        Returns:
+            VerifiedClaims: The verified claims
+        """
+        instrumentation = self.instrumentation
+        offload = self.crypto_offload
+        cache = self.token_cache
+        with instrumentation.stage("decode") as stage:
+            payload = None if cache is None else cache.get_payload(token.token)
+            if payload is None:
+                options = self._signer.decode_options(token.token)
+                if offload is None:
+                    payload = token.decode(**options)
+                else:
+                    payload = await offload.verify(
+                        options["algorithms"][0], partial(token.decode, **options)
+                    )
+                if cache is not None:
+                    cache.set_payload(token.token, payload)
+            else:
+                stage.mark("cached")
+        with instrumentation.stage("claims"):
+            return token.verify_payload(
+                payload,
+                verify_fresh=verify_fresh,
+                verify_type=verify_type,
+                verify_csrf=verify_csrf,
+            )
+
+    async def revoke_token(self, payload: Union[TokenPayload, VerifiedClaims]) -> None:
+        """Add a token to the blocklist backend & filter
+
+        Args:
+            payload (Union[TokenPayload, VerifiedClaims]): Payload of the token
+                to revoke
+
+        Raises:
+            AttributeError: No blocklist backend is set
+            ValueError: The token has no `jti` claim
+        """
+        if self.token_blocklist is None:
+            raise AttributeError(
+                "No token blocklist backend is set."
+                f" Use `{self.__class__.__name__}.set_token_blocklist_backend` before"
+            )
+        if payload.jti is None:
+            raise ValueError("Tokens without 'jti' claim can not be revoked")
+        expires_at = None
+        if isinstance(payload.exp, (int, float)):
+            expires_at = payload.exp + self._signer.leeway
+        await self.token_blocklist.revoke(payload.jti, expires_at=expires_at)
+        revocation_filter = self.token_blocklist_filter
+        if revocation_filter is not None:
+            revocation_filter.add(payload.jti, expires_at=expires_at)
 
     def create_access_token(
         self,
@@ -435,7 +721,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         data: Optional[Dict[str, Any]] = None,
         audience: Optional[StrOrSeq] = None,
         *args,
-        **kwargs
+        **kwargs,
     ) -> str:
         """Generate an Access Token
 
@@ -470,7 +756,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         data: Optional[Dict[str, Any]] = None,
         audience: Optional[StrOrSeq] = None,
         *args,
-        **kwargs
+        **kwargs,
     ) -> str:
         """Generate a refresh token
 
@@ -496,42 +782,351 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
             audience=audience,
         )
 
+    def _create_signing_jobs(
+        self,
+        specs: Iterable[Union[TokenSpec, Mapping[str, Any]]],
+        headers: Optional[Dict[str, Any]],
+    ) -> Iterator[SigningJob]:
+        """Build the claims & headers of the tokens to sign"""
+        csrf = (
+            self.config.has_location("cookies") and self.config.JWT_COOKIE_CSRF_PROTECT
+        )
+        audience = self.config.JWT_ENCODE_AUDIENCE
+        new_id = get_id_factory(self.config.JWT_ID_FORMAT)
+        for spec in specs:
+            if not isinstance(spec, TokenSpec):
+                spec = TokenSpec(**spec)
+            expiry = spec.expiry
+            if expiry is None:
+                expiry = (
+                    self.config.JWT_ACCESS_TOKEN_EXPIRES
+                    if spec.type == "access"
+                    else self.config.JWT_REFRESH_TOKEN_EXPIRES
+                )
+            claims = create_claims(
+                uid=spec.uid,
+                type=spec.type,
+                expiry=expiry,
+                jti=new_id(),
+                issued=int(get_now_ts()),
+                fresh=spec.fresh,
+                csrf=new_id() if csrf else False,
+                audience=audience if spec.audience is None else spec.audience,
+                issuer=self.config.JWT_ENCODE_ISSUER,
+                additional_data=spec.data,
+            )
+            if headers is None:
+                yield claims, spec.headers
+            else:
+                yield claims, {**(spec.headers or {}), **headers}
+
+    def create_tokens_bulk(
+        self,
+        specs: Iterable[Union[TokenSpec, Mapping[str, Any]]],
+        executor: Optional[Executor] = None,
+        chunksize: int = 64,
+    ) -> BulkTokens:
+        """Generate tokens in bulk
+
+        Note:
+            The signing key & options are resolved once for all the tokens.
+            Tokens are returned lazily, in the order of `specs`, and the
+            returned iterator exposes the issuance throughput as `stats`.
+
+        Note:
+            When an executor is provided, RSA/ECDSA/EdDSA signatures are
+            computed by the executor, in chunks of `chunksize` tokens.
+            The key is sent to `ProcessPoolExecutor` workers as PEM.
+            HMAC tokens are always signed inline, their signature is
+            cheaper than a round trip to the pool.
+
+        Args:
+            specs (Iterable[Union[TokenSpec, Mapping[str, Any]]]): Tokens to
+                generate, as `TokenSpec` or mappings of `TokenSpec` fields
+            executor (Optional[Executor], optional): Pool used to sign
+                asymmetric tokens. Defaults to None.
+            chunksize (int, optional): Tokens signed per executor job.
+                Defaults to 64.
+
+        Returns:
+            BulkTokens: Iterator over the encoded tokens
+        """
+        options = self._signer.encode_options()
+        if options["algorithm"].startswith("HS"):
+            executor = None
+        return BulkTokens(
+            self._create_signing_jobs(specs, headers=options["headers"]),
+            algorithm=options["algorithm"],
+            key=options["key"],
+            codec=options["codec"],
+            engine=options["engine"],
+            executor=executor,
+            chunksize=chunksize,
+        )
+
+    def _issue_tokens(self, specs: Iterable[TokenSpec]) -> List[IssuedToken]:
+        """Sign tokens in the calling thread"""
+        options = self._signer.encode_options()
+        jobs = list(self._create_signing_jobs(specs, headers=options["headers"]))
+        tokens = [
+            encode_claims(
+                claims,
+                key=options["key"],
+                algorithm=options["algorithm"],
+                headers=headers,
+                codec=options["codec"],
+                engine=options["engine"],
+            )
+            for claims, headers in jobs
+        ]
+        return self._issued_tokens(jobs, tokens)
+
+    async def _issue_tokens_async(
+        self, specs: Iterable[TokenSpec]
+    ) -> List[IssuedToken]:
+        """Sign tokens, offloading the signature when configured"""
+        offload = self.crypto_offload
+        if offload is None or self._signer.native_hmac:
+            return self._issue_tokens(specs)
+        options = self._signer.encode_options()
+        jobs = list(self._create_signing_jobs(specs, headers=options["headers"]))
+        tokens = await offload.sign(
+            jobs, options["algorithm"], options["key"], codec=options["codec"]
+        )
+        return self._issued_tokens(jobs, tokens)
+
+    @staticmethod
+    def _issued_tokens(jobs: List[SigningJob], tokens: List[str]) -> List[IssuedToken]:
+        """Pair the signed tokens with their claims"""
+        return [
+            IssuedToken(
+                token=token,
+                type=claims["type"],
+                jti=claims["jti"],
+                csrf=claims.get("csrf"),
+                expires_at=claims.get("exp"),
+            )
+            for (claims, _), token in zip(jobs, tokens)
+        ]
+
+    def create_token_pair(
+        self,
+        uid: str,
+        fresh: bool = False,
+        headers: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+        access_expiry: Optional[DateTimeExpression] = None,
+        refresh_expiry: Optional[DateTimeExpression] = None,
+    ) -> TokenBundle:
+        """Generate an access token & a refresh token
+
+        Note:
+            The claims are built without intermediate `TokenPayload`, and the
+            returned bundle exposes the `jti`, CSRF token & expiry of both
+            tokens, so that setting cookies does not decode them.
+
+        Args:
+            uid (str): Unique identifier to generate tokens for
+            fresh (bool, optional): Generate fresh access token. Defaults to False.
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+            data (Optional[Dict[str, Any]], optional): Additional data store in
+                tokens. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audience claim. Defaults to None.
+            access_expiry (Optional[DateTimeExpression], optional): User defined
+                access token expiry claim. Defaults to None.
+            refresh_expiry (Optional[DateTimeExpression], optional): User defined
+                refresh token expiry claim. Defaults to None.
+
+        Returns:
+            TokenBundle: Access & refresh tokens
+        """
+        spec = TokenSpec(uid=uid, headers=headers, data=data, audience=audience)
+        access, refresh = self._issue_tokens(
+            (
+                spec._replace(fresh=fresh, expiry=access_expiry),
+                spec._replace(type="refresh", expiry=refresh_expiry),
+            )
+        )
+        return TokenBundle(access=access, refresh=refresh)
+
+    async def create_access_token_async(
+        self,
+        uid: str,
+        fresh: bool = False,
+        headers: Optional[Dict[str, Any]] = None,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+    ) -> str:
+        """Generate an access token without blocking the event loop
+
+        Note:
+            When `JWT_CRYPTO_OFFLOAD` is enabled, costly signatures run in
+            the offload executor. Claims are built like `create_token_pair`.
+
+        Args:
+            uid (str): Unique identifier to generate token for
+            fresh (bool, optional): Generate fresh token. Defaults to False.
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+            expiry (Optional[DateTimeExpression], optional): User defined
+                expiry claim. Defaults to None.
+            data (Optional[Dict[str, Any]], optional): Additional data store
+                in token. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audience claim.
+                Defaults to None.
+
+        Returns:
+            str: Access Token
+        """
+        (token,) = await self._issue_tokens_async(
+            (
+                TokenSpec(
+                    uid=uid,
+                    fresh=fresh,
+                    headers=headers,
+                    expiry=expiry,
+                    data=data,
+                    audience=audience,
+                ),
+            )
+        )
+        return token.token
+
+    async def create_refresh_token_async(
+        self,
+        uid: str,
+        headers: Optional[Dict[str, Any]] = None,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+    ) -> str:
+        """Generate a refresh token without blocking the event loop
+
+        Note:
+            When `JWT_CRYPTO_OFFLOAD` is enabled, costly signatures run in
+            the offload executor. Claims are built like `create_token_pair`.
+
+        Args:
+            uid (str): Unique identifier to generate token for
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+            expiry (Optional[DateTimeExpression], optional): User defined
+                expiry claim. Defaults to None.
+            data (Optional[Dict[str, Any]], optional): Additional data store
+                in token. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audience claim.
+                Defaults to None.
+
+        Returns:
+            str: Refresh Token
+        """
+        (token,) = await self._issue_tokens_async(
+            (
+                TokenSpec(
+                    uid=uid,
+                    type="refresh",
+                    headers=headers,
+                    expiry=expiry,
+                    data=data,
+                    audience=audience,
+                ),
+            )
+        )
+        return token.token
+
+    async def create_token_pair_async(
+        self,
+        uid: str,
+        fresh: bool = False,
+        headers: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        audience: Optional[StrOrSeq] = None,
+        access_expiry: Optional[DateTimeExpression] = None,
+        refresh_expiry: Optional[DateTimeExpression] = None,
+    ) -> TokenBundle:
+        """Generate an access token & a refresh token without blocking
+        the event loop
+
+        Note:
+            Same as `create_token_pair`. When `JWT_CRYPTO_OFFLOAD` is
+            enabled, both tokens are signed by a single executor job.
+
+        Args:
+            uid (str): Unique identifier to generate tokens for
+            fresh (bool, optional): Generate fresh access token. Defaults to False.
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+            data (Optional[Dict[str, Any]], optional): Additional data store in
+                tokens. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audience claim. Defaults to None.
+            access_expiry (Optional[DateTimeExpression], optional): User defined
+                access token expiry claim. Defaults to None.
+            refresh_expiry (Optional[DateTimeExpression], optional): User defined
+                refresh token expiry claim. Defaults to None.
+
+        Returns:
+            TokenBundle: Access & refresh tokens
+        """
+        spec = TokenSpec(uid=uid, headers=headers, data=data, audience=audience)
+        access, refresh = await self._issue_tokens_async(
+            (
+                spec._replace(fresh=fresh, expiry=access_expiry),
+                spec._replace(type="refresh", expiry=refresh_expiry),
+            )
+        )
+        return TokenBundle(access=access, refresh=refresh)
+
     # endregion
 
     # region Cookie methods
 
     def set_access_cookies(
         self,
-        token: str,
+        token: Union[str, IssuedToken, TokenBundle],
         response: Response,
         max_age: Optional[int] = None,
     ) -> None:
         """Add 'Set-Cookie' for access token in response header
 
+        Note:
+            The CSRF token of an `IssuedToken` or `TokenBundle` is used as is,
+            an encoded token is decoded to read it.
+
         Args:
-            token (str): Access token
+            token (Union[str, IssuedToken, TokenBundle]): Access token
             response (Response): Response to set cookie on
             max_age (int, optional): Max Age cookie paramater.
                 Defaults to None
         """
+        if isinstance(token, TokenBundle):
+            token = token.access
         self._set_cookies(
             token=token, type="access", response=response, max_age=max_age
         )
 
     def set_refresh_cookies(
         self,
-        token: str,
+        token: Union[str, IssuedToken, TokenBundle],
         response: Response,
         max_age: Optional[int] = None,
     ) -> None:
         """Add 'Set-Cookie' for refresh token in response header
 
+        Note:
+            The CSRF token of an `IssuedToken` or `TokenBundle` is used as is,
+            an encoded token is decoded to read it.
+
         Args:
-            token (str): Refresh token
+            token (Union[str, IssuedToken, TokenBundle]): Refresh token
             response (Response): Response to set cookie on
             max_age (int, optional): Max Age cookie paramater.
                 Defaults to None
         """
+        if isinstance(token, TokenBundle):
+            token = token.refresh
         self._set_cookies(
             token=token, type="refresh", response=response, max_age=max_age
         )
@@ -606,29 +1201,29 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         return self.DEPENDENCY
 
     @property
-    def FRESH_REQUIRED(self) -> TokenPayload:
+    def FRESH_REQUIRED(self) -> VerifiedClaims:
         """FastAPI Dependency to enforce valid token availability in request
 
         Returns:
-            TokenPayload: Valid token Payload
+            VerifiedClaims: Valid token Payload
         """
         return Depends(self.fresh_token_required)
 
     @property
-    def ACCESS_REQUIRED(self) -> TokenPayload:
+    def ACCESS_REQUIRED(self) -> VerifiedClaims:
         """FastAPI Dependency to enforce presence of an `access` token in request
 
         Returns:
-            TokenPayload: Valid token Payload
+            VerifiedClaims: Valid token Payload
         """
         return Depends(self.access_token_required)
 
     @property
-    def REFRESH_REQUIRED(self) -> TokenPayload:
+    def REFRESH_REQUIRED(self) -> VerifiedClaims:
         """FastAPI Dependency to enforce presence of a `refresh` token in request
 
         Returns:
-            TokenPayload: Valid token Payload
+            VerifiedClaims: Valid token Payload
         """
         return Depends(self.refresh_token_required)
 
@@ -663,6 +1258,30 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
 
     # region Getters
 
+    def get_verified_token(
+        self, request: Request, type: TokenType = "access"
+    ) -> Optional[Tuple[RequestToken, VerifiedClaims]]:
+        """Return the token already verified within the request
+
+        Note:
+            The first successful verification of a request attaches the
+            RequestToken and its VerifiedClaims to the ASGI scope. Later
+            dependencies and middlewares reuse them instead of extracting,
+            decoding and checking the token blocklist again.
+
+        Args:
+            request (Request): Current request
+            type (TokenType, optional): Token type. Defaults to "access".
+
+        Returns:
+            Optional[Tuple[RequestToken, VerifiedClaims]]: The verified token
+                & payload, None if the token has not been verified yet
+        """
+        verified = request.scope.get(VERIFIED_TOKENS_SCOPE_KEY)
+        if verified is None:
+            return None
+        return verified.get(type)
+
     def get_dependency(self, request: Request, response: Response) -> FastJWTDeps:
         """FastAPI Dependency to return a FastJWT sub-object within the route context
 
@@ -689,7 +1308,8 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         verify_type: bool = True,
         verify_fresh: bool = False,
         verify_csrf: Optional[bool] = None,
-    ) -> Callable[[Request], TokenPayload]:
+        claims: Optional[Sequence[str]] = None,
+    ) -> Callable[[Request], VerifiedClaims]:
         """Dependency to enforce valid token availability in request
 
         Args:
@@ -701,26 +1321,37 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
                 Defaults to False
             verify_csrf (Optional[bool], optional): Enable CSRF verification.
                 Defaults to None
+            claims (Optional[Sequence[str]], optional): Claims used by the
+                route. Defaults to None (all claims).
+
+        Note:
+            When `claims` is set, the dependency returns a projection of the
+            verified claims (see `VerifiedClaims.project`): `extra_dict`,
+            `dict` & `to_payload` only convert the declared claims.
 
         Returns:
-            Callable[[Request], TokenPayload]: Dependency for Valid token
+            Callable[[Request], VerifiedClaims]: Dependency for Valid token
                 Payload retrieval
         """
+        names = None if claims is None else frozenset(claims)
 
         async def _auth_required(request: Request):
             """FastAPI Dependency to enforce valid token availability in request"""
-            return await self._auth_required(
+            payload = await self._auth_required(
                 request=request,
                 type=type,
                 verify_csrf=verify_csrf,
                 verify_type=verify_type,
                 verify_fresh=verify_fresh,
             )
+            if names is None:
+                return payload
+            return payload.project(names)
 
         return _auth_required
 
     @property
-    def fresh_token_required(self) -> Callable[[Request], TokenPayload]:
+    def fresh_token_required(self) -> Callable[[Request], VerifiedClaims]:
         """FastAPI Dependency to enforce presence of a `fresh` `access`
         token in request"""
         return self.token_required(
@@ -731,7 +1362,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         )
 
     @property
-    def access_token_required(self) -> Callable[[Request], TokenPayload]:
+    def access_token_required(self) -> Callable[[Request], VerifiedClaims]:
         """FastAPI Dependency to enforce presence of an `access` token in request"""
         return self.token_required(
             type="access",
@@ -741,7 +1372,7 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         )
 
     @property
-    def refresh_token_required(self) -> Callable[[Request], TokenPayload]:
+    def refresh_token_required(self) -> Callable[[Request], VerifiedClaims]:
         """FastAPI Dependency to enforce presence of a `refresh` token in request"""
         return self.token_required(
             type="refresh",
@@ -765,10 +1396,28 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         Note:
             This method will always return `None` if
             `FastJWT.set_subject_getter` has not been set first.
+
+        Note:
+            The subject is loaded once per request. When `JWT_SUBJECT_CACHE_SIZE`
+            is set, subjects are also cached across requests.
         """
-        token: TokenPayload = await self._auth_required(request=request)
+        token: VerifiedClaims = await self._auth_required(request=request)
         uid = token.sub
-        return self._get_current_subject(uid=uid)
+        memo: Optional[Tuple[str, T]] = getattr(request.state, "fastjwt_subject", None)
+        if memo is not None and memo[0] == uid:
+            return memo[1]
+
+        cache = self.subject_cache
+        with self.instrumentation.stage("subject") as stage:
+            subject = None if cache is None else cache.get(uid)
+            if subject is None:
+                subject = await self._get_current_subject_async(uid=uid)
+                if cache is not None and subject is not None:
+                    cache.set(uid, subject)
+            else:
+                stage.mark("cached")
+        request.state.fastjwt_subject = (uid, subject)
+        return subject
 
     def get_token_from_request(
         self, type: TokenType = "access", optional: bool = True
@@ -812,23 +1461,42 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         Returns:
             bool: True if request allows for refreshing access token
         """
-        if (
-            request.url.components.path
-            in self.config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE
-        ):
-            refresh = False
-        elif (
-            request.url.components.path
-            in self.config.JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE
-        ):
-            refresh = True
-        elif request.method in self.config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE:
-            refresh = False
-        elif request.method in self.config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE:
-            refresh = False
-        else:
-            refresh = True
-        return refresh
+        rules: _ImplicitRefreshRules = self.config._memoize(
+            "implicit_refresh_rules", _ImplicitRefreshRules
+        )
+        return rules.enabled(request.url.path, request.method)
+
+    async def _get_implicit_refresh_token(
+        self, request: Request, request_token: RequestToken, payload: VerifiedClaims
+    ) -> Optional[IssuedToken]:
+        """Create a new access token if the verified one is about to expire
+
+        Args:
+            request (Request): Current request
+            request_token (RequestToken): Verified access token
+            payload (VerifiedClaims): Payload of the verified access token
+
+        Returns:
+            Optional[IssuedToken]: The new access token, None if no refresh is needed
+        """
+        verify_csrf = self.config.JWT_COOKIE_CSRF_PROTECT and (
+            request.method.upper() in self.config.JWT_CSRF_METHODS
+        )
+        request_token.verify_payload(payload, verify_csrf=verify_csrf)
+        if payload.time_until_expiry >= self.config.JWT_IMPLICIT_REFRESH_DELTATIME:
+            return None
+
+        async def issue() -> IssuedToken:
+            """Sign the refreshed access token"""
+            (new_token,) = await self._issue_tokens_async(
+                (TokenSpec(uid=payload.sub, data=payload.extra_dict),)
+            )
+            return new_token
+
+        registry = self.refresh_registry
+        if registry is None:
+            return await issue()
+        return await registry.get_or_issue(payload, issue)
 
     async def implicit_refresh_middleware(
         self, request: Request, call_next: Coroutine
@@ -852,6 +1520,11 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
             The implicit refresh mechanism is only enabled
             for authorization through cookies.
 
+        Note:
+            This middleware relies on Starlette's `BaseHTTPMiddleware`.
+            Prefer the ASGI `fastjwt.middleware.FastJWTMiddleware`, which
+            does not wrap the response stream.
+
         Returns:
             Response: Response with update access token cookie if relevant
         """
@@ -864,20 +1537,25 @@ class FastJWT(_CallbackHandler[T], _ErrorHandler):
         if request_condition:
             try:
                 # Refresh mechanism
-                token = await self._get_token_from_request(
-                    request=request,
-                    locations=["cookies"],
-                    refresh=False,
-                    optional=False,
-                )
-                payload = self.verify_token(token, verify_fresh=False)
-                if (
-                    payload.time_until_expiry
-                    < self.config.JWT_IMPLICIT_REFRESH_DELTATIME
-                ):
-                    new_token = self.create_access_token(
-                        uid=payload.sub, fresh=False, data=payload.extra_dict
+                verified = self.get_verified_token(request, type="access")
+                if verified is not None and verified[0].location == "cookies":
+                    # Reuse the token verified by the route dependencies
+                    token, payload = verified
+                else:
+                    token = await self._get_token_from_request(
+                        request=request,
+                        locations=["cookies"],
+                        refresh=False,
+                        optional=False,
                     )
+                    # CSRF is checked before refreshing
+                    payload = await self.verify_token_async(
+                        token, verify_fresh=False, verify_csrf=False
+                    )
+                new_token = await self._get_implicit_refresh_token(
+                    request, token, payload
+                )
+                if new_token is not None:
                     self.set_access_cookies(new_token, response=response)
             except FastJWTException:
                 pass
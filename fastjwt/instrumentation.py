@@ -0,0 +1,254 @@
+import time
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+from typing import NamedTuple
+
+# Stages of the authentication pipeline, in order
+STAGES = ("extract", "decode", "claims", "blocklist", "subject")
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+
+
+class StageEvent(NamedTuple):
+    """Timing of an authentication pipeline stage
+
+    Args:
+        stage (str): Stage name, one of `STAGES`
+        outcome (str): "ok", the name of the exception raised by the
+            stage, or "cached" (decode & subject served from a FastJWT
+            cache), "filtered" (blocklist answered by the revocation
+            filter), "missing" (no token found by the middleware)
+        start (float): Start of the stage, `time.perf_counter` seconds
+        duration (float): Duration of the stage in seconds
+        error (Optional[BaseException]): Exception raised by the stage
+    """
+
+    stage: str
+    outcome: str
+    start: float
+    duration: float
+    error: Optional[BaseException] = None
+
+
+StageListener = Callable[[StageEvent], None]
+
+
+class _Stage:
+    """Context manager timing a stage for the registered listeners"""
+
+    __slots__ = ("listeners", "stage", "outcome", "start")
+
+    def __init__(self, listeners: Tuple[StageListener, ...], stage: str) -> None:
+        """See help(_Stage) for more info"""
+        self.listeners = listeners
+        self.stage = stage
+        self.outcome = "ok"
+        self.start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        duration = time.perf_counter() - self.start
+        outcome = self.outcome if exc is None else type(exc).__name__
+        event = StageEvent(self.stage, outcome, self.start, duration, exc)
+        for listener in self.listeners:
+            listener(event)
+
+    def mark(self, outcome: str) -> None:
+        """Set the outcome reported when the stage succeeds"""
+        self.outcome = outcome
+
+
+class _NullStage:
+    """Stage used when no listener is registered"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+    def mark(self, outcome: str) -> None:
+        """Ignore the outcome"""
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """Registry of the listeners notified of the authentication stage timings
+
+    Note:
+        Without listeners, stages are not timed: `stage` returns a shared
+        no-op context manager. Listeners are called synchronously, in the
+        task running the stage, and must not raise.
+    """
+
+    def __init__(self) -> None:
+        """See help(Instrumentation) for more info"""
+        self.listeners: Tuple[StageListener, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.listeners)
+
+    def add_listener(self, listener: StageListener) -> None:
+        """Register a listener
+
+        Args:
+            listener (StageListener): Callable receiving each StageEvent
+        """
+        self.listeners = (*self.listeners, listener)
+
+    def remove_listener(self, listener: StageListener) -> None:
+        """Unregister a listener
+
+        Args:
+            listener (StageListener): A registered listener
+
+        Raises:
+            ValueError: The listener is not registered
+        """
+        listeners = list(self.listeners)
+        listeners.remove(listener)
+        self.listeners = tuple(listeners)
+
+    def stage(self, name: str):
+        """Return a context manager timing a stage
+
+        Args:
+            name (str): Stage name
+
+        Returns:
+            Context manager whose `mark(outcome)` method overrides the
+            outcome of a successful stage
+        """
+        if not self.listeners:
+            return _NULL_STAGE
+        return _Stage(self.listeners, name)
+
+
+class PrometheusListener:
+    """Observe the stage durations in a Prometheus histogram
+
+    Note:
+        Any histogram exposing `labels(stage=..., outcome=...).observe(seconds)`
+        is supported, e.g. a `prometheus_client.Histogram` declared with the
+        `["stage", "outcome"]` label names.
+
+    Args:
+        histogram (Any): Histogram labelled by stage & outcome
+    """
+
+    def __init__(self, histogram: Any) -> None:
+        """See help(PrometheusListener) for more info
+
+        Args:
+            histogram (Any): Histogram labelled by stage & outcome
+        """
+        self.histogram = histogram
+
+    def __call__(self, event: StageEvent) -> None:
+        self.histogram.labels(stage=event.stage, outcome=event.outcome).observe(
+            event.duration
+        )
+
+    @classmethod
+    def create(
+        cls,
+        registry: Optional[Any] = None,
+        name: str = "fastjwt_stage_duration_seconds",
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> "PrometheusListener":
+        """Declare a `prometheus_client` histogram and observe it
+
+        Args:
+            registry (Optional[Any], optional): `prometheus_client` collector
+                registry. Defaults to None (the default registry).
+            name (str, optional): Metric name.
+                Defaults to "fastjwt_stage_duration_seconds".
+            buckets (Tuple[float, ...], optional): Histogram buckets in
+                seconds. Defaults to 10µs up to 100ms.
+
+        Raises:
+            ImportError: `prometheus_client` is not installed
+
+        Returns:
+            PrometheusListener: Listener observing the new histogram
+        """
+        from prometheus_client import REGISTRY
+        from prometheus_client import Histogram
+
+        histogram = Histogram(
+            name,
+            "Duration of the FastJWT authentication stages",
+            ["stage", "outcome"],
+            registry=REGISTRY if registry is None else registry,
+            buckets=buckets,
+        )
+        return cls(histogram)
+
+
+class OpenTelemetryListener:
+    """Record each stage as an OpenTelemetry span
+
+    Note:
+        Spans are named `fastjwt.<stage>` and started after the stage,
+        with its measured start & end times, as children of the current
+        span. Failed stages record their exception and an error status.
+
+    Args:
+        tracer (Any): OpenTelemetry tracer, e.g.
+            `opentelemetry.trace.get_tracer("fastjwt")`
+    """
+
+    def __init__(self, tracer: Any) -> None:
+        """See help(OpenTelemetryListener) for more info
+
+        Args:
+            tracer (Any): OpenTelemetry tracer
+        """
+        self.tracer = tracer
+        # Converts perf_counter timings to the epoch nanoseconds of spans
+        self._offset = time.time_ns() - time.perf_counter_ns()
+        try:
+            from opentelemetry.trace import Status
+            from opentelemetry.trace import StatusCode
+        except ImportError:
+            self._error_status = None
+        else:
+            self._error_status = lambda outcome: Status(StatusCode.ERROR, outcome)
+
+    def __call__(self, event: StageEvent) -> None:
+        start = self._offset + int(event.start * 1e9)
+        attributes: Dict[str, Any] = {
+            "fastjwt.stage": event.stage,
+            "fastjwt.outcome": event.outcome,
+        }
+        span = self.tracer.start_span(
+            f"fastjwt.{event.stage}", start_time=start, attributes=attributes
+        )
+        if event.error is not None:
+            span.record_exception(event.error)
+            if self._error_status is not None:
+                span.set_status(self._error_status(event.outcome))
+        span.end(end_time=start + int(event.duration * 1e9))
@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+
+from jwt import PyJWK
+from jwt.exceptions import PyJWKError
+from jwt.exceptions import InvalidKeyError
+
+from .types import AlgorithmType
+from .config import FJWTConfig
+from .exceptions import BadConfigurationError
+
+
+class KeyRingEntry:
+    """A key of a KeyRing
+
+    Args:
+        kid (str): Key identifier
+        algorithm (AlgorithmType): Algorithm the key is meant for
+        signing_key (Optional[Any]): Parsed key to encode tokens,
+            None for public keys
+        verifying_key (Any): Parsed key to decode tokens
+    """
+
+    __slots__ = ("kid", "algorithm", "algorithms", "signing_key", "verifying_key")
+
+    def __init__(
+        self,
+        kid: str,
+        algorithm: AlgorithmType,
+        signing_key: Optional[Any],
+        verifying_key: Any,
+    ) -> None:
+        """See help(KeyRingEntry) for more info
+
+        Args:
+            kid (str): Key identifier
+            algorithm (AlgorithmType): Algorithm the key is meant for
+            signing_key (Optional[Any]): Parsed key to encode tokens
+            verifying_key (Any): Parsed key to decode tokens
+        """
+        self.kid = kid
+        self.algorithm = algorithm
+        self.algorithms: List[AlgorithmType] = [algorithm]
+        self.signing_key = signing_key
+        self.verifying_key = verifying_key
+
+    @classmethod
+    def from_jwk(cls, jwk: Dict[str, Any]) -> "KeyRingEntry":
+        """Parse a JSON Web Key
+
+        Args:
+            jwk (Dict[str, Any]): JSON Web Key with a `kid` member
+
+        Raises:
+            BadConfigurationError: The JWK can not be used
+
+        Returns:
+            KeyRingEntry: The parsed key
+        """
+        kid = jwk.get("kid")
+        if not kid:
+            raise BadConfigurationError("JWK without 'kid' can not be used")
+        try:
+            parsed = PyJWK(jwk, algorithm=jwk.get("alg"))
+        except (PyJWKError, InvalidKeyError, ValueError, TypeError) as e:
+            raise BadConfigurationError(f"Invalid JWK '{kid}'", *e.args)
+        algorithm = getattr(parsed, "algorithm_name", None) or jwk.get("alg")
+        if algorithm is None:
+            raise BadConfigurationError(f"JWK '{kid}' requires an 'alg' member")
+
+        key = parsed.key
+        if isinstance(key, bytes):
+            # Symmetric keys sign & verify
+            return cls(kid, algorithm, signing_key=key, verifying_key=key)
+        if hasattr(key, "public_key"):
+            # Private keys, verification requires the public part
+            return cls(kid, algorithm, signing_key=key, verifying_key=key.public_key())
+        return cls(kid, algorithm, signing_key=None, verifying_key=key)
+
+
+def _parse_jwks(jwks: Dict[str, Any]) -> Dict[str, KeyRingEntry]:
+    """Index the signature keys of a JWKS document by `kid`"""
+    keys = jwks.get("keys")
+    if not isinstance(keys, list):
+        raise BadConfigurationError("JWKS document must contain a 'keys' list")
+    index: Dict[str, KeyRingEntry] = {}
+    for jwk in keys:
+        if jwk.get("use", "sig") != "sig":
+            continue
+        entry = KeyRingEntry.from_jwk(jwk)
+        index[entry.kid] = entry
+    return index
+
+
+class KeyRing:
+    """Set of keys indexed by `kid`, loaded from a JWKS document
+
+    Note:
+        When loaded from a file, the file is checked for modification
+        at most once per `refresh_interval`. A modified file is parsed
+        entirely before replacing the current keys, so lookups never see
+        a partially loaded key ring. If the new document is invalid, the
+        current keys are kept. Each reload increments `version`, which
+        empties the FastJWT verified token cache.
+
+    Args:
+        jwks (Optional[Dict[str, Any]], optional): In-memory JWKS document.
+            Defaults to None.
+        path (Optional[str], optional): Path to a JWKS file. Defaults to None.
+        refresh_interval (float, optional): Minimum delay in seconds between
+            two file modification checks. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        jwks: Optional[Dict[str, Any]] = None,
+        path: Optional[str] = None,
+        refresh_interval: float = 1.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """See help(KeyRing) for more info
+
+        Args:
+            jwks (Optional[Dict[str, Any]], optional): In-memory JWKS document.
+                Defaults to None.
+            path (Optional[str], optional): Path to a JWKS file. Defaults to None.
+            refresh_interval (float, optional): Minimum delay in seconds between
+                two file modification checks. Defaults to 1.
+            timer (Callable[[], float], optional): Clock used for refresh checks.
+                Defaults to `time.monotonic`.
+
+        Raises:
+            BadConfigurationError: Neither or both `jwks` and `path` are given
+        """
+        if (jwks is None) == (path is None):
+            raise BadConfigurationError("KeyRing requires either 'jwks' or 'path'")
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._file_version: Optional[Tuple[int, int]] = None
+        self._version = 0
+        self._index: Dict[str, KeyRingEntry] = {}
+        if jwks is not None:
+            self._index = _parse_jwks(jwks)
+        else:
+            self.reload()
+
+    @classmethod
+    def from_config(cls, config: FJWTConfig) -> Optional["KeyRing"]:
+        """Build the key ring described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_JWKS*` options
+
+        Returns:
+            Optional[KeyRing]: The key ring, None if not configured
+        """
+        if config.JWT_JWKS is None and config.JWT_JWKS_FILE is None:
+            return None
+        return cls(
+            jwks=config.JWT_JWKS,
+            path=config.JWT_JWKS_FILE,
+            refresh_interval=config.JWT_JWKS_REFRESH_INTERVAL.total_seconds(),
+        )
+
+    def reload(self) -> bool:
+        """Reload keys from the JWKS file if it has been modified
+
+        Raises:
+            BadConfigurationError: The file can not be loaded on first load
+
+        Returns:
+            bool: True if the keys have been replaced
+        """
+        if self.path is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            if version == self._file_version:
+                return False
+            with open(self.path, "rb") as f:
+                index = _parse_jwks(json.load(f))
+        except (OSError, ValueError, BadConfigurationError) as e:
+            if self._file_version is None:
+                if isinstance(e, BadConfigurationError):
+                    raise
+                raise BadConfigurationError(f"Can not load JWKS '{self.path}'", str(e))
+            return False
+        self._index = index
+        self._file_version = version
+        self._version += 1
+        return True
+
+    def _refresh(self) -> None:
+        """Reload the keys when the refresh interval has elapsed"""
+        now = self.timer()
+        if now < self._next_check:
+            return
+        if self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.refresh_interval
+                self.reload()
+            finally:
+                self._lock.release()
+
+    @property
+    def version(self) -> int:
+        """Number of times the keys have been loaded"""
+        if self.path is not None:
+            self._refresh()
+        return self._version
+
+    @property
+    def kids(self) -> List[str]:
+        """Identifiers of the available keys"""
+        if self.path is not None:
+            self._refresh()
+        return list(self._index)
+
+    def get(self, kid: str) -> Optional[KeyRingEntry]:
+        """Return the key identified by `kid`
+
+        Args:
+            kid (str): Key identifier
+
+        Returns:
+            Optional[KeyRingEntry]: The key, None if unknown
+        """
+        if self.path is not None:
+            self._refresh()
+        return self._index.get(kid)
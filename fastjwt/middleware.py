@@ -0,0 +1,149 @@
+from typing import TYPE_CHECKING
+from typing import List
+from typing import Tuple
+from typing import Optional
+
+from fastapi import Request
+from fastapi import Response
+from starlette.types import Send
+from starlette.types import Scope
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+
+from .core import TOKEN_FINDERS
+from .core import _scan_headers
+from .models import RequestToken
+from .models import VerifiedClaims
+from .exceptions import FastJWTException
+
+if TYPE_CHECKING:
+    from .fastjwt import FastJWT
+
+# Locations which can be read without consuming the request body
+HEADER_LOCATIONS = ("headers", "cookies", "query")
+
+
+class FastJWTMiddleware:
+    """ASGI middleware verifying access tokens & refreshing access cookies
+
+    Note:
+        The access token is extracted from the request headers, cookies or
+        query string, verified, and attached to the ASGI scope before the
+        application runs. Route dependencies reuse it instead of verifying
+        the token again. Tokens sent in the JSON body are left to the
+        dependencies, the body is never read by the middleware.
+
+    Note:
+        When implicit refresh is enabled, the access cookie is refreshed by
+        adding `Set-Cookie` headers to the `http.response.start` message.
+        The response body is not buffered, streaming responses are
+        supported.
+
+    Args:
+        app (ASGIApp): ASGI application
+        security (FastJWT): FastJWT instance
+        implicit_refresh (bool, optional): Refresh access cookies about to
+            expire. Defaults to True.
+    """
+
+    def __init__(
+        self, app: ASGIApp, security: "FastJWT", implicit_refresh: bool = True
+    ) -> None:
+        """See help(FastJWTMiddleware) for more info
+
+        Args:
+            app (ASGIApp): ASGI application
+            security (FastJWT): FastJWT instance
+            implicit_refresh (bool, optional): Refresh access cookies about to
+                expire. Defaults to True.
+        """
+        self.app = app
+        self.security = security
+        self.implicit_refresh = implicit_refresh
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        verified = await self._verify(request)
+        if (
+            verified is None
+            or not self.implicit_refresh
+            or verified[0].location != "cookies"
+            or not self.security._implicit_refresh_enabled_for_request(request)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                cookies = await self._get_refresh_cookies(request)
+                if cookies:
+                    message["headers"] = list(message.get("headers", ())) + cookies
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _get_token(self, request: Request) -> Optional[RequestToken]:
+        """Find the access token of the request headers & cookies"""
+        config = self.security.config
+        for location in config.JWT_TOKEN_LOCATION:
+            if location not in HEADER_LOCATIONS:
+                # The dependencies would read the body first
+                return None
+            if (
+                location == "cookies"
+                and config.JWT_COOKIE_CSRF_PROTECT
+                and request.method.upper() in config.JWT_CSRF_METHODS
+                and _scan_headers(request.scope, config).get_csrf() is None
+            ):
+                # The CSRF token might be in the form data
+                return None
+            result = await TOKEN_FINDERS[location](request, config)
+            if isinstance(result, RequestToken):
+                return result
+        return None
+
+    async def _verify(
+        self, request: Request
+    ) -> Optional[Tuple[RequestToken, VerifiedClaims]]:
+        """Verify the access token of a request, None without a token"""
+        with self.security.instrumentation.stage("extract") as stage:
+            request_token = await self._get_token(request)
+            if request_token is None:
+                stage.mark("missing")
+        if request_token is None:
+            return None
+        try:
+            payload = await self.security._verify_request_token(
+                request, request_token, type="access", verify_csrf=False
+            )
+        except FastJWTException:
+            # Errors are raised by the route dependencies
+            return None
+        return request_token, payload
+
+    async def _get_refresh_cookies(self, request: Request) -> List[Tuple[bytes, bytes]]:
+        """Set-Cookie headers of the implicitly refreshed access token"""
+        verified = self.security.get_verified_token(request, type="access")
+        if verified is None:
+            return []
+        request_token, payload = verified
+        try:
+            new_token = await self.security._get_implicit_refresh_token(
+                request, request_token, payload
+            )
+        except FastJWTException:
+            return []
+        if new_token is None:
+            return []
+        response = Response()
+        self.security.set_access_cookies(new_token, response=response)
+        return [
+            (name, value)
+            for name, value in response.raw_headers
+            if name == b"set-cookie"
+        ]
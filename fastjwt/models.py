@@ -3,8 +3,15 @@ from hmac import compare_digest
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
+from typing import Mapping
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
 from typing import Sequence
+from typing import FrozenSet
+from typing import NamedTuple
+from typing import AbstractSet
 
 from pydantic import Extra
 from pydantic import Field
@@ -12,6 +19,7 @@ from pydantic import BaseModel
 from pydantic import ValidationError
 from pydantic import validator
 
+from .codec import JSONCodec
 from .token import create_token
 from .token import decode_token
 from .types import Union
@@ -24,6 +32,7 @@ from .types import DateTimeExpression
 from .utils import get_now
 from .utils import get_uuid
 from .utils import get_now_ts
+from .engine import HMACEngine
 from .exceptions import CSRFError
 from .exceptions import JWTDecodeError
 from .exceptions import TokenTypeError
@@ -32,6 +41,51 @@ from .exceptions import AccessTokenRequiredError
 from .exceptions import RefreshTokenRequiredError
 
 
+class IssuedToken(NamedTuple):
+    """Encoded token with the claims required to deliver it
+
+    Args:
+        token (str): Encoded token
+        type (TokenType): Token type
+        jti (str): JWT unique identifier
+        csrf (Optional[str]): CSRF double submit token. Defaults to None.
+        expires_at (Optional[Numeric]): Expiry timestamp. Defaults to None.
+    """
+
+    token: str
+    type: TokenType
+    jti: str
+    csrf: Optional[str] = None
+    expires_at: Optional[Numeric] = None
+
+
+class TokenBundle(NamedTuple):
+    """Access & refresh tokens issued together
+
+    Note:
+        A TokenBundle can be passed to `FastJWT.set_access_cookies` and
+        `FastJWT.set_refresh_cookies`, the CSRF tokens are read from the
+        bundle instead of decoding the tokens.
+
+    Args:
+        access (IssuedToken): Access token
+        refresh (IssuedToken): Refresh token
+    """
+
+    access: IssuedToken
+    refresh: IssuedToken
+
+    @property
+    def access_token(self) -> str:
+        """Encoded access token"""
+        return self.access.token
+
+    @property
+    def refresh_token(self) -> str:
+        """Encoded refresh token"""
+        return self.refresh.token
+
+
 class TokenPayload(BaseModel):
     """JWT Payload base model
 
@@ -157,6 +211,8 @@ class TokenPayload(BaseModel):
         algorithm: str,
         ignore_errors: bool = True,
         headers: Optional[Dict[str, Any]] = None,
+        codec: Optional[JSONCodec] = None,
+        engine: Optional[HMACEngine] = None,
     ) -> str:
         """Encode the payload
 
@@ -165,6 +221,10 @@ class TokenPayload(BaseModel):
             algorithm (str): Algorithm to use to encode the payload
             ignore_errors (bool, optional): Ignore validation errors. Defaults to True.
             headers (Optional[Dict[str, Any]], optional): TODO. Defaults to None.
+            codec (Optional[JSONCodec], optional): Claims serialization.
+                Defaults to None.
+            engine (Optional[HMACEngine], optional): Native HMAC engine.
+                Defaults to None.
 
         Returns:
             str: encoded token
@@ -186,6 +246,8 @@ class TokenPayload(BaseModel):
             not_before=self.nbf,
             ignore_errors=ignore_errors,
             headers=headers,
+            codec=codec,
+            engine=engine,
         )
 
     @classmethod
@@ -197,16 +259,26 @@ class TokenPayload(BaseModel):
         audience: Optional[StrOrSeq] = None,
         issuer: Optional[str] = None,
         verify: bool = True,
+        leeway: float = 0,
+        codec: Optional[JSONCodec] = None,
+        engine: Optional[HMACEngine] = None,
     ) -> "TokenPayload":
         """Given a token returns the associated JWT payload
 
         Args:
             token (str): Token to decode
             key (str): Secret to decode the token
-            algorithms (Sequence[AlgorithmType], optional): Algorithms to use to decode the token. Defaults to ["HS256"].
-            audience (Optional[StrOrSeq], optional): Audience to verify. Defaults to None.
+            algorithms (Sequence[AlgorithmType], optional): Algorithms to use to decode
+                the token. Defaults to ["HS256"].
+            audience (Optional[StrOrSeq], optional): Audience to verify.
+                Defaults to None.
             issuer (Optional[str], optional): Issuer to verify. Defaults to None.
             verify (bool, optional): Enable verification. Defaults to True.
+            leeway (float, optional): Time margin in seconds for expiration checks.
+                Defaults to 0.
+            codec (Optional[JSONCodec], optional): Claims parsing. Defaults to None.
+            engine (Optional[HMACEngine], optional): Native HMAC engine.
+                Defaults to None.
 
         Returns:
             TokenPayload: The decoded JWT payload
@@ -218,10 +290,352 @@ class TokenPayload(BaseModel):
             audience=audience,
             issuer=issuer,
             verify=verify,
+            leeway=leeway,
+            codec=codec,
+            engine=engine,
         )
         return cls.parse_obj(payload)
 
 
+# Claims validated by TokenPayload, extra claims are the others
+PAYLOAD_CLAIMS = frozenset(TokenPayload.__fields__)
+# Static default values of the TokenPayload claims
+PAYLOAD_DEFAULTS = {
+    name: field.default
+    for name, field in TokenPayload.__fields__.items()
+    if field.default_factory is None
+}
+# Claims which must be timestamps
+TIMESTAMP_CLAIMS = ("exp", "nbf", "iat")
+
+
+class VerifiedClaims(Mapping[str, Any]):
+    """Read-only claims of a decoded token
+
+    Note:
+        VerifiedClaims is built straight from the decoded claims, without
+        the pydantic validation of TokenPayload. It exposes the same read
+        API (registered claims, additional claims as attributes,
+        `extra_dict`, `issued_at`, `expiry_datetime`...) and derived values
+        are computed once. It is not a pydantic model: `dict` accepts the
+        pydantic selection arguments, use `to_payload` to get a TokenPayload.
+
+    Note:
+        VerifiedClaims is a read-only mapping of the claims, routes can
+        return it as is. It can be copied & pickled.
+
+    Note:
+        A projection (see `VerifiedClaims.project`) shares the decoded
+        claims of its source. Only the projected claims are converted by
+        `extra_dict` & `dict`, other claims remain available as attributes.
+        `to_payload` keeps every TokenPayload claim and the projected
+        additional claims.
+
+    Args:
+        claims (Dict[str, Any]): Decoded claims
+
+    Raises:
+        JWTDecodeError: A timestamp claim is not a number
+    """
+
+    __slots__ = ("_claims", "_names", "_issued_at", "_expiry_datetime", "_extra_dict")
+
+    def __init__(self, claims: Dict[str, Any]) -> None:
+        """See help(VerifiedClaims) for more info
+
+        Args:
+            claims (Dict[str, Any]): Decoded claims
+
+        Raises:
+            JWTDecodeError: A timestamp claim is not a number
+        """
+        for name in TIMESTAMP_CLAIMS:
+            value = claims.get(name)
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, (int, float))
+            ):
+                raise JWTDecodeError(f"'{name}' claim must be a number")
+        self._claims = claims
+        self._names: Optional[FrozenSet[str]] = None
+        self._issued_at: Optional[datetime.datetime] = None
+        self._expiry_datetime: Optional[datetime.datetime] = None
+        self._extra_dict: Optional[Dict[str, Any]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Private names are slots, unset while copying or unpickling
+        if not name.startswith("_"):
+            try:
+                return self._claims[name]
+            except KeyError:
+                pass
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+    def __getitem__(self, name: str) -> Any:
+        if self._names is not None and name not in self._names:
+            raise KeyError(name)
+        return self._claims[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, _ in self._items())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._items())
+
+    def __getstate__(self) -> Tuple[Dict[str, Any], Optional[FrozenSet[str]]]:
+        return self._claims, self._names
+
+    def __setstate__(
+        self, state: Tuple[Dict[str, Any], Optional[FrozenSet[str]]]
+    ) -> None:
+        self._claims, self._names = state
+        self._issued_at = None
+        self._expiry_datetime = None
+        self._extra_dict = None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, VerifiedClaims):
+            return self._claims == other._claims
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._claims!r})"
+
+    @property
+    def jti(self) -> Optional[str]:
+        """Unique identifier of the token"""
+        return self._claims.get("jti")
+
+    @property
+    def iss(self) -> Optional[str]:
+        """Issuer of the token"""
+        return self._claims.get("iss")
+
+    @property
+    def sub(self) -> Optional[str]:
+        """Subject of the token"""
+        return self._claims.get("sub")
+
+    @property
+    def aud(self) -> Optional[StrOrSeq]:
+        """Audience of the token"""
+        return self._claims.get("aud")
+
+    @property
+    def exp(self) -> Optional[Numeric]:
+        """Expiration time of the token"""
+        return self._claims.get("exp")
+
+    @property
+    def nbf(self) -> Optional[Numeric]:
+        """Time before which the token is not valid"""
+        return self._claims.get("nbf")
+
+    @property
+    def iat(self) -> Optional[Numeric]:
+        """Time at which the token was issued"""
+        return self._claims.get("iat")
+
+    @property
+    def type(self) -> Optional[str]:
+        """Type of the token, 'access' or 'refresh'"""
+        return self._claims.get("type")
+
+    @property
+    def csrf(self) -> Optional[str]:
+        """CSRF double submit value of the token"""
+        return self._claims.get("csrf")
+
+    @property
+    def scopes(self) -> Optional[List[str]]:
+        """Scopes granted to the token"""
+        return self._claims.get("scopes")
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the token is fresh"""
+        return bool(self._claims.get("fresh", False))
+
+    @property
+    def extra_dict(self) -> Dict[str, Any]:
+        """Additional claims, not declared by TokenPayload"""
+        if self._extra_dict is None:
+            self._extra_dict = {
+                k: v for k, v in self._items() if k not in PAYLOAD_CLAIMS
+            }
+        return self._extra_dict
+
+    @property
+    def issued_at(self) -> datetime.datetime:
+        """Cast the 'iat' claim as a datetime.datetime
+
+        Raises:
+            TypeError: 'iat' claim is missing
+
+        Returns:
+            datetime.datetime: UTC Datetime token issued date
+        """
+        if self._issued_at is None:
+            if self.iat is None:
+                raise TypeError("'iat' claim should be of type float | int")
+            self._issued_at = datetime.datetime.fromtimestamp(
+                self.iat, tz=datetime.timezone.utc
+            )
+        return self._issued_at
+
+    @property
+    def expiry_datetime(self) -> datetime.datetime:
+        """Cast the 'exp' claim as a datetime.datetime
+
+        Raises:
+            TypeError: 'exp' claim is missing
+
+        Returns:
+            datetime.datetime: UTC Datetime token expiry date
+        """
+        if self._expiry_datetime is None:
+            if self.exp is None:
+                raise TypeError("'exp' claim should be of type float | int")
+            self._expiry_datetime = datetime.datetime.fromtimestamp(
+                self.exp, tz=datetime.timezone.utc
+            )
+        return self._expiry_datetime
+
+    @property
+    def time_until_expiry(self) -> datetime.timedelta:
+        """Return the time remaining until expiry
+
+        Returns:
+            datetime.timedelta: time remaining until expiry
+        """
+        return self.expiry_datetime - get_now()
+
+    @property
+    def time_since_issued(self) -> datetime.timedelta:
+        """Return the time elapsed since token has been issued
+
+        Returns:
+            datetime.timedelta: time elapsed since token has been issued
+        """
+        return get_now() - self.issued_at
+
+    def has_scopes(self, *scopes: Sequence[str]) -> bool:
+        """Checks if a given scope is contained within the token scopes
+
+        Args:
+            *scopes (Sequence[str]): scopes to verify
+
+        Returns:
+            bool: Whether the scopes are contained in the token scopes
+        """
+        return all([s in (self.scopes or ()) for s in scopes])
+
+    def copy(self) -> "VerifiedClaims":
+        """VerifiedClaims is read-only, returns itself"""
+        return self
+
+    def _items(self) -> Iterable[Tuple[str, Any]]:
+        """Claims exposed by the instance, projected or not"""
+        if self._names is None:
+            return self._claims.items()
+        return ((k, self._claims[k]) for k in self._names if k in self._claims)
+
+    def project(self, names: Iterable[str]) -> "VerifiedClaims":
+        """Return a view restricted to some claims
+
+        Note:
+            The view shares the decoded claims, no claim is copied or
+            converted until it is accessed.
+
+        Args:
+            names (Iterable[str]): Claims to project
+
+        Returns:
+            VerifiedClaims: The projected claims
+        """
+        view = object.__new__(self.__class__)
+        view._claims = self._claims
+        view._names = frozenset(names)
+        if self._names is not None:
+            view._names &= self._names
+        view._issued_at = self._issued_at
+        view._expiry_datetime = self._expiry_datetime
+        view._extra_dict = None
+        return view
+
+    def dict(
+        self,
+        *,
+        include: Optional[Union[AbstractSet[str], Mapping[str, Any]]] = None,
+        exclude: Optional[Union[AbstractSet[str], Mapping[str, Any]]] = None,
+        by_alias: bool = False,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> Dict[str, Any]:
+        """Return a copy of the decoded claims
+
+        Note:
+            Accepts the arguments of pydantic's `TokenPayload.dict`. Claims
+            have no alias and are all set, `by_alias` & `exclude_unset` have
+            no effect. `include` & `exclude` select top-level claims.
+
+        Args:
+            include (Optional[Union[AbstractSet[str], Mapping[str, Any]]],
+                optional): Claims to keep. Defaults to None (every claim).
+            exclude (Optional[Union[AbstractSet[str], Mapping[str, Any]]],
+                optional): Claims to drop. Defaults to None.
+            by_alias (bool, optional): No effect. Defaults to False.
+            exclude_unset (bool, optional): No effect. Defaults to False.
+            exclude_defaults (bool, optional): Drop the TokenPayload claims
+                equal to their default value. Defaults to False.
+            exclude_none (bool, optional): Drop the None claims.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Decoded claims, restricted to the projected
+                claims for a projection
+        """
+        claims = dict(self._items())
+        if include is not None:
+            claims = {k: v for k, v in claims.items() if k in include}
+        if exclude is not None:
+            claims = {k: v for k, v in claims.items() if k not in exclude}
+        if exclude_none:
+            claims = {k: v for k, v in claims.items() if v is not None}
+        if exclude_defaults:
+            claims = {
+                k: v
+                for k, v in claims.items()
+                if k not in PAYLOAD_DEFAULTS or v != PAYLOAD_DEFAULTS[k]
+            }
+        return claims
+
+    def to_payload(self) -> TokenPayload:
+        """Build a TokenPayload from the claims
+
+        Note:
+            The TokenPayload claims of a projection are taken from the
+            decoded token, so that `jti` or `iat` are not regenerated.
+
+        Raises:
+            JWTDecodeError: The claims are not a valid TokenPayload
+
+        Returns:
+            TokenPayload: A new TokenPayload instance
+        """
+        claims = self.dict()
+        if self._names is not None:
+            claims.update(
+                (k, v) for k, v in self._claims.items() if k in PAYLOAD_CLAIMS
+            )
+        try:
+            return TokenPayload.parse_obj(claims)
+        except ValidationError as e:
+            raise JWTDecodeError(*e.args)
+
+
 class RequestToken(BaseModel):
     """Base model for token data retrieved from requests
 
@@ -237,41 +651,40 @@ class RequestToken(BaseModel):
     type: TokenType = "access"
     location: TokenLocation
 
-    def verify(
+    def decode(
         self,
         key: str,
         algorithms: Sequence[AlgorithmType] = ["HS256"],
         audience: Optional[StrOrSeq] = None,
         issuer: Optional[str] = None,
         verify_jwt: bool = True,
-        verify_type: bool = True,
-        verify_csrf: bool = True,
-        verify_fresh: bool = False,
-    ) -> TokenPayload:
-        """Verify a RequestToken
+        leeway: float = 0,
+        codec: Optional[JSONCodec] = None,
+        engine: Optional[HMACEngine] = None,
+    ) -> VerifiedClaims:
+        """Decode a RequestToken without any request related verification
 
         Args:
             key (str): Secret to decode the token
-            algorithms (Sequence[AlgorithmType], optional): Algorithms to use to decode the token. Defaults to ["HS256"].
-            audience (Optional[StrOrSeq], optional): Audience claim to verify. Defaults to None.
+            algorithms (Sequence[AlgorithmType], optional): Algorithms to use to decode
+                the token. Defaults to ["HS256"].
+            audience (Optional[StrOrSeq], optional): Audience claim to verify.
+                Defaults to None.
             issuer (Optional[str], optional): Issuer claim to verify. Defaults to None.
             verify_jwt (bool, optional): Enable base JWT verification. Defaults to True.
-            verify_type (bool, optional): Enable token type verification. Defaults to True.
-            verify_csrf (bool, optional): Enable CSRF verification. Defaults to True.
-            verify_fresh (bool, optional): Enable token freshness verification. Defaults to False.
+            leeway (float, optional): Time margin in seconds for expiration checks.
+                Defaults to 0.
+            codec (Optional[JSONCodec], optional): Claims parsing. Defaults to None.
+            engine (Optional[HMACEngine], optional): Native HMAC engine.
+                Defaults to None.
 
         Raises:
             JWTDecodeError: Error while decoding the token
             JWTDecodeError: The base JWT verification step has failed
-            FreshTokenRequiredError: The token is not fresh
-            CSRFError: A CSRF token is missing in the request
-            CSRFError: No CSRF claim is contained in the token
-            CSRFError: CSRF double submit does not match
 
         Returns:
-            TokenPayload: The payload encoded in the token
+            VerifiedClaims: The claims encoded in the token
         """
-        # JWT Base Verification
         try:
             decoded_token = decode_token(
                 token=self.token,
@@ -280,14 +693,41 @@ class RequestToken(BaseModel):
                 verify=verify_jwt,
                 audience=audience,
                 issuer=issuer,
+                leeway=leeway,
+                codec=codec,
+                engine=engine,
             )
-            # Parse payload
-            payload = TokenPayload.parse_obj(decoded_token)
+            return VerifiedClaims(decoded_token)
         except JWTDecodeError as e:
             raise JWTDecodeError(*e.args)
-        except ValidationError as e:
-            raise JWTDecodeError(*e.args)
 
+    def verify_payload(
+        self,
+        payload: Union[TokenPayload, VerifiedClaims],
+        verify_type: bool = True,
+        verify_csrf: bool = True,
+        verify_fresh: bool = False,
+    ) -> Union[TokenPayload, VerifiedClaims]:
+        """Verify the request related claims of a decoded RequestToken
+
+        Args:
+            payload (Union[TokenPayload, VerifiedClaims]): The decoded payload
+                of this RequestToken
+            verify_type (bool, optional): Enable token type verification.
+                Defaults to True.
+            verify_csrf (bool, optional): Enable CSRF verification. Defaults to True.
+            verify_fresh (bool, optional): Enable token freshness verification.
+                Defaults to False.
+
+        Raises:
+            FreshTokenRequiredError: The token is not fresh
+            CSRFError: A CSRF token is missing in the request
+            CSRFError: No CSRF claim is contained in the token
+            CSRFError: CSRF double submit does not match
+
+        Returns:
+            Union[TokenPayload, VerifiedClaims]: The verified payload
+        """
         # TODO Verify Headers
 
         if verify_type and (self.type != payload.type):
@@ -310,3 +750,67 @@ class RequestToken(BaseModel):
                 raise CSRFError("CSRF double submit does not match")
 
         return payload
+
+    def verify(
+        self,
+        key: str,
+        algorithms: Sequence[AlgorithmType] = ["HS256"],
+        audience: Optional[StrOrSeq] = None,
+        issuer: Optional[str] = None,
+        verify_jwt: bool = True,
+        verify_type: bool = True,
+        verify_csrf: bool = True,
+        verify_fresh: bool = False,
+        leeway: float = 0,
+        codec: Optional[JSONCodec] = None,
+        engine: Optional[HMACEngine] = None,
+    ) -> VerifiedClaims:
+        """Verify a RequestToken
+
+        Args:
+            key (str): Secret to decode the token
+            algorithms (Sequence[AlgorithmType], optional): Algorithms to use to decode
+                the token. Defaults to ["HS256"].
+            audience (Optional[StrOrSeq], optional): Audience claim to verify.
+                Defaults to None.
+            issuer (Optional[str], optional): Issuer claim to verify. Defaults to None.
+            verify_jwt (bool, optional): Enable base JWT verification. Defaults to True.
+            verify_type (bool, optional): Enable token type verification.
+                Defaults to True.
+            verify_csrf (bool, optional): Enable CSRF verification. Defaults to True.
+            verify_fresh (bool, optional): Enable token freshness verification.
+                Defaults to False.
+            leeway (float, optional): Time margin in seconds for expiration checks.
+                Defaults to 0.
+            codec (Optional[JSONCodec], optional): Claims parsing. Defaults to None.
+            engine (Optional[HMACEngine], optional): Native HMAC engine.
+                Defaults to None.
+
+        Raises:
+            JWTDecodeError: Error while decoding the token
+            JWTDecodeError: The base JWT verification step has failed
+            FreshTokenRequiredError: The token is not fresh
+            CSRFError: A CSRF token is missing in the request
+            CSRFError: No CSRF claim is contained in the token
+            CSRFError: CSRF double submit does not match
+
+        Returns:
+            VerifiedClaims: The claims encoded in the token
+        """
+        # JWT Base Verification
+        payload = self.decode(
+            key=key,
+            algorithms=algorithms,
+            audience=audience,
+            issuer=issuer,
+            verify_jwt=verify_jwt,
+            leeway=leeway,
+            codec=codec,
+            engine=engine,
+        )
+        return self.verify_payload(
+            payload,
+            verify_type=verify_type,
+            verify_csrf=verify_csrf,
+            verify_fresh=verify_fresh,
+        )
@@ -0,0 +1,371 @@
+import time
+import asyncio
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+from typing import NamedTuple
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+from .bulk import SigningJob
+from .bulk import _export_key
+from .bulk import _sign_chunk
+from .codec import JSONCodec
+from .types import AlgorithmType
+from .types import CryptoOffloadMode
+from .config import FJWTConfig
+from .engine import DIGESTS
+
+# Weight of the last measure in the operation cost estimates
+COST_SMOOTHING = 0.2
+
+
+def _timed(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[float, Any]:
+    """Run a function and measure its duration, in the executor workers"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+class LoopLagStats(NamedTuple):
+    """Event loop lag measured by a LoopLagMonitor
+
+    Args:
+        samples (int): Number of measures
+        mean (float): Mean lag in seconds
+        max (float): Maximum lag in seconds
+    """
+
+    samples: int
+    mean: float
+    max: float
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop runs scheduled callbacks
+
+    Note:
+        A callback is scheduled every `interval` seconds, the lag is the
+        delay between its due time and the time it actually runs. Blocking
+        work on the loop, such as inline RSA signatures, shows up as lag.
+
+    Args:
+        interval (float): Time between measures, in seconds
+        timer (Callable[[], float], optional): Clock. Defaults to the loop clock.
+    """
+
+    def __init__(
+        self, interval: float, timer: Optional[Callable[[], float]] = None
+    ) -> None:
+        """See help(LoopLagMonitor) for more info
+
+        Args:
+            interval (float): Time between measures, in seconds
+            timer (Callable[[], float], optional): Clock.
+                Defaults to the loop clock.
+        """
+        self.interval = interval
+        self.timer = timer
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.reset()
+
+    @property
+    def stats(self) -> LoopLagStats:
+        """Lag measured since the last reset"""
+        mean = self._total / self._samples if self._samples else 0.0
+        return LoopLagStats(self._samples, mean, self._max)
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is scheduled on an open event loop"""
+        return self._handle is not None and not self._loop.is_closed()
+
+    def reset(self) -> None:
+        """Discard the measures"""
+        self._samples = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start measuring the lag of an event loop, if not already running
+
+        Args:
+            loop (Optional[asyncio.AbstractEventLoop], optional): Loop to
+                monitor. Defaults to the running loop.
+        """
+        loop = loop or asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+        self._schedule()
+
+    def stop(self) -> None:
+        """Stop measuring"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _now(self) -> float:
+        """Current time of the monitor"""
+        return self.timer() if self.timer is not None else self._loop.time()
+
+    def _schedule(self) -> None:
+        """Schedule the next lag measurement"""
+        self._handle = self._loop.call_later(
+            self.interval, self._tick, self._now() + self.interval
+        )
+
+    def _tick(self, due: float) -> None:
+        """Record the lag of a measurement & schedule the next one"""
+        lag = max(self._now() - due, 0.0)
+        self._samples += 1
+        self._total += lag
+        self._max = max(self._max, lag)
+        self._schedule()
+
+
+class OffloadStats(NamedTuple):
+    """Activity of a CryptoOffloader
+
+    Args:
+        inline (int): Operations run on the event loop
+        offloaded (int): Operations run by the executors
+        costs (Dict[Tuple[str, str], float]): Estimated duration in seconds
+            of each (operation, algorithm)
+        loop_lag (LoopLagStats): Event loop lag, empty unless monitored
+    """
+
+    inline: int
+    offloaded: int
+    costs: Dict[Tuple[str, str], float]
+    loop_lag: LoopLagStats
+
+
+class CryptoOffloader:
+    """Run asymmetric signatures & verifications out of the event loop
+
+    Note:
+        Each (operation, algorithm) cost is estimated from the measured
+        durations. Operations estimated to cost at least `threshold` run
+        in a thread pool, cheaper ones, and every HMAC operation, run
+        inline since the executor round trip would cost more. An unknown
+        operation runs inline once to be measured.
+
+    Note:
+        In "process" mode, signatures run in a process pool, the signing
+        key being sent as PEM. Verifications still run in the thread pool,
+        their result would have to be pickled back otherwise.
+
+    Args:
+        mode (CryptoOffloadMode, optional): "inline", "thread" or "process".
+            Defaults to "thread".
+        workers (Optional[int], optional): Executor size. Defaults to None
+            (executor default).
+        threshold (float, optional): Minimal cost in seconds of an offloaded
+            operation. Defaults to 0.0001.
+        lag_interval (Optional[float], optional): Interval in seconds of the
+            event loop lag measures. Defaults to None (not measured).
+    """
+
+    def __init__(
+        self,
+        mode: CryptoOffloadMode = "thread",
+        workers: Optional[int] = None,
+        threshold: float = 0.0001,
+        lag_interval: Optional[float] = None,
+    ) -> None:
+        """See help(CryptoOffloader) for more info
+
+        Args:
+            mode (CryptoOffloadMode, optional): "inline", "thread" or "process".
+                Defaults to "thread".
+            workers (Optional[int], optional): Executor size. Defaults to None
+                (executor default).
+            threshold (float, optional): Minimal cost in seconds of an
+                offloaded operation. Defaults to 0.0001.
+            lag_interval (Optional[float], optional): Interval in seconds of
+                the event loop lag measures. Defaults to None (not measured).
+        """
+        self.mode = mode
+        self.workers = workers
+        self.threshold = threshold
+        self.monitor = LoopLagMonitor(lag_interval) if lag_interval else None
+        self._costs: Dict[Tuple[str, str], float] = {}
+        self._inline = 0
+        self._offloaded = 0
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._exported_key: Optional[Tuple[Any, Any]] = None
+
+    @classmethod
+    def from_config(cls, config: FJWTConfig) -> Optional["CryptoOffloader"]:
+        """Build the offloader described by a configuration
+
+        Args:
+            config (FJWTConfig): Configuration with `JWT_CRYPTO_OFFLOAD_*` options
+
+        Returns:
+            Optional[CryptoOffloader]: The offloader, None if crypto runs
+                inline and the loop lag is not measured
+        """
+        lag_interval = config.JWT_CRYPTO_OFFLOAD_LAG_INTERVAL
+        if config.JWT_CRYPTO_OFFLOAD == "inline" and lag_interval is None:
+            return None
+        return cls(
+            mode=config.JWT_CRYPTO_OFFLOAD,
+            workers=config.JWT_CRYPTO_OFFLOAD_WORKERS,
+            threshold=config.JWT_CRYPTO_OFFLOAD_THRESHOLD.total_seconds(),
+            lag_interval=lag_interval.total_seconds() if lag_interval else None,
+        )
+
+    @property
+    def stats(self) -> OffloadStats:
+        """Operations run so far & event loop lag"""
+        return OffloadStats(
+            inline=self._inline,
+            offloaded=self._offloaded,
+            costs=dict(self._costs),
+            loop_lag=self.monitor.stats if self.monitor else LoopLagStats(0, 0, 0),
+        )
+
+    @property
+    def thread_executor(self) -> ThreadPoolExecutor:
+        """Thread pool, created on first use"""
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="fastjwt-crypto"
+            )
+        return self._thread_executor
+
+    @property
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Process pool, created on first use"""
+        if self._process_executor is None:
+            self._process_executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._process_executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the lag monitor & the executors
+
+        Args:
+            wait (bool, optional): Wait for pending operations. Defaults to True.
+        """
+        if self.monitor is not None:
+            self.monitor.stop()
+        for executor in (self._thread_executor, self._process_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        self._thread_executor = self._process_executor = None
+
+    def should_offload(self, operation: str, algorithm: AlgorithmType) -> bool:
+        """Whether an operation is worth running in an executor
+
+        Args:
+            operation (str): "sign" or "verify"
+            algorithm (AlgorithmType): Algorithm of the operation
+
+        Returns:
+            bool: True if its estimated cost reaches the threshold
+        """
+        if self.mode == "inline" or algorithm in DIGESTS:
+            return False
+        cost = self._costs.get((operation, algorithm))
+        return cost is not None and cost >= self.threshold
+
+    def _record(self, operation: str, algorithm: AlgorithmType, cost: float) -> None:
+        """Update the smoothed cost of an operation"""
+        key = (operation, algorithm)
+        previous = self._costs.get(key)
+        if previous is not None:
+            cost = previous + COST_SMOOTHING * (cost - previous)
+        self._costs[key] = cost
+
+    async def _run(
+        self,
+        operation: str,
+        algorithm: AlgorithmType,
+        executor: Optional[Executor],
+        count: int,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """Run an operation inline or in an executor, recording its cost"""
+        if self.monitor is not None:
+            self.monitor.start()
+        if executor is None:
+            self._inline += count
+            cost, result = _timed(func, *args)
+        else:
+            self._offloaded += count
+            loop = asyncio.get_running_loop()
+            cost, result = await loop.run_in_executor(executor, _timed, func, *args)
+        self._record(operation, algorithm, cost / max(count, 1))
+        return result
+
+    async def verify(
+        self, algorithm: AlgorithmType, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run a verification
+
+        Args:
+            algorithm (AlgorithmType): Algorithm of the token
+            func (Callable[..., Any]): Verification function
+            *args (Any): Arguments of `func`
+
+        Returns:
+            Any: Result of `func`
+        """
+        executor = (
+            self.thread_executor if self.should_offload("verify", algorithm) else None
+        )
+        return await self._run("verify", algorithm, executor, 1, func, *args)
+
+    async def sign(
+        self,
+        jobs: List[SigningJob],
+        algorithm: AlgorithmType,
+        key: Any,
+        codec: Optional[JSONCodec] = None,
+    ) -> List[str]:
+        """Sign tokens
+
+        Args:
+            jobs (List[SigningJob]): Claims & headers of the tokens
+            algorithm (AlgorithmType): Signing algorithm
+            key (Any): Prepared signing key
+            codec (Optional[JSONCodec], optional): Claims serialization.
+                Defaults to None.
+
+        Returns:
+            List[str]: Encoded tokens, in the order of `jobs`
+        """
+        executor: Optional[Executor] = None
+        if self.should_offload("sign", algorithm):
+            if self.mode == "process":
+                executor = self.process_executor
+                key = self._export_key(key)
+            else:
+                executor = self.thread_executor
+        return await self._run(
+            "sign",
+            algorithm,
+            executor,
+            len(jobs),
+            _sign_chunk,
+            algorithm,
+            key,
+            jobs,
+            codec,
+        )
+
+    def _export_key(self, key: Any) -> Any:
+        """Serialize a key for the worker processes, once per key"""
+        if self._exported_key is None or self._exported_key[0] is not key:
+            self._exported_key = (key, _export_key(key))
+        return self._exported_key[1]
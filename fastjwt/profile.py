@@ -0,0 +1,165 @@
+import math
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Mapping
+from typing import Optional
+
+from .codec import JSONCodec
+from .token import RESERVED_CLAIMS
+from .types import TokenProfile
+from .exceptions import BadConfigurationError
+
+# Claims left out of compact tokens when they hold their default value
+DEFAULT_CLAIMS = {"type": "access", "fresh": False}
+# Registered claims left out of compact tokens when None
+OPTIONAL_CLAIMS = RESERVED_CLAIMS | {"scopes"}
+
+
+def compact_claims(
+    claims: Dict[str, Any], aliases: Optional[Mapping[str, str]] = None
+) -> Dict[str, Any]:
+    """Apply the compact profile to token claims
+
+    Note:
+        `iat` & `exp` are rounded down and `nbf` up to integer NumericDate
+        values. Registered claims set to None, `type` for access tokens and
+        `fresh` when false are left out. Custom claims are renamed to their
+        alias.
+
+    Args:
+        claims (Dict[str, Any]): Token claims
+        aliases (Optional[Mapping[str, str]], optional): Short names of
+            custom claims. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Compact claims
+    """
+    aliases = aliases or {}
+    compact = {}
+    for name, value in claims.items():
+        if name in OPTIONAL_CLAIMS:
+            if value is None or (
+                name in DEFAULT_CLAIMS and value == DEFAULT_CLAIMS[name]
+            ):
+                continue
+            if isinstance(value, float):
+                if name == "nbf":
+                    value = math.ceil(value)
+                elif name in ("iat", "exp"):
+                    value = math.floor(value)
+        else:
+            name = aliases.get(name, name)
+        compact[name] = value
+    return compact
+
+
+def expand_claims(
+    claims: Dict[str, Any], expansions: Optional[Mapping[str, str]] = None
+) -> Dict[str, Any]:
+    """Restore the full names of aliased custom claims
+
+    Args:
+        claims (Dict[str, Any]): Compact claims, modified in place
+        expansions (Optional[Mapping[str, str]], optional): Full names of
+            custom claims by alias. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Claims with their full names
+    """
+    if expansions:
+        for alias, name in expansions.items():
+            if alias in claims:
+                claims[name] = claims.pop(alias)
+    return claims
+
+
+class ProfileCodec(JSONCodec):
+    """JSON codec applying a token profile to the claims
+
+    Note:
+        Claims are compacted before serialization and aliases are expanded
+        after parsing, so that the rest of FastJWT only sees full claim
+        names. With the compact profile, a missing `type` claim is parsed
+        as "access". Standard tokens are parsed as is, a decoder configured
+        with the standard profile rejects compact access tokens.
+
+    Args:
+        codec (JSONCodec): Underlying JSON codec
+        profile (TokenProfile, optional): "standard" or "compact".
+            Defaults to "compact".
+        aliases (Optional[Mapping[str, str]], optional): Short names of
+            custom claims. Defaults to None.
+
+    Raises:
+        BadConfigurationError: An alias targets a registered claim or is
+            used twice
+
+    Note:
+        A custom claim can not be named after an alias, encoding it raises
+        a ValueError.
+    """
+
+    def __init__(
+        self,
+        codec: JSONCodec,
+        profile: TokenProfile = "compact",
+        aliases: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """See help(ProfileCodec) for more info
+
+        Args:
+            codec (JSONCodec): Underlying JSON codec
+            profile (TokenProfile, optional): "standard" or "compact".
+                Defaults to "compact".
+            aliases (Optional[Mapping[str, str]], optional): Short names of
+                custom claims. Defaults to None.
+
+        Raises:
+            BadConfigurationError: An alias targets a registered claim or is
+                used twice
+        """
+        super().__init__()
+        aliases = dict(aliases or {})
+        if OPTIONAL_CLAIMS.intersection([*aliases, *aliases.values()]):
+            raise BadConfigurationError(
+                f"Claim aliases can not involve registered claims {OPTIONAL_CLAIMS}"
+            )
+        if len(set(aliases.values())) != len(aliases) or not set(aliases).isdisjoint(
+            aliases.values()
+        ):
+            raise BadConfigurationError("Claim aliases must be unique")
+        self.codec = codec
+        self.profile = profile
+        self.aliases = aliases
+        self.expansions = {alias: name for name, alias in aliases.items()}
+        self.name = f"{profile}+{codec.name}"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[JSONCodec, str, Dict[str, str]]]:
+        return self.__class__, (self.codec, self.profile, self.aliases)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.codec!r}, profile={self.profile!r}, "
+            f"aliases={self.aliases!r})"
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        """Apply the profile & serialize claims, see `JSONCodec.dumps`"""
+        if not self.expansions.keys().isdisjoint(obj):
+            raise ValueError(f"{set(self.expansions)} are reserved as claim aliases")
+        if self.profile == "compact":
+            obj = compact_claims(obj, self.aliases)
+        elif self.aliases:
+            obj = {self.aliases.get(k, k): v for k, v in obj.items()}
+        return self.codec.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Parse claims & expand their aliases, see `JSONCodec.loads`"""
+        claims = self.codec.loads(data)
+        if isinstance(claims, dict):
+            expand_claims(claims, self.expansions)
+            if self.profile == "compact":
+                claims.setdefault("type", DEFAULT_CLAIMS["type"])
+        return claims
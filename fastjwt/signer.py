@@ -0,0 +1,243 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+
+from jwt import get_unverified_header
+from jwt.algorithms import Algorithm
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import DecodeError
+from jwt.exceptions import InvalidKeyError
+
+from .codec import JSONCodec
+from .codec import get_codec
+from .types import StrOrSeq
+from .types import AlgorithmType
+from .config import FJWTConfig
+from .engine import DIGESTS
+from .engine import HMACEngine
+from .keyring import KeyRing
+from .profile import ProfileCodec
+from .exceptions import JWTDecodeError
+from .exceptions import BadConfigurationError
+
+
+class TokenSigner:
+    """Signing & verification material compiled from a FJWTConfig
+
+    Note:
+        A TokenSigner resolves the algorithm, parses the keys and gathers
+        the decode options once, so that encoding & decoding tokens does
+        not require any further configuration lookup or PEM parsing.
+        Keys are parsed on first use, allowing a verification only setup
+        without `JWT_PRIVATE_KEY`.
+
+    Note:
+        When a JWKS is configured, tokens are signed with the key
+        `JWT_JWKS_SIGNING_KID` and stamped with a `kid` header. Tokens
+        with a `kid` header are verified with the matching key ring entry,
+        tokens without `kid` with the configured secret/public key.
+
+    Args:
+        config (FJWTConfig): Configuration to compile
+
+    Attributes:
+        algorithm (AlgorithmType): Algorithm used to encode tokens
+        algorithms (List[AlgorithmType]): Algorithms allowed to decode tokens
+        algorithm_instance (Algorithm): PyJWT algorithm instance
+        audience (Optional[StrOrSeq]): Audience claim to verify
+        issuer (Optional[str]): Issuer claim to verify
+        leeway (float): Time margin in seconds for expiration checks
+        keyring (Optional[KeyRing]): Keys indexed by `kid`
+        signing_kid (Optional[str]): Identifier of the key to sign tokens with
+        codec (JSONCodec): Serialization of the token claims, applying the
+            token profile & claim aliases
+        native_hmac (bool): Whether HMAC tokens are handled by `HMACEngine`
+    """
+
+    def __init__(self, config: FJWTConfig) -> None:
+        """See help(TokenSigner) for more info
+
+        Args:
+            config (FJWTConfig): Configuration to compile
+
+        Raises:
+            BadConfigurationError: `JWT_ALGORITHM` is not supported
+            BadConfigurationError: `JWT_JWKS_SIGNING_KID` is set without JWKS
+            BadConfigurationError: `JWT_JSON_CODEC` is not installed
+        """
+        default_algorithms = get_default_algorithms()
+        if config.JWT_ALGORITHM not in default_algorithms:
+            raise BadConfigurationError(
+                f"Bad Algorithm. Value allowed are '{default_algorithms}'"
+            )
+        self.algorithm: AlgorithmType = config.JWT_ALGORITHM
+        self.algorithms: List[AlgorithmType] = [config.JWT_ALGORITHM]
+        self.algorithm_instance: Algorithm = default_algorithms[config.JWT_ALGORITHM]
+        self.audience: Optional[StrOrSeq] = config.JWT_DECODE_AUDIENCE
+        self.issuer: Optional[str] = config.JWT_DECODE_ISSUER
+        self.leeway: float = config.JWT_DECODE_LEEWAY or 0
+        self.keyring: Optional[KeyRing] = KeyRing.from_config(config)
+        self.signing_kid: Optional[str] = config.JWT_JWKS_SIGNING_KID
+        self.codec: JSONCodec = get_codec(config.JWT_JSON_CODEC)
+        if config.JWT_TOKEN_PROFILE == "compact" or config.JWT_CLAIM_ALIASES:
+            self.codec = ProfileCodec(
+                self.codec, config.JWT_TOKEN_PROFILE, config.JWT_CLAIM_ALIASES
+            )
+        self.native_hmac: bool = (
+            config.JWT_HMAC_ENGINE == "native" and self.algorithm in DIGESTS
+        )
+        if self.signing_kid is not None and self.keyring is None:
+            raise BadConfigurationError(
+                "JWT_JWKS_SIGNING_KID requires JWT_JWKS or JWT_JWKS_FILE"
+            )
+        self._config = config
+        self._signing_key: Any = None
+        self._verifying_key: Any = None
+        self._engine: Optional[HMACEngine] = None
+
+    def _prepare_key(self, key: str) -> Any:
+        """Parse a key for the configured algorithm"""
+        try:
+            return self.algorithm_instance.prepare_key(key)
+        except (InvalidKeyError, TypeError, ValueError) as e:
+            raise BadConfigurationError(*e.args)
+
+    @property
+    def signing_key(self) -> Any:
+        """Parsed key used to encode tokens
+
+        Raises:
+            BadConfigurationError: The key is missing or can not be parsed
+
+        Returns:
+            Any: Secret bytes for symmetric algorithms,
+                `cryptography` private key otherwise
+        """
+        if self._signing_key is None:
+            self._signing_key = self._prepare_key(self._config.PRIVATE_KEY)
+        return self._signing_key
+
+    @property
+    def verifying_key(self) -> Any:
+        """Parsed key used to decode tokens
+
+        Raises:
+            BadConfigurationError: The key is missing or can not be parsed
+
+        Returns:
+            Any: Secret bytes for symmetric algorithms,
+                `cryptography` public key otherwise
+        """
+        if self._verifying_key is None:
+            self._verifying_key = self._prepare_key(self._config.PUBLIC_KEY)
+        return self._verifying_key
+
+    @property
+    def engine(self) -> Optional[HMACEngine]:
+        """Native HMAC engine keyed with the configured secret
+
+        Raises:
+            BadConfigurationError: The secret key is missing
+
+        Returns:
+            Optional[HMACEngine]: None unless `JWT_HMAC_ENGINE` is "native"
+                and `JWT_ALGORITHM` is an HMAC algorithm
+        """
+        if self._engine is None and self.native_hmac:
+            self._engine = HMACEngine(self.algorithm, self.signing_key, self.codec)
+        return self._engine
+
+    def encode_options(
+        self, headers: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Keyword arguments for `create_token` & `TokenPayload.encode`
+
+        Args:
+            headers (Optional[Dict[str, Any]], optional): Additional headers.
+                Defaults to None.
+
+        Raises:
+            BadConfigurationError: The signing key is missing
+
+        Returns:
+            Dict[str, Any]: key, algorithm, headers, codec & engine
+        """
+        if self.signing_kid is None:
+            return {
+                "key": self.signing_key,
+                "algorithm": self.algorithm,
+                "headers": headers,
+                "codec": self.codec,
+                "engine": self.engine,
+            }
+        entry = self.keyring.get(self.signing_kid)
+        if entry is None or entry.signing_key is None:
+            raise BadConfigurationError(
+                f"No signing key '{self.signing_kid}' available in JWKS"
+            )
+        return {
+            "key": entry.signing_key,
+            "algorithm": entry.algorithm,
+            "headers": {**(headers or {}), "kid": entry.kid},
+            "codec": self.codec,
+            "engine": None,
+        }
+
+    @property
+    def key_version(self) -> Optional[int]:
+        """Version of the key ring, None without key ring"""
+        return None if self.keyring is None else self.keyring.version
+
+    def _resolve_verifying_key(self, token: Optional[str]) -> Tuple[Any, List[str]]:
+        """Verifying key & algorithms of a token, by its `kid` header"""
+        if self.keyring is None or token is None:
+            return self.verifying_key, self.algorithms
+        try:
+            kid = get_unverified_header(token).get("kid")
+        except DecodeError as e:
+            raise JWTDecodeError(*e.args)
+        if kid is None:
+            try:
+                return self.verifying_key, self.algorithms
+            except BadConfigurationError:
+                raise JWTDecodeError("Missing 'kid' header")
+        entry = self.keyring.get(kid) if isinstance(kid, str) else None
+        if entry is None:
+            raise JWTDecodeError(f"Unknown key identifier '{kid}'")
+        return entry.verifying_key, entry.algorithms
+
+    def decode_options(
+        self,
+        token: Optional[str] = None,
+        audience: Optional[StrOrSeq] = None,
+        issuer: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for `decode_token` & `RequestToken.decode`
+
+        Args:
+            token (Optional[str], optional): Token to decode, used to select
+                the key by `kid` header. Defaults to None.
+            audience (Optional[StrOrSeq], optional): Audience claim to verify.
+                Defaults to the configured audience.
+            issuer (Optional[str], optional): Issuer claim to verify.
+                Defaults to the configured issuer.
+
+        Raises:
+            JWTDecodeError: The token `kid` header is invalid or unknown
+
+        Returns:
+            Dict[str, Any]: key, algorithms, audience, issuer, leeway,
+                codec & engine
+        """
+        key, algorithms = self._resolve_verifying_key(token)
+        return {
+            "key": key,
+            "algorithms": algorithms,
+            "audience": audience if audience else self.audience,
+            "issuer": issuer if issuer else self.issuer,
+            "leeway": self.leeway,
+            "codec": self.codec,
+            "engine": self.engine if key is self._verifying_key else None,
+        }
@@ -6,7 +6,9 @@ from typing import Optional
 from typing import Sequence
 
 import jwt
+from jwt import api_jws
 
+from .codec import JSONCodec
 from .types import StrOrSeq
 from .types import TokenType
 from .types import AlgorithmType
@@ -14,6 +16,7 @@ from .types import DateTimeExpression
 from .utils import get_now
 from .utils import get_uuid
 from .utils import get_now_ts
+from .engine import HMACEngine
 from .exceptions import JWTDecodeError
 
 RESERVED_CLAIMS = set(
@@ -21,47 +24,46 @@ RESERVED_CLAIMS = set(
 )
 
 
-def create_token(
+def create_claims(
     uid: str,
-    key: str,
     type: TokenType,
     jti: Optional[str] = None,
     expiry: Optional[DateTimeExpression] = None,
     issued: Optional[DateTimeExpression] = None,
     fresh: bool = False,
     csrf: Union[str, bool] = True,
-    algorithm: AlgorithmType = "HS256",
-    headers: Optional[Dict[str, Any]] = None,
     audience: Optional[StrOrSeq] = None,
     issuer: Optional[str] = None,
     additional_data: Optional[Dict[str, Any]] = None,
     not_before: Optional[Union[int, DateTimeExpression]] = None,
     ignore_errors: bool = True,
-) -> str:
-    """Encode a token
+) -> Dict[str, Any]:
+    """Build the claims of a token
 
     Args:
         uid (str): The unique identifier to generate a token for
-        key (str): secret key for token encoding
         type (TokenType): Token type
         jti (Optional[str], optional): JWT unique identifier. Defaults to None.
-        expiry (Optional[DateTimeExpression], optional): Expiration time claim. Defaults to None.
-        issued (Optional[DateTimeExpression], optional): Issued at claim. Defaults to None.
+        expiry (Optional[DateTimeExpression], optional): Expiration time claim.
+            Defaults to None.
+        issued (Optional[DateTimeExpression], optional): Issued at claim.
+            Defaults to None.
         fresh (bool, optional): Token freshness. Defaults to False.
         csrf (Union[str, bool], optional): CSRF Token. Defaults to True.
-        algorithm (AlgorithmType, optional): Algorithm to use to encode token. Defaults to "HS256".
-        headers (Optional[Dict[str, Any]], optional): TODO. Defaults to None.
         audience (Optional[StrOrSeq], optional): Audience claim. Defaults to None.
         issuer (Optional[str], optional): Issuer claim. Defaults to None.
-        additional_data (Optional[Dict[str, Any]], optional): Custom claims. Defaults to None.
-        not_before (Optional[Union[int, DateTimeExpression]], optional): Not before claim. Defaults to None.
-        ignore_errors (bool, optional): Ignore errors from custom claims validation. Defaults to True.
+        additional_data (Optional[Dict[str, Any]], optional): Custom claims.
+            Defaults to None.
+        not_before (Optional[Union[int, DateTimeExpression]], optional): Not before
+            claim. Defaults to None.
+        ignore_errors (bool, optional): Ignore errors from custom claims validation.
+            Defaults to True.
 
     Raises:
         ValueError: Some custom claim tries to override standard JWT claims
 
     Returns:
-        str: encoded token
+        Dict[str, Any]: the token claims
     """
     now = get_now()
 
@@ -112,9 +114,118 @@ def create_token(
     elif isinstance(not_before, (int, float)):
         jwt_claims["nbf"] = not_before
 
-    payload = {**additional_claims, **jwt_claims}
+    return {**additional_claims, **jwt_claims}
+
+
+def create_token(
+    uid: str,
+    key: str,
+    type: TokenType,
+    jti: Optional[str] = None,
+    expiry: Optional[DateTimeExpression] = None,
+    issued: Optional[DateTimeExpression] = None,
+    fresh: bool = False,
+    csrf: Union[str, bool] = True,
+    algorithm: AlgorithmType = "HS256",
+    headers: Optional[Dict[str, Any]] = None,
+    audience: Optional[StrOrSeq] = None,
+    issuer: Optional[str] = None,
+    additional_data: Optional[Dict[str, Any]] = None,
+    not_before: Optional[Union[int, DateTimeExpression]] = None,
+    ignore_errors: bool = True,
+    codec: Optional[JSONCodec] = None,
+    engine: Optional[HMACEngine] = None,
+) -> str:
+    """Encode a token
+
+    Args:
+        uid (str): The unique identifier to generate a token for
+        key (str): secret key for token encoding
+        type (TokenType): Token type
+        jti (Optional[str], optional): JWT unique identifier. Defaults to None.
+        expiry (Optional[DateTimeExpression], optional): Expiration time claim.
+            Defaults to None.
+        issued (Optional[DateTimeExpression], optional): Issued at claim.
+            Defaults to None.
+        fresh (bool, optional): Token freshness. Defaults to False.
+        csrf (Union[str, bool], optional): CSRF Token. Defaults to True.
+        algorithm (AlgorithmType, optional): Algorithm to use to encode token.
+            Defaults to "HS256".
+        headers (Optional[Dict[str, Any]], optional): Additional headers.
+            Defaults to None.
+        audience (Optional[StrOrSeq], optional): Audience claim. Defaults to None.
+        issuer (Optional[str], optional): Issuer claim. Defaults to None.
+        additional_data (Optional[Dict[str, Any]], optional): Custom claims.
+            Defaults to None.
+        not_before (Optional[Union[int, DateTimeExpression]], optional): Not before
+            claim. Defaults to None.
+        ignore_errors (bool, optional): Ignore errors from custom claims validation.
+            Defaults to True.
+        codec (Optional[JSONCodec], optional): Claims serialization. Defaults to None.
+        engine (Optional[HMACEngine], optional): Native HMAC engine. Defaults to None.
+
+    Raises:
+        ValueError: Some custom claim tries to override standard JWT claims
+
+    Returns:
+        str: encoded token
+    """
+    payload = create_claims(
+        uid=uid,
+        type=type,
+        jti=jti,
+        expiry=expiry,
+        issued=issued,
+        fresh=fresh,
+        csrf=csrf,
+        audience=audience,
+        issuer=issuer,
+        additional_data=additional_data,
+        not_before=not_before,
+        ignore_errors=ignore_errors,
+    )
+    return encode_claims(
+        payload,
+        key=key,
+        algorithm=algorithm,
+        headers=headers,
+        codec=codec,
+        engine=engine,
+    )
+
 
-    return jwt.encode(payload=payload, key=key, algorithm=algorithm, headers=headers)
+def encode_claims(
+    claims: Dict[str, Any],
+    key: Any,
+    algorithm: AlgorithmType = "HS256",
+    headers: Optional[Dict[str, Any]] = None,
+    codec: Optional[JSONCodec] = None,
+    engine: Optional[HMACEngine] = None,
+) -> str:
+    """Sign claims built by `create_claims`
+
+    Args:
+        claims (Dict[str, Any]): Token claims
+        key (Any): Signing key
+        algorithm (AlgorithmType, optional): Signing algorithm. Defaults to "HS256".
+        headers (Optional[Dict[str, Any]], optional): Additional headers.
+            Defaults to None.
+        codec (Optional[JSONCodec], optional): Claims serialization.
+            Defaults to None (PyJWT serialization).
+        engine (Optional[HMACEngine], optional): Native HMAC engine signing
+            the claims instead of PyJWT, `key` & `algorithm` are ignored.
+            Defaults to None.
+
+    Returns:
+        str: encoded token
+    """
+    if engine is not None:
+        return engine.encode(claims, headers=headers)
+    if codec is None:
+        return jwt.encode(payload=claims, key=key, algorithm=algorithm, headers=headers)
+    return api_jws.encode(
+        codec.dumps(claims), key=key, algorithm=algorithm, headers=headers
+    )
 
 
 def decode_token(
@@ -124,6 +235,9 @@ def decode_token(
     audience: Optional[StrOrSeq] = None,
     issuer: Optional[str] = None,
     verify: bool = True,
+    leeway: Union[float, datetime.timedelta] = 0,
+    codec: Optional[JSONCodec] = None,
+    engine: Optional[HMACEngine] = None,
 ) -> Dict[str, Any]:
     """Decode a token
 
@@ -134,6 +248,13 @@ def decode_token(
         audience (Optional[StrOrSeq], optional): Audiences to verify. Defaults to None.
         issuer (Optional[str], optional): Issuer to verify. Defaults to None.
         verify (bool, optional): Enable validation. Defaults to True.
+        leeway (Union[float, datetime.timedelta], optional): Time margin
+            for expiration checks. Defaults to 0.
+        codec (Optional[JSONCodec], optional): Claims parsing.
+            Defaults to None (PyJWT parsing).
+        engine (Optional[HMACEngine], optional): Native HMAC engine verifying
+            the token instead of PyJWT, `key` is ignored. Only used when
+            `verify` is enabled. Defaults to None.
 
     Raises:
         JWTDecodeError: The token decoding was not possible.
@@ -145,13 +266,22 @@ def decode_token(
     Returns:
         Dict[str, Any]: The decoded token
     """
+    if engine is not None and verify:
+        return engine.decode(
+            token,
+            algorithms=algorithms,
+            audience=audience,
+            issuer=issuer,
+            leeway=leeway,
+        )
     try:
-        return jwt.decode(
+        return (jwt if codec is None else codec.jwt).decode(
             jwt=token,
             key=key,
             algorithms=algorithms,
             audience=audience,
             issuer=issuer,
+            leeway=leeway,
             options={"verify_signature": verify},
         )
     except Exception as e:
@@ -5,6 +5,7 @@ from typing import TypeVar
 from typing import Callable
 from typing import Optional
 from typing import Sequence
+from typing import Awaitable
 
 try:
     from typing import ParamSpecKwargs
@@ -48,7 +49,14 @@ SameSitePolicy = Literal["None", "Lax", "Strict"]
 TokenType = Literal["access", "refresh"]
 TokenLocation = Literal["headers", "cookies", "json", "query"]
 TokenLocations = Sequence[TokenLocation]
+JSONCodecName = Literal["auto", "json", "orjson", "msgspec"]
+HMACEngineName = Literal["pyjwt", "native"]
+CryptoOffloadMode = Literal["inline", "thread", "process"]
+IDFormat = Literal["uuid", "compact"]
+TokenProfile = Literal["standard", "compact"]
 
 # Callbacks
-TokenCallback = Callable[[str, ParamSpecKwargs], bool]
-ModelCallback = Callable[[str, ParamSpecKwargs], Optional[T]]
+TokenCallback = Callable[[str, ParamSpecKwargs], Union[bool, Awaitable[bool]]]
+ModelCallback = Callable[
+    [str, ParamSpecKwargs], Union[Optional[T], Awaitable[Optional[T]]]
+]
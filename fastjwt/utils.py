@@ -1,7 +1,15 @@
-import uuid
+import os
+import base64
+import weakref
 import datetime
+import threading
+from typing import Callable
 
 from .types import Numeric
+from .types import IDFormat
+
+# Bytes of a 128-bit identifier
+ID_SIZE = 16
 
 
 def get_now() -> datetime.datetime:
@@ -22,10 +30,113 @@ def get_now_ts() -> Numeric:
     return get_now().timestamp()
 
 
+class IDGenerator:
+    """Random 128-bit identifiers served from a buffer of random bytes
+
+    Note:
+        `os.urandom` is called once every `batch` identifiers instead of
+        once per identifier. The buffer is discarded in forked child
+        processes, so that parent & child never serve the same bytes.
+
+    Args:
+        batch (int, optional): Identifiers drawn per `os.urandom` call.
+            Defaults to 256.
+    """
+
+    def __init__(self, batch: int = 256) -> None:
+        """See help(IDGenerator) for more info
+
+        Args:
+            batch (int, optional): Identifiers drawn per `os.urandom` call.
+                Defaults to 256.
+        """
+        self.batch = batch
+        self._lock = threading.Lock()
+        self.reset()
+        _GENERATORS.add(self)
+
+    def reset(self) -> None:
+        """Discard the buffered random bytes"""
+        self._buffer = b""
+        self._offset = 0
+
+    def random_bytes(self) -> bytes:
+        """Return 16 random bytes
+
+        Returns:
+            bytes: Random bytes from the buffer
+        """
+        with self._lock:
+            offset = self._offset
+            if offset + ID_SIZE > len(self._buffer):
+                self._buffer = os.urandom(ID_SIZE * self.batch)
+                offset = 0
+            self._offset = end = offset + ID_SIZE
+            return self._buffer[offset:end]
+
+    def uuid4(self) -> str:
+        """Generate a UUID v4 string
+
+        Returns:
+            str: 36 characters identifier
+        """
+        data = bytearray(self.random_bytes())
+        data[6] = (data[6] & 0x0F) | 0x40
+        data[8] = (data[8] & 0x3F) | 0x80
+        h = data.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def compact(self) -> str:
+        """Generate a base64url encoded 128-bit identifier
+
+        Returns:
+            str: 22 characters identifier
+        """
+        return base64.urlsafe_b64encode(self.random_bytes())[:22].decode()
+
+
+_GENERATORS: "weakref.WeakSet[IDGenerator]" = weakref.WeakSet()
+
+
+def _reset_generators() -> None:
+    """Reset the ID generators in a forked child process"""
+    for generator in _GENERATORS:
+        generator._lock = threading.Lock()
+        generator.reset()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_generators)
+
+_IDS = IDGenerator()
+
+
 def get_uuid() -> str:
     """Generates a Universe Unique Identifier v4
 
     Returns:
         str: unique identifier
     """
-    return str(uuid.uuid4())
+    return _IDS.uuid4()
+
+
+def get_compact_id() -> str:
+    """Generates a base64url encoded 128-bit random identifier
+
+    Returns:
+        str: 22 characters unique identifier
+    """
+    return _IDS.compact()
+
+
+def get_id_factory(format: IDFormat = "uuid") -> Callable[[], str]:
+    """Return the identifier generator of a format
+
+    Args:
+        format (IDFormat, optional): "uuid" (36 characters) or "compact"
+            (22 characters base64url). Defaults to "uuid".
+
+    Returns:
+        Callable[[], str]: Identifier generator
+    """
+    return get_compact_id if format == "compact" else get_uuid
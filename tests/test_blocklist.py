@@ -0,0 +1,443 @@
+import time
+import asyncio
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+from fastapi import Request
+
+from fastjwt.config import FJWTConfig
+from fastjwt.models import VerifiedClaims
+from fastjwt.fastjwt import FastJWT
+from fastjwt.blocklist import BloomFilter
+from fastjwt.blocklist import TokenBlocklist
+from fastjwt.blocklist import RevocationFilter
+from fastjwt.blocklist import RedisTokenBlocklist
+from fastjwt.blocklist import InMemoryTokenBlocklist
+from fastjwt.exceptions import RevokedTokenError
+
+
+class FakeRedis:
+    """Minimal asynchronous Redis protocol implementation"""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+        self.expiries: Dict[str, int] = {}
+        self.mget_calls: List[List[str]] = []
+
+    async def set(self, name: str, value: Any, ex: int = None) -> None:
+        self.data[name] = str(value).encode()
+        if ex is not None:
+            self.expiries[name] = ex
+
+    async def mget(self, keys: List[str]) -> List[Any]:
+        self.mget_calls.append(list(keys))
+        await asyncio.sleep(0)
+        return [self.data.get(key) for key in keys]
+
+    async def scan_iter(self, match: str):
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key.encode()
+
+    async def ttl(self, name: str) -> int:
+        if name not in self.data:
+            return -2
+        return self.expiries.get(name, -1)
+
+
+class FakeTimer:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def fjwt():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    return FastJWT(config=config)
+
+
+def make_request(token: str) -> Request:
+    return Request(
+        scope={
+            "method": "GET",
+            "type": "http",
+            "headers": [[b"authorization", f"Bearer {token}".encode()]],
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_in_memory_blocklist_purges_expired_entries():
+    timer = FakeTimer()
+    blocklist = InMemoryTokenBlocklist(timer=timer)
+    await blocklist.revoke("a", expires_at=timer.now + 10)
+    await blocklist.revoke("b", expires_at=timer.now + 20)
+    await blocklist.revoke("c")
+
+    assert await blocklist.contains("a")
+    assert await blocklist.contains_many(["a", "b", "d"]) == [True, True, False]
+    timer.now += 15
+    assert not await blocklist.contains("a")
+    assert len(blocklist) == 2
+    timer.now += 1000
+    assert await blocklist.contains_many(["a", "b", "c"]) == [False, False, True]
+    assert len(blocklist) == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_blocklist_revoke_again():
+    timer = FakeTimer()
+    blocklist = InMemoryTokenBlocklist(timer=timer)
+    await blocklist.revoke("a", expires_at=timer.now + 10)
+    await blocklist.revoke("a", expires_at=timer.now + 100)
+
+    timer.now += 50
+    assert await blocklist.contains("a")
+
+
+@pytest.mark.asyncio
+async def test_redis_blocklist():
+    client = FakeRedis()
+    blocklist = RedisTokenBlocklist(client)
+    await blocklist.revoke("a")
+    await blocklist.revoke("b", expires_at=FakeTimer()())
+
+    assert "fastjwt:blocklist:a" in client.data
+    assert "fastjwt:blocklist:b" not in client.data
+    assert await blocklist.contains("a")
+    assert not await blocklist.contains("b")
+
+
+@pytest.mark.asyncio
+async def test_redis_blocklist_coalesces_lookups():
+    client = FakeRedis()
+    blocklist = RedisTokenBlocklist(client, prefix="")
+    await blocklist.revoke("a")
+
+    results = await asyncio.gather(
+        *(blocklist.contains(jti) for jti in ["a", "b", "a", "c", "b"])
+    )
+    assert results == [True, False, True, False, False]
+    assert client.mget_calls == [["a", "b", "c"]]
+
+    assert await blocklist.contains("c") is False
+    assert len(client.mget_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_blocklist_lookup_errors_are_propagated():
+    class BrokenRedis(FakeRedis):
+        async def mget(self, keys):
+            raise ConnectionError("Redis unavailable")
+
+    blocklist = RedisTokenBlocklist(BrokenRedis())
+    results = await asyncio.gather(
+        blocklist.contains("a"), blocklist.contains("b"), return_exceptions=True
+    )
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_blocklist_short_batch_fails_lookups():
+    class ShortBlocklist(TokenBlocklist):
+        async def revoke(self, jti, expires_at=None):
+            pass
+
+        async def contains_many(self, jtis):
+            return [False]
+
+    blocklist = ShortBlocklist()
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            blocklist.contains("a"), blocklist.contains("b"), return_exceptions=True
+        ),
+        timeout=1,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_token_blocklist_is_abstract():
+    class PartialBlocklist(TokenBlocklist):
+        async def revoke(self, jti, expires_at=None):
+            pass
+
+    with pytest.raises(TypeError):
+        TokenBlocklist()
+    with pytest.raises(TypeError):
+        PartialBlocklist()
+
+
+@pytest.mark.asyncio
+async def test_async_blocklist_callback(fjwt: FastJWT):
+    token = fjwt.create_access_token(uid="test")
+
+    @fjwt.set_callback_token_blocklist
+    async def is_revoked(token: str) -> bool:
+        await asyncio.sleep(0)
+        return token == revoked
+
+    revoked = None
+    payload = await fjwt._auth_required(request=make_request(token))
+    assert payload.sub == "test"
+
+    revoked = token
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    assert await fjwt.is_token_in_blocklist_async(token)
+    with pytest.raises(TypeError):
+        fjwt.is_token_in_blocklist(token)
+
+
+@pytest.mark.asyncio
+async def test_blocklist_backend(fjwt: FastJWT):
+    with pytest.raises(AttributeError):
+        await fjwt.revoke_token(fjwt._decode_token(fjwt.create_access_token("test")))
+
+    fjwt.set_token_blocklist_backend(InMemoryTokenBlocklist())
+    token = fjwt.create_access_token(uid="test")
+    other_token = fjwt.create_access_token(uid="test")
+    payload = await fjwt._auth_required(request=make_request(token))
+
+    await fjwt.revoke_token(payload)
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    assert (await fjwt._auth_required(request=make_request(other_token))).sub == "test"
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_without_jti(fjwt: FastJWT):
+    blocklist = InMemoryTokenBlocklist()
+    fjwt.set_token_blocklist_backend(blocklist)
+    with pytest.raises(ValueError):
+        await fjwt.revoke_token(VerifiedClaims({"sub": "test", "exp": 1}))
+    assert len(blocklist) == 0
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"revoked-{i}")
+
+    assert all(f"revoked-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0, error_rate=0.01)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1)
+
+
+def test_revocation_filter_generations():
+    timer = FakeTimer(now=0.0)
+    revocation_filter = RevocationFilter(capacity=100, period=100, timer=timer)
+    revocation_filter.add("a", expires_at=50)
+    revocation_filter.add("b", expires_at=150)
+    revocation_filter.add("c", expires_at=10000)
+    revocation_filter.add("d")
+
+    assert all(revocation_filter.might_contain(jti) for jti in "abcd")
+    assert not revocation_filter.might_contain("e")
+    assert revocation_filter.info().generations == 2
+
+    # Generations are dropped once their tokens are expired
+    timer.now = 120
+    assert not revocation_filter.might_contain("a")
+    assert revocation_filter.might_contain("b")
+    timer.now = 250
+    assert not revocation_filter.might_contain("b")
+    assert revocation_filter.might_contain("c")
+    assert revocation_filter.might_contain("d")
+    assert revocation_filter.info().generations == 0
+
+    # Identifiers without claim can not be filtered
+    assert revocation_filter.might_contain(None)
+    info = revocation_filter.info()
+    assert info.checks == 11
+    assert info.saved == 3
+
+
+def test_revocation_filter_long_lived_false_positives():
+    timer = FakeTimer(now=0.0)
+    revocation_filter = RevocationFilter(
+        capacity=100, error_rate=0.01, period=100, timer=timer
+    )
+    # Tokens expiring beyond the generations keep being revoked
+    for step in range(50):
+        timer.now = step * 100
+        for index in range(100):
+            revocation_filter.add(f"{step}-{index}", expires_at=timer.now + 1000)
+
+    assert revocation_filter.might_contain("49-0")
+    assert not revocation_filter.might_contain("0-0")
+    false_positives = sum(
+        revocation_filter.might_contain(f"fresh-{index}") for index in range(2000)
+    )
+    # Only the filters of unexpired identifiers are kept
+    assert false_positives / 2000 < 0.15
+
+
+def test_revocation_filter_reset():
+    timer = FakeTimer(now=0.0)
+    revocation_filter = RevocationFilter(capacity=10, period=100, timer=timer)
+    for index in range(25):
+        revocation_filter.add(f"old-{index}")
+    assert revocation_filter.might_contain("old-0")
+
+    revocation_filter.reset([("new", None), ("expiring", 50), ("expired", -1)])
+    assert not revocation_filter.might_contain("old-0")
+    assert revocation_filter.might_contain("new")
+    assert revocation_filter.might_contain("expiring")
+    assert not revocation_filter.might_contain("expired")
+
+
+def test_revocation_filter_from_config():
+    config = FJWTConfig()
+    assert RevocationFilter.from_config(config) is None
+    config.JWT_BLOCKLIST_FILTER_CAPACITY = 10
+    revocation_filter = RevocationFilter.from_config(config)
+    assert revocation_filter.period == 900
+    assert revocation_filter.error_rate == 0.001
+
+
+@pytest.mark.asyncio
+async def test_blocklist_filter_skips_backend(fjwt: FastJWT):
+    class CountingBlocklist(InMemoryTokenBlocklist):
+        def __init__(self) -> None:
+            super().__init__()
+            self.lookups = 0
+
+        async def contains(self, jti: str) -> bool:
+            self.lookups += 1
+            return await super().contains(jti)
+
+    blocklist = CountingBlocklist()
+    fjwt.config.JWT_BLOCKLIST_FILTER_CAPACITY = 100
+    fjwt.set_token_blocklist_backend(blocklist)
+    token = fjwt.create_access_token(uid="test")
+    other_token = fjwt.create_access_token(uid="test")
+
+    await fjwt.revoke_token(fjwt._decode_token(token))
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    assert blocklist.lookups == 1
+    for _ in range(5):
+        await fjwt._auth_required(request=make_request(other_token))
+    assert blocklist.lookups == 1
+    assert fjwt.token_blocklist_filter.info().saved == 5
+
+
+@pytest.mark.asyncio
+async def test_blocklist_filter_with_callback(fjwt: FastJWT):
+    revoked = set()
+
+    @fjwt.set_callback_token_blocklist
+    def is_revoked(token: str) -> bool:
+        return token in revoked
+
+    fjwt.set_token_blocklist_filter(RevocationFilter(capacity=100))
+    token = fjwt.create_access_token(uid="test")
+    assert (await fjwt._auth_required(request=make_request(token))).sub == "test"
+
+    # Tokens revoked in the callback store are unknown to the filter
+    revoked.add(token)
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    # The filter is not used without a backend
+    assert fjwt.token_blocklist_filter.info().checks == 0
+    with pytest.raises(AttributeError):
+        await fjwt.revoke_token(fjwt._decode_token(token))
+
+
+@pytest.mark.asyncio
+async def test_blocklist_filter_synced_from_backend(fjwt: FastJWT):
+    redis = FakeRedis()
+    backend = RedisTokenBlocklist(redis)
+    token = fjwt.create_access_token(uid="test")
+    other_token = fjwt.create_access_token(uid="test")
+    # Revoked before the filter is built, e.g. by another worker
+    await backend.revoke(fjwt._decode_token(token).jti)
+
+    fjwt.config.JWT_BLOCKLIST_FILTER_CAPACITY = 100
+    fjwt.set_token_blocklist_backend(backend)
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    await fjwt._auth_required(request=make_request(other_token))
+    assert fjwt.token_blocklist_filter.info().saved == 1
+
+    # Revoked directly in the backend, known after the next sync
+    revocation_filter = fjwt.token_blocklist_filter
+    revocation_filter.timer = FakeTimer(now=revocation_filter.synced_at)
+    await backend.revoke(fjwt._decode_token(other_token).jti)
+    await fjwt._auth_required(request=make_request(other_token))
+    revocation_filter.timer.now += 60
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(other_token))
+
+
+@pytest.mark.asyncio
+async def test_blocklist_filter_requires_listing_backend(fjwt: FastJWT):
+    class Blocklist(TokenBlocklist):
+        def __init__(self) -> None:
+            super().__init__()
+            self.jtis = set()
+
+        async def revoke(self, jti, expires_at=None):
+            self.jtis.add(jti)
+
+        async def contains_many(self, jtis):
+            return [jti in self.jtis for jti in jtis]
+
+    backend = Blocklist()
+    fjwt.config.JWT_BLOCKLIST_FILTER_CAPACITY = 100
+    fjwt.set_token_blocklist_backend(backend)
+    token = fjwt.create_access_token(uid="test")
+    backend.jtis.add(fjwt._decode_token(token).jti)
+    with pytest.raises(RevokedTokenError):
+        await fjwt._auth_required(request=make_request(token))
+    assert fjwt.token_blocklist_filter.info().checks == 0
+
+
+@pytest.mark.asyncio
+async def test_revocation_filter_sync_keeps_pending_revocations():
+    class SlowBlocklist(InMemoryTokenBlocklist):
+        async def revoked(self):
+            revoked = await super().revoked()
+            await asyncio.sleep(0.01)
+            return revoked
+
+    backend = SlowBlocklist()
+    await backend.revoke("a")
+    revocation_filter = RevocationFilter(capacity=10)
+    sync = asyncio.ensure_future(revocation_filter.sync(backend))
+    await asyncio.sleep(0)
+    assert revocation_filter.syncing
+    revocation_filter.add("b")
+    await sync
+    assert not revocation_filter.syncing
+    assert revocation_filter.might_contain("a")
+    assert revocation_filter.might_contain("b")
+
+
+@pytest.mark.asyncio
+async def test_blocklist_revoked():
+    timer = FakeTimer(now=1000.0)
+    blocklist = InMemoryTokenBlocklist(timer=timer)
+    await blocklist.revoke("a", expires_at=1100)
+    await blocklist.revoke("b")
+    await blocklist.revoke("c", expires_at=1010)
+    timer.now = 1050
+    assert sorted(await blocklist.revoked(), key=str) == [("a", 1100), ("b", None)]
+
+    redis = FakeRedis()
+    blocklist = RedisTokenBlocklist(redis)
+    await blocklist.revoke("a", expires_at=time.time() + 100)
+    await blocklist.revoke("b")
+    revoked = dict(await blocklist.revoked())
+    assert revoked["b"] is None
+    assert revoked["a"] == pytest.approx(time.time() + 101, abs=2)
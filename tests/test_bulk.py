@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fastjwt.bulk import TokenSpec
+from fastjwt.bulk import BulkTokens
+from fastjwt.config import FJWTConfig
+from fastjwt.fastjwt import FastJWT
+
+
+@pytest.fixture(scope="module")
+def rsa_keys():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+@pytest.fixture(scope="function")
+def rsa_fjwt(rsa_keys):
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PRIVATE_KEY, config.JWT_PUBLIC_KEY = rsa_keys
+    config.JWT_TOKEN_LOCATION = ["headers"]
+    return FastJWT(config=config)
+
+
+def test_create_tokens_bulk_symmetric():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_TOKEN_LOCATION = ["headers", "cookies"]
+    fjwt = FastJWT(config=config)
+    specs = [
+        TokenSpec(uid="user-0", fresh=True, data={"role": "admin"}),
+        {"uid": "user-1", "type": "refresh"},
+        TokenSpec(uid="user-2", headers={"x-custom": "header"}),
+    ]
+    tokens = fjwt.create_tokens_bulk(specs, executor=ThreadPoolExecutor())
+
+    assert isinstance(tokens, BulkTokens)
+    payloads = [fjwt._decode_token(token) for token in tokens]
+    assert [payload.sub for payload in payloads] == ["user-0", "user-1", "user-2"]
+    assert [payload.type for payload in payloads] == ["access", "refresh", "access"]
+    assert payloads[0].fresh
+    assert payloads[0].role == "admin"
+    assert all(payload.csrf for payload in payloads)
+    assert all(payload.exp > payload.iat for payload in payloads)
+    assert tokens.stats.count == 3
+
+
+def test_create_tokens_bulk_lazy():
+    fjwt = FastJWT(config=FJWTConfig(JWT_SECRET_KEY="SECRET"))
+    consumed = []
+
+    def specs():
+        for i in range(3):
+            consumed.append(i)
+            yield TokenSpec(uid=f"user-{i}")
+
+    tokens = fjwt.create_tokens_bulk(specs())
+    assert consumed == []
+    assert tokens.stats.count == 0
+    assert fjwt._decode_token(next(tokens)).sub == "user-0"
+    assert consumed == [0]
+    assert len(list(tokens)) == 2
+    assert tokens.stats.count == 3
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 64])
+def test_create_tokens_bulk_thread_pool(rsa_fjwt: FastJWT, chunksize: int):
+    specs = [TokenSpec(uid=f"user-{i}") for i in range(10)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tokens = list(
+            rsa_fjwt.create_tokens_bulk(specs, executor=executor, chunksize=chunksize)
+        )
+    assert [rsa_fjwt._decode_token(token).sub for token in tokens] == [
+        f"user-{i}" for i in range(10)
+    ]
+
+
+def test_create_tokens_bulk_process_pool(rsa_fjwt: FastJWT):
+    specs = [TokenSpec(uid=f"user-{i}") for i in range(4)]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        tokens = rsa_fjwt.create_tokens_bulk(specs, executor=executor, chunksize=2)
+        subjects = [rsa_fjwt._decode_token(token).sub for token in tokens]
+    assert subjects == [f"user-{i}" for i in range(4)]
+    stats = tokens.stats
+    assert stats.count == 4
+    assert stats.elapsed > 0
+    assert stats.tokens_per_second > 0
+
+
+def test_bulk_tokens_bad_chunksize():
+    with pytest.raises(ValueError):
+        BulkTokens([], algorithm="HS256", key=b"SECRET", chunksize=0)
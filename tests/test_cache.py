@@ -0,0 +1,241 @@
+import asyncio
+import datetime
+
+import pytest
+
+from fastjwt.cache import TTLCache
+from fastjwt.cache import RefreshRegistry
+from fastjwt.cache import VerifiedTokenCache
+from fastjwt.config import FJWTConfig
+from fastjwt.models import IssuedToken
+from fastjwt.models import RequestToken
+from fastjwt.models import TokenPayload
+from fastjwt.models import VerifiedClaims
+from fastjwt.fastjwt import FastJWT
+from fastjwt.exceptions import JWTDecodeError
+from fastjwt.exceptions import RefreshTokenRequiredError
+
+
+class FakeTimer:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def fjwt():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_DECODE_CACHE_SIZE = 8
+    return FastJWT(config=config)
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expiry():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=4, ttl=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, expires_at=timer.now + 5)
+    cache.set("c", 3, expires_at=timer.now + 50)
+
+    timer.now += 6
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    timer.now += 5
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+def test_ttl_cache_counters():
+    cache = TTLCache(maxsize=4)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    info = cache.info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.maxsize == 4
+    assert info.currsize == 1
+
+    cache.clear()
+    assert cache.info() == (0, 0, 4, 0)
+
+
+def test_ttl_cache_bad_maxsize():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
+
+
+def test_verified_token_cache_expires_with_leeway():
+    timer = FakeTimer()
+    cache = VerifiedTokenCache(maxsize=4, leeway=5, timer=timer)
+    payload = TokenPayload(sub="test", exp=timer.now + 10)
+    cache.set_payload("TOKEN", payload)
+
+    timer.now += 14
+    cached = cache.get_payload("TOKEN")
+    assert cached == payload
+    assert cached is not payload
+    timer.now += 1
+    assert cache.get_payload("TOKEN") is None
+
+
+def test_verified_token_cache_from_config():
+    config = FJWTConfig()
+    assert VerifiedTokenCache.from_config(config) is None
+
+    config.JWT_DECODE_CACHE_SIZE = 16
+    config.JWT_DECODE_CACHE_TTL = datetime.timedelta(seconds=30)
+    config.JWT_DECODE_LEEWAY = 2
+    cache = VerifiedTokenCache.from_config(config)
+    assert cache.maxsize == 16
+    assert cache.ttl == 30
+    assert cache.leeway == 2
+
+
+def test_fastjwt_token_cache_disabled_by_default():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    assert FastJWT(config=config).token_cache is None
+
+
+def test_fastjwt_token_cache_reset_on_config_update(fjwt: FastJWT):
+    cache = fjwt.token_cache
+    assert cache is fjwt.token_cache
+
+    fjwt.config.JWT_SECRET_KEY = "OTHER_SECRET"
+    assert fjwt.token_cache is not cache
+
+
+def test_verify_token_uses_cache(fjwt: FastJWT, monkeypatch: pytest.MonkeyPatch):
+    token = fjwt.create_access_token(uid="test", fresh=True)
+    request_token = RequestToken(token=token, location="headers")
+
+    payload = fjwt.verify_token(request_token, verify_csrf=False)
+    assert fjwt.token_cache.info().misses == 1
+
+    def decode(*args, **kwargs):
+        raise AssertionError("Cached token should not be decoded")
+
+    monkeypatch.setattr(RequestToken, "decode", decode)
+    cached = fjwt.verify_token(request_token, verify_csrf=False, verify_fresh=True)
+    assert cached.sub == payload.sub
+    assert cached.jti == payload.jti
+    assert fjwt.token_cache.info().hits == 1
+
+    # Request related checks are still enforced on cached tokens
+    refresh_request_token = RequestToken(
+        token=token, location="headers", type="refresh"
+    )
+    with pytest.raises(RefreshTokenRequiredError):
+        fjwt.verify_token(refresh_request_token, verify_csrf=False)
+
+
+def test_verify_token_cache_key_change(fjwt: FastJWT):
+    request_token = RequestToken(
+        token=fjwt.create_access_token(uid="test"), location="headers"
+    )
+    fjwt.verify_token(request_token, verify_csrf=False)
+
+    # Tokens verified with a retired key are not served from the cache
+    fjwt.config.JWT_SECRET_KEY = "OTHER_SECRET"
+    with pytest.raises(JWTDecodeError):
+        fjwt.verify_token(request_token, verify_csrf=False)
+    fjwt.load_config(FJWTConfig(JWT_SECRET_KEY="NEW_SECRET", JWT_DECODE_CACHE_SIZE=8))
+    with pytest.raises(JWTDecodeError):
+        fjwt.verify_token(request_token, verify_csrf=False)
+
+
+def test_verified_token_cache_key_version():
+    cache = VerifiedTokenCache(maxsize=4)
+    cache.set_payload("token", VerifiedClaims({"sub": "test"}))
+    cache.set_key_version(None)
+    assert cache.get_payload("token") is not None
+    cache.set_key_version(1)
+    assert cache.get_payload("token") is None
+    assert cache.key_version == 1
+
+
+def test_verify_token_does_not_cache_invalid_token(fjwt: FastJWT):
+    request_token = RequestToken(token="INVALID", location="headers")
+    with pytest.raises(JWTDecodeError):
+        fjwt.verify_token(request_token, verify_csrf=False)
+    assert len(fjwt.token_cache) == 0
+
+
+def test_refresh_registry_from_config():
+    config = FJWTConfig()
+    registry = RefreshRegistry.from_config(config)
+    assert registry.maxsize == 1024
+    assert registry.ttl == 10
+    config.JWT_IMPLICIT_REFRESH_REGISTRY_SIZE = 0
+    assert RefreshRegistry.from_config(config) is None
+    config.JWT_IMPLICIT_REFRESH_REGISTRY_SIZE = 8
+    config.JWT_IMPLICIT_REFRESH_GRACE = datetime.timedelta(0)
+    assert RefreshRegistry.from_config(config) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_registry_single_flight():
+    timer = FakeTimer()
+    registry = RefreshRegistry(maxsize=2, ttl=5, timer=timer)
+    issued = []
+
+    async def issue() -> IssuedToken:
+        await asyncio.sleep(0.01)
+        token = IssuedToken(f"token-{len(issued)}", "jti", None, None, "access")
+        issued.append(token)
+        return token
+
+    payload = VerifiedClaims({"jti": "old", "exp": timer.now + 60})
+    tokens = await asyncio.gather(
+        *(registry.get_or_issue(payload, issue) for _ in range(20))
+    )
+    assert len(issued) == 1
+    assert set(tokens) == {issued[0]}
+
+    # Reused during the grace window, then issued again
+    timer.now += 4
+    assert await registry.get_or_issue(payload, issue) is issued[0]
+    timer.now += 2
+    assert await registry.get_or_issue(payload, issue) is issued[1]
+
+    # Tokens without jti are never shared
+    anonymous = VerifiedClaims({"exp": timer.now + 60})
+    await registry.get_or_issue(anonymous, issue)
+    await registry.get_or_issue(anonymous, issue)
+    assert len(issued) == 4
+
+
+@pytest.mark.asyncio
+async def test_refresh_registry_failure():
+    registry = RefreshRegistry(maxsize=2, ttl=5)
+    payload = VerifiedClaims({"jti": "old"})
+
+    async def fail() -> IssuedToken:
+        await asyncio.sleep(0.01)
+        raise JWTDecodeError("boom")
+
+    results = await asyncio.gather(
+        registry.get_or_issue(payload, fail),
+        registry.get_or_issue(payload, fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, JWTDecodeError) for result in results)
+    assert len(registry) == 0
@@ -1,6 +1,9 @@
 import pytest
+from fastapi import Request
 
+from fastjwt.config import FJWTConfig
 from fastjwt.fastjwt import FastJWT
+from fastjwt.exceptions import FreshTokenRequiredError
 
 
 @pytest.fixture(scope="function")
@@ -61,3 +64,94 @@ def test_get_current_subject(fjwt: FastJWT):
 
     assert fjwt._get_current_subject("a") == {"username": "a"}
     assert fjwt._get_current_subject("Tchoum") is None
+
+
+def make_request(token: str) -> Request:
+    return Request(
+        scope={
+            "method": "GET",
+            "type": "http",
+            "headers": [[b"authorization", f"Bearer {token}".encode()]],
+        }
+    )
+
+
+@pytest.fixture(scope="function")
+def secure_fjwt():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    return FastJWT(config=config)
+
+
+@pytest.mark.asyncio
+async def test_get_current_subject_async(secure_fjwt: FastJWT):
+    @secure_fjwt.set_subject_getter
+    async def get_user(uid: str):
+        return {"username": uid}
+
+    assert await secure_fjwt._get_current_subject_async("a") == {"username": "a"}
+    token = secure_fjwt.create_access_token(uid="a")
+    subject = await secure_fjwt.get_current_subject(make_request(token))
+    assert subject == {"username": "a"}
+
+
+@pytest.mark.asyncio
+async def test_get_current_subject_once_per_request(secure_fjwt: FastJWT):
+    calls = []
+    decodes = []
+
+    @secure_fjwt.set_subject_getter
+    def get_user(uid: str):
+        calls.append(uid)
+        return {"username": uid}
+
+    @secure_fjwt.set_callback_token_blocklist
+    def is_revoked(token: str) -> bool:
+        decodes.append(token)
+        return False
+
+    token = secure_fjwt.create_access_token(uid="a")
+    request = make_request(token)
+    payload = await secure_fjwt.access_token_required(request)
+    subject = await secure_fjwt.get_current_subject(request)
+    assert subject is await secure_fjwt.get_current_subject(request)
+    assert payload.sub == "a"
+    assert calls == ["a"]
+    assert decodes == [token]
+
+    # Request related checks still apply to the verified token
+    with pytest.raises(FreshTokenRequiredError):
+        await secure_fjwt.fresh_token_required(request)
+
+    await secure_fjwt.get_current_subject(make_request(token))
+    assert calls == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_subject_cache(secure_fjwt: FastJWT):
+    calls = []
+
+    @secure_fjwt.set_subject_getter
+    async def get_user(uid: str):
+        calls.append(uid)
+        return {"username": uid} if uid != "ghost" else None
+
+    assert secure_fjwt.subject_cache is None
+    secure_fjwt.invalidate_subject("a")
+    secure_fjwt.config.JWT_SUBJECT_CACHE_SIZE = 10
+    token = secure_fjwt.create_access_token(uid="a")
+    for _ in range(3):
+        await secure_fjwt.get_current_subject(make_request(token))
+    assert calls == ["a"]
+
+    secure_fjwt.invalidate_subject("a")
+    await secure_fjwt.get_current_subject(make_request(token))
+    assert calls == ["a", "a"]
+    secure_fjwt.invalidate_subject()
+    assert len(secure_fjwt.subject_cache) == 0
+
+    # Missing subjects are not cached
+    token = secure_fjwt.create_access_token(uid="ghost")
+    await secure_fjwt.get_current_subject(make_request(token))
+    await secure_fjwt.get_current_subject(make_request(token))
+    assert calls == ["a", "a", "ghost", "ghost"]
@@ -0,0 +1,131 @@
+import pickle
+import datetime
+
+import jwt
+import pytest
+
+from fastjwt.codec import CODECS
+from fastjwt.codec import JSONCodec
+from fastjwt.codec import get_codec
+from fastjwt.token import decode_token
+from fastjwt.token import create_claims
+from fastjwt.token import encode_claims
+from fastjwt.config import FJWTConfig
+from fastjwt.fastjwt import FastJWT
+from fastjwt.exceptions import JWTDecodeError
+from fastjwt.exceptions import BadConfigurationError
+
+KEY = "SECRET" * 6
+
+INSTALLED_CODECS = [name for name, (_, module) in CODECS.items() if module is not None]
+
+
+@pytest.fixture(scope="module")
+def claims():
+    return create_claims(
+        uid="test",
+        type="access",
+        expiry=4_000_000_000,
+        issued=1_600_000_000,
+        csrf="CSRF",
+        audience=["a", "b"],
+        additional_data={
+            "perms": [f"perm:{i}" for i in range(50)],
+            "profile": {"age": 22, "ratio": 0.5, "admin": False, "team": None},
+        },
+    )
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+def test_codec_tokens_are_byte_compatible(name: str, claims: dict):
+    codec = get_codec(name)
+    token = encode_claims(claims, key=KEY, headers={"kid": "1"}, codec=codec)
+    assert token == jwt.encode(claims, KEY, algorithm="HS256", headers={"kid": "1"})
+
+    assert decode_token(token, key=KEY, audience="a", codec=codec) == claims
+    assert decode_token(token, key=KEY, audience="a") == claims
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "Zoë Ørsted", "city": "東京"},
+        {"big": 2**70, "small": -(2**64)},
+        {"nested": [{"emoji": "\U0001f511"}, 2**65]},
+    ],
+)
+def test_codec_fallback_is_byte_compatible(name: str, data: dict):
+    codec = get_codec(name)
+    claims = {"sub": "test", **data}
+    token = encode_claims(claims, key=KEY, codec=codec)
+    assert token == jwt.encode(claims, KEY, algorithm="HS256")
+    assert decode_token(token, key=KEY, codec=codec) == claims
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+def test_codec_rejects_datetime_claims(name: str):
+    claims = {"sub": "test", "at": datetime.datetime(2024, 1, 1)}
+    with pytest.raises(TypeError):
+        jwt.encode(claims, KEY, algorithm="HS256")
+    with pytest.raises(TypeError):
+        encode_claims(claims, key=KEY, codec=get_codec(name))
+
+
+def test_default_codec():
+    assert FJWTConfig().JWT_JSON_CODEC == "json"
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+def test_codec_invalid_payload(name: str):
+    codec = get_codec(name)
+    for payload in (b"not json", b"[1, 2]"):
+        token = jwt.api_jws.encode(payload, key=KEY, algorithm="HS256")
+        with pytest.raises(JWTDecodeError):
+            decode_token(token, key=KEY, codec=codec)
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+def test_codec_validates_claims(name: str):
+    codec = get_codec(name)
+    expired = jwt.encode({"sub": "test", "exp": 1}, KEY, algorithm="HS256")
+    with pytest.raises(JWTDecodeError, match="Signature has expired"):
+        decode_token(expired, key=KEY, codec=codec)
+    claims = decode_token(expired, key=KEY, codec=codec, verify=False)
+    assert claims == {"sub": "test", "exp": 1}
+
+    token = jwt.encode({"sub": "test", "aud": "api"}, KEY, algorithm="HS256")
+    assert decode_token(token, key=KEY, codec=codec, audience="api")["aud"] == "api"
+    with pytest.raises(JWTDecodeError, match="Audience doesn't match"):
+        decode_token(token, key=KEY, codec=codec, audience="other")
+    with pytest.raises(JWTDecodeError):
+        decode_token(token, key=KEY, codec=codec, issuer="fastjwt")
+    with pytest.raises(JWTDecodeError):
+        decode_token(token, key="wrong", codec=codec, audience="api")
+
+
+def test_get_codec():
+    assert get_codec() is get_codec("auto")
+    assert get_codec("auto").name == INSTALLED_CODECS[0]
+    assert isinstance(get_codec("json"), JSONCodec)
+    assert pickle.loads(pickle.dumps(get_codec("json"))) is get_codec("json")
+    with pytest.raises(BadConfigurationError):
+        get_codec("unknown")
+
+
+def test_codec_not_installed(monkeypatch):
+    monkeypatch.setitem(CODECS, "missing", (JSONCodec, None))
+    with pytest.raises(BadConfigurationError):
+        get_codec("missing")
+
+
+@pytest.mark.parametrize("name", INSTALLED_CODECS)
+def test_fastjwt_codec(name: str):
+    config = FJWTConfig(JWT_SECRET_KEY=KEY, JWT_JSON_CODEC=name)
+    fjwt = FastJWT(config=config)
+    assert fjwt._signer.codec is get_codec(name)
+
+    bundle = fjwt.create_token_pair(uid="test", data={"foo": "bar"})
+    payload = fjwt._decode_token(bundle.access_token)
+    assert payload.sub == "test"
+    assert payload.foo == "bar"
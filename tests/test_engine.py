@@ -0,0 +1,180 @@
+import json
+import time
+import pickle
+
+import jwt
+import pytest
+
+from fastjwt.codec import get_codec
+from fastjwt.token import decode_token
+from fastjwt.config import FJWTConfig
+from fastjwt.engine import HMACEngine
+from fastjwt.engine import base64url_decode
+from fastjwt.engine import base64url_encode
+from fastjwt.signer import TokenSigner
+from fastjwt.fastjwt import FastJWT
+from fastjwt.exceptions import JWTDecodeError
+from fastjwt.exceptions import BadConfigurationError
+
+KEY = "SECRET" * 11
+
+
+@pytest.fixture(scope="function")
+def engine():
+    return HMACEngine("HS256", KEY, get_codec("json"))
+
+
+def test_base64url():
+    for data in (b"", b"a", b"ab", b"abc", bytes(range(256))):
+        segment = base64url_encode(data)
+        assert segment == jwt.utils.base64url_encode(data)
+        assert base64url_decode(segment) == data
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+@pytest.mark.parametrize("headers", [None, {}, {"kid": "1", "x-custom": [1, 2]}])
+def test_engine_encode_matches_pyjwt(algorithm: str, headers: dict):
+    engine = HMACEngine(algorithm, KEY, get_codec("json"))
+    claims = {"sub": "test", "exp": int(time.time()) + 60, "data": {"é": 1}}
+    token = engine.encode(claims, headers=headers)
+    assert token == jwt.encode(claims, KEY, algorithm=algorithm, headers=headers)
+    assert engine.decode(token) == claims
+
+
+def test_engine_encode_fallback_headers(engine: HMACEngine):
+    claims = {"sub": "test"}
+    for headers in ({"typ": None}, {"alg": "HS256"}, {"kid": "1", "typ": "at+jwt"}):
+        token = engine.encode(claims, headers=headers)
+        assert token == jwt.encode(claims, KEY, algorithm="HS256", headers=headers)
+    with pytest.raises(jwt.InvalidTokenError):
+        engine.encode(claims, headers={"kid": 1})
+
+
+def test_engine_decode_pyjwt_token(engine: HMACEngine):
+    claims = {"sub": "test", "aud": ["a", "b"], "iss": "issuer", "jti": "jti"}
+    token = jwt.encode(claims, KEY, algorithm="HS256", headers={"kid": "1"})
+    assert engine.decode(token, audience="b", issuer="issuer") == claims
+    assert engine.decode(token, audience=["c", "a"], issuer=["x", "issuer"]) == claims
+
+
+NOW = int(time.time())
+
+
+@pytest.mark.parametrize(
+    "claims,options",
+    [
+        ({"exp": NOW - 10}, {}),
+        ({"exp": NOW - 10}, {"leeway": 20}),
+        ({"exp": "soon"}, {}),
+        ({"nbf": NOW + 60}, {}),
+        ({"nbf": NOW + 60}, {"leeway": 120}),
+        ({"nbf": None}, {}),
+        ({"iat": NOW + 60}, {}),
+        ({"iat": "now"}, {}),
+        ({"aud": "a"}, {}),
+        ({"aud": "a"}, {"audience": "b"}),
+        ({"aud": 1}, {"audience": "b"}),
+        ({"aud": ["a", 1]}, {"audience": "a"}),
+        ({}, {"audience": "a"}),
+        ({}, {"issuer": "iss"}),
+        ({"iss": 1}, {"issuer": "iss"}),
+        ({"iss": "other"}, {"issuer": "iss"}),
+        ({"sub": 1}, {}),
+        ({"jti": 1}, {}),
+        ({"sub": "ok", "jti": "ok", "aud": "a", "iss": "iss"}, {"issuer": "iss"}),
+    ],
+)
+def test_engine_claims_match_pyjwt(engine: HMACEngine, claims: dict, options: dict):
+    token = jwt.api_jws.encode(json.dumps(claims).encode(), KEY, algorithm="HS256")
+    try:
+        expected = decode_token(token, key=KEY, **options)
+    except JWTDecodeError as e:
+        with pytest.raises(JWTDecodeError) as exc_info:
+            decode_token(token, key=KEY, engine=engine, **options)
+        assert exc_info.value.args == e.args
+    else:
+        assert decode_token(token, key=KEY, engine=engine, **options) == expected
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a token",
+        "a.b",
+        "a.b.c.d",
+        jwt.encode({"sub": "test"}, "OTHER" * 10, algorithm="HS256"),
+        jwt.encode({"sub": "test"}, KEY, algorithm="HS512"),
+        jwt.encode({"sub": "test"}, None, algorithm="none"),
+        jwt.api_jws.encode(b"[1, 2]", KEY, algorithm="HS256"),
+        jwt.api_jws.encode(b"not json", KEY, algorithm="HS256"),
+        jwt.api_jws.encode(b"{}", KEY, algorithm="HS256", headers={"crit": ["exp"]}),
+        jwt.api_jws.encode(b"{}", KEY, algorithm="HS256", is_payload_detached=True),
+    ],
+)
+def test_engine_invalid_tokens_match_pyjwt(engine: HMACEngine, token: str):
+    with pytest.raises(JWTDecodeError) as expected:
+        decode_token(token, key=KEY)
+    with pytest.raises(JWTDecodeError) as exc_info:
+        engine.decode(token)
+    assert exc_info.value.args == expected.value.args
+
+
+def test_engine_algorithms(engine: HMACEngine):
+    token = engine.encode({"sub": "test"})
+    with pytest.raises(JWTDecodeError):
+        engine.decode(token, algorithms=["HS512"])
+    other = HMACEngine("HS512", KEY, get_codec("json"))
+    token = other.encode({"sub": "test"})
+    assert engine.decode(token, algorithms=["HS256", "HS512"]) == {"sub": "test"}
+
+
+def test_engine_bad_algorithm():
+    with pytest.raises(BadConfigurationError):
+        HMACEngine("RS256", KEY, get_codec("json"))
+
+
+def test_engine_pickle(engine: HMACEngine):
+    clone = pickle.loads(pickle.dumps(engine))
+    assert clone.encode({"sub": "test"}) == engine.encode({"sub": "test"})
+
+
+def test_signer_engine():
+    config = FJWTConfig(JWT_SECRET_KEY=KEY)
+    assert TokenSigner(config).engine is None
+    config.JWT_HMAC_ENGINE = "native"
+    signer = TokenSigner(config)
+    assert isinstance(signer.engine, HMACEngine)
+    assert signer.engine is signer.engine
+    assert signer.encode_options()["engine"] is signer.engine
+    assert signer.decode_options()["engine"] is signer.engine
+    config.JWT_ALGORITHM = "RS256"
+    assert TokenSigner(config).engine is None
+
+
+def test_fastjwt_native_hmac():
+    native = FastJWT(config=FJWTConfig(JWT_SECRET_KEY=KEY, JWT_HMAC_ENGINE="native"))
+    pyjwt = FastJWT(config=FJWTConfig(JWT_SECRET_KEY=KEY))
+
+    bundle = native.create_token_pair(uid="test", data={"foo": "bar"})
+    assert pyjwt._decode_token(bundle.access_token).foo == "bar"
+    token = pyjwt.create_access_token(uid="test", fresh=True)
+    assert native._decode_token(token).fresh
+    tokens = list(native.create_tokens_bulk([{"uid": "test"}]))
+    assert pyjwt._decode_token(tokens[0]).sub == "test"
+
+
+def test_fastjwt_create_token_uses_native_engine(monkeypatch: pytest.MonkeyPatch):
+    fjwt = FastJWT(config=FJWTConfig(JWT_SECRET_KEY=KEY, JWT_HMAC_ENGINE="native"))
+    calls = []
+    encode = HMACEngine.encode
+
+    def counting_encode(self, claims, *args, **kwargs):
+        calls.append(claims["type"])
+        return encode(self, claims, *args, **kwargs)
+
+    monkeypatch.setattr(HMACEngine, "encode", counting_encode)
+    access_token = fjwt.create_access_token(uid="test")
+    refresh_token = fjwt.create_refresh_token(uid="test")
+    assert calls == ["access", "refresh"]
+    assert fjwt._decode_token(access_token).type == "access"
+    assert fjwt._decode_token(refresh_token).type == "refresh"
@@ -1,7 +1,11 @@
 import pytest
+from fastapi import Depends
+from fastapi import FastAPI
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
 
+from fastjwt.models import TokenBundle
 from fastjwt.models import RequestToken
 from fastjwt.models import TokenPayload
 from fastjwt.fastjwt import FastJWT
@@ -58,6 +62,22 @@ def test_verify_token(fjwt: FastJWT):
     assert payload.sub == "ocarinow"
 
 
+def test_create_token_pair(fjwt: FastJWT):
+    bundle = fjwt.create_token_pair(uid="ocarinow", fresh=True, data={"foo": "bar"})
+    assert isinstance(bundle, TokenBundle)
+    access = fjwt._decode_token(bundle.access_token)
+    refresh = fjwt._decode_token(bundle.refresh_token)
+    assert (access.type, refresh.type) == ("access", "refresh")
+    assert access.sub == refresh.sub == "ocarinow"
+    assert access.fresh
+    assert access.foo == refresh.foo == "bar"
+    assert (bundle.access.jti, bundle.access.csrf) == (access.jti, access.csrf)
+    assert (bundle.refresh.jti, bundle.refresh.csrf) == (refresh.jti, refresh.csrf)
+    assert bundle.access.expires_at == access.exp
+    assert bundle.refresh.expires_at == refresh.exp
+    assert bundle.access.expires_at < bundle.refresh.expires_at
+
+
 # endregion
 
 # region Cookies
@@ -80,6 +100,23 @@ def test_unset_wrong_token_type_cookie_exception(fjwt: FastJWT):
         fjwt._unset_cookies(type="bad_type", response=response)
 
 
+def test_create_tokens_compact_ids(fjwt: FastJWT):
+    fjwt.config.JWT_ID_FORMAT = "compact"
+    token = fjwt.create_access_token(uid="ocarinow")
+    payload = fjwt._decode_token(token)
+    assert len(payload.jti) == 22
+    assert len(payload.csrf) == 22
+
+    bundle = fjwt.create_token_pair(uid="ocarinow")
+    for issued in bundle:
+        assert len(issued.jti) == 22
+        assert len(issued.csrf) == 22
+    assert bundle.access.jti != bundle.refresh.jti
+
+    fjwt.config.JWT_ID_FORMAT = "uuid"
+    assert len(fjwt.create_token_pair(uid="ocarinow").access.jti) == 36
+
+
 def test_set_access_cookies(fjwt: FastJWT):
     response = JSONResponse(content={"foo": "bar"})
     token = fjwt.create_access_token(uid="ocarinow", fresh=True)
@@ -108,6 +145,27 @@ def test_set_refresh_cookies(fjwt: FastJWT):
     )
 
 
+def test_set_cookies_from_bundle(monkeypatch, fjwt: FastJWT):
+    def fail(*args, **kwargs):
+        raise AssertionError("Tokens should not be decoded")
+
+    monkeypatch.setattr(fjwt, "_decode_token", fail)
+    bundle = fjwt.create_token_pair(uid="ocarinow")
+    response = JSONResponse(content={"foo": "bar"})
+    fjwt.set_access_cookies(bundle, response=response)
+    fjwt.set_refresh_cookies(bundle, response=response)
+
+    cookies = [
+        cookie.split(";")[0] for cookie in response.headers.getlist("set-cookie")
+    ]
+    assert cookies == [
+        f"{fjwt.config.JWT_ACCESS_COOKIE_NAME}={bundle.access_token}",
+        f"{fjwt.config.JWT_ACCESS_CSRF_COOKIE_NAME}={bundle.access.csrf}",
+        f"{fjwt.config.JWT_REFRESH_COOKIE_NAME}={bundle.refresh_token}",
+        f"{fjwt.config.JWT_REFRESH_CSRF_COOKIE_NAME}={bundle.refresh.csrf}",
+    ]
+
+
 def test_unset_access_cookies(fjwt: FastJWT):
     response = JSONResponse(content={"foo": "bar"})
     fjwt.unset_access_cookies(response=response)
@@ -149,6 +207,62 @@ def test_unset_cookies(fjwt: FastJWT):
     )
 
 
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"JWT_COOKIE_DOMAIN": "example.com", "JWT_COOKIE_MAX_AGE": 600},
+        {"JWT_COOKIE_SECURE": False, "JWT_COOKIE_SAMESITE": "Strict"},
+        {"JWT_COOKIE_CSRF_PROTECT": False, "JWT_ACCESS_COOKIE_PATH": "/api"},
+    ],
+)
+def test_cookie_templates_match_starlette(monkeypatch, fjwt: FastJWT, options: dict):
+    monkeypatch.setattr("http.cookies._getdate", lambda *args: "Thu, 01 Jan 2026")
+    for name, value in options.items():
+        setattr(fjwt.config, name, value)
+    config = fjwt.config
+    csrf = config.JWT_COOKIE_CSRF_PROTECT and config.JWT_CSRF_IN_COOKIES
+    bundle = fjwt.create_token_pair(uid="test")
+
+    response = JSONResponse(content={})
+    fjwt.set_access_cookies(bundle, response=response, max_age=60)
+    fjwt.set_refresh_cookies(bundle, response=response)
+    fjwt.unset_access_cookies(response=response)
+    expected = JSONResponse(content={})
+    for type, token, issued, max_age in (
+        ("ACCESS", bundle.access_token, bundle.access, 60),
+        ("REFRESH", bundle.refresh_token, bundle.refresh, config.JWT_COOKIE_MAX_AGE),
+    ):
+        cookies = [(token, "", True)]
+        if csrf:
+            cookies.append((issued.csrf, "_CSRF", False))
+        for value, kind, httponly in cookies:
+            expected.set_cookie(
+                key=getattr(config, f"JWT_{type}{kind}_COOKIE_NAME"),
+                value=value,
+                path=getattr(config, f"JWT_{type}{kind}_COOKIE_PATH"),
+                domain=config.JWT_COOKIE_DOMAIN,
+                samesite=config.JWT_COOKIE_SAMESITE,
+                secure=config.JWT_COOKIE_SECURE,
+                httponly=httponly,
+                max_age=max_age,
+            )
+    expected.delete_cookie(
+        config.JWT_ACCESS_COOKIE_NAME,
+        path=config.JWT_ACCESS_COOKIE_PATH,
+        domain=config.JWT_COOKIE_DOMAIN,
+    )
+    if csrf:
+        expected.delete_cookie(
+            config.JWT_ACCESS_CSRF_COOKIE_NAME,
+            path=config.JWT_ACCESS_CSRF_COOKIE_PATH,
+            domain=config.JWT_COOKIE_DOMAIN,
+        )
+    assert response.headers.getlist("set-cookie") == expected.headers.getlist(
+        "set-cookie"
+    )
+
+
 # endregion
 
 # region Request
@@ -260,4 +374,98 @@ async def test_token_required(fjwt: FastJWT, access_token: str):
     assert access_token.type == "access"
 
 
+@pytest.mark.asyncio
+async def test_token_required_claims(fjwt: FastJWT):
+    token = fjwt.create_token_pair(
+        uid="test", data={"perms": ["read"] * 100, "name": "Test"}
+    ).access_token
+    req = Request(
+        scope={
+            "method": "GET",
+            "type": "http",
+            "headers": [[b"authorization", f"Bearer {token}".encode()]],
+        }
+    )
+
+    dependency = fjwt.token_required(claims=["sub", "name"])
+    payload = await dependency(request=req)
+    assert payload.dict() == {"sub": "test", "name": "Test"}
+    assert payload.extra_dict == {"name": "Test"}
+    assert payload.to_payload().sub == "test"
+    # Other claims remain accessible
+    assert payload.type == "access"
+    assert len(payload.perms) == 100
+
+    _, verified = fjwt.get_verified_token(req)
+    assert "perms" in verified.extra_dict
+
+
 # endregion
+
+
+@pytest.mark.asyncio
+async def test_get_verified_token(fjwt: FastJWT, access_token: str):
+    req = Request(
+        scope={
+            "method": "GET",
+            "type": "http",
+            "headers": [[b"authorization", f"Bearer {access_token}".encode()]],
+        }
+    )
+    assert fjwt.get_verified_token(req) is None
+    payload = await fjwt._auth_required(request=req)
+
+    request_token, verified_payload = fjwt.get_verified_token(req)
+    assert request_token.token == access_token
+    assert verified_payload is payload
+    assert fjwt.get_verified_token(req, type="refresh") is None
+
+
+def test_single_verification_per_request(monkeypatch, fjwt: FastJWT):
+    decodes = []
+    decode = RequestToken.decode
+
+    def counting_decode(self, *args, **kwargs):
+        decodes.append(self.token)
+        return decode(self, *args, **kwargs)
+
+    monkeypatch.setattr(RequestToken, "decode", counting_decode)
+    fjwt.config.JWT_COOKIE_CSRF_PROTECT = False
+    fjwt.config.JWT_IMPLICIT_REFRESH_DELTATIME = fjwt.config.JWT_ACCESS_TOKEN_EXPIRES
+    fjwt.set_subject_getter(lambda uid: {"uid": uid})
+
+    app = FastAPI()
+    app.middleware("http")(fjwt.implicit_refresh_middleware)
+
+    @app.get("/", dependencies=[fjwt.ACCESS_REQUIRED, fjwt.FRESH_REQUIRED])
+    def route(subject=fjwt.CURRENT_SUBJECT, payload=fjwt.ACCESS_REQUIRED):
+        return {"subject": subject, "sub": payload.sub}
+
+    access_token = fjwt.create_access_token(uid="hello", fresh=True)
+    client = TestClient(app)
+    client.cookies.set(fjwt.config.JWT_ACCESS_COOKIE_NAME, access_token)
+    response = client.get("/")
+    assert response.json() == {"subject": {"uid": "hello"}, "sub": "hello"}
+    assert decodes == [access_token]
+    # The middleware refreshed the token verified by the route
+    assert fjwt.config.JWT_ACCESS_COOKIE_NAME in response.headers["set-cookie"]
+
+
+def test_route_returns_verified_claims(fjwt: FastJWT, access_token: str):
+    app = FastAPI()
+
+    @app.get("/payload")
+    def payload(payload=fjwt.ACCESS_REQUIRED):
+        return payload
+
+    @app.get("/projected")
+    def projected(payload=Depends(fjwt.token_required(claims=["sub"]))):
+        return payload
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.get("/payload", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == fjwt._decode_token(access_token).dict(exclude_none=True)
+    response = client.get("/projected", headers=headers)
+    assert response.json() == {"sub": "hello"}
@@ -0,0 +1,212 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastjwt.config import FJWTConfig
+from fastjwt.fastjwt import FastJWT
+from fastjwt.middleware import FastJWTMiddleware
+from fastjwt.instrumentation import StageEvent
+from fastjwt.instrumentation import Instrumentation
+from fastjwt.instrumentation import PrometheusListener
+from fastjwt.instrumentation import OpenTelemetryListener
+
+
+@pytest.fixture(scope="function")
+def fjwt():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_TOKEN_LOCATION = ["headers", "cookies"]
+    fjwt = FastJWT(config=config)
+    fjwt.set_subject_getter(lambda uid: {"uid": uid})
+    fjwt.set_token_blocklist(lambda token: token == "revoked")
+    return fjwt
+
+
+def make_app(fjwt: FastJWT, middleware: bool = False) -> FastAPI:
+    app = FastAPI()
+    fjwt.handle_errors(app)
+    if middleware:
+        app.add_middleware(FastJWTMiddleware, security=fjwt)
+
+    @app.get("/me")
+    def me(subject=fjwt.CURRENT_SUBJECT):
+        return subject
+
+    return app
+
+
+def stages(events: List[StageEvent]):
+    return [(event.stage, event.outcome) for event in events]
+
+
+def test_instrumentation_disabled_without_listener():
+    instrumentation = Instrumentation()
+    assert not instrumentation
+    assert instrumentation.stage("decode") is instrumentation.stage("extract")
+    with instrumentation.stage("decode") as stage:
+        stage.mark("cached")
+
+
+def test_instrumentation_stage_timing():
+    instrumentation = Instrumentation()
+    events: List[StageEvent] = []
+    instrumentation.add_listener(events.append)
+    with instrumentation.stage("decode"):
+        pass
+    with instrumentation.stage("subject") as stage:
+        stage.mark("cached")
+    with pytest.raises(KeyError):
+        with instrumentation.stage("blocklist"):
+            raise KeyError("jti")
+
+    assert stages(events) == [
+        ("decode", "ok"),
+        ("subject", "cached"),
+        ("blocklist", "KeyError"),
+    ]
+    assert all(event.duration >= 0 for event in events)
+    assert events[0].start <= events[1].start <= events[2].start
+    assert isinstance(events[2].error, KeyError)
+
+    instrumentation.remove_listener(events.append)
+    assert not instrumentation
+    with pytest.raises(ValueError):
+        instrumentation.remove_listener(events.append)
+
+
+def test_fastjwt_stage_events(fjwt: FastJWT):
+    events: List[StageEvent] = []
+    fjwt.add_stage_listener(events.append)
+    client = TestClient(make_app(fjwt))
+    token = fjwt.create_access_token(uid="test")
+
+    response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert stages(events) == [
+        ("extract", "ok"),
+        ("blocklist", "ok"),
+        ("decode", "ok"),
+        ("claims", "ok"),
+        ("blocklist", "ok"),
+        ("subject", "ok"),
+    ]
+
+    events.clear()
+    response = client.get("/me")
+    assert response.status_code == 401
+    assert stages(events) == [("extract", "MissingTokenError")]
+
+    events.clear()
+    response = client.get("/me", headers={"Authorization": "Bearer revoked"})
+    assert response.status_code == 401
+    assert stages(events) == [("extract", "ok"), ("blocklist", "RevokedTokenError")]
+
+    fjwt.remove_stage_listener(events.append)
+    events.clear()
+    client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert events == []
+
+
+def test_fastjwt_stage_events_cached(fjwt: FastJWT):
+    fjwt.config.JWT_DECODE_CACHE_SIZE = 16
+    fjwt.config.JWT_SUBJECT_CACHE_SIZE = 16
+    events: List[StageEvent] = []
+    fjwt.add_stage_listener(events.append)
+    client = TestClient(make_app(fjwt))
+    headers = {"Authorization": f"Bearer {fjwt.create_access_token(uid='test')}"}
+
+    client.get("/me", headers=headers)
+    events.clear()
+    client.get("/me", headers=headers)
+    assert ("decode", "cached") in stages(events)
+    assert ("subject", "cached") in stages(events)
+
+
+def test_middleware_stage_events(fjwt: FastJWT):
+    events: List[StageEvent] = []
+    fjwt.add_stage_listener(events.append)
+    client = TestClient(make_app(fjwt, middleware=True))
+    token = fjwt.create_access_token(uid="test")
+
+    client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    # The dependency reuses the token verified by the middleware
+    assert stages(events) == [
+        ("extract", "ok"),
+        ("blocklist", "ok"),
+        ("decode", "ok"),
+        ("claims", "ok"),
+        ("blocklist", "ok"),
+        ("claims", "ok"),
+        ("subject", "ok"),
+    ]
+
+    events.clear()
+    client.get("/me")
+    assert stages(events)[0] == ("extract", "missing")
+
+
+class FakeHistogram:
+    def __init__(self):
+        self.observations = []
+
+    def labels(self, **labels):
+        histogram = self
+
+        class Child:
+            def observe(self, value):
+                histogram.observations.append((labels, value))
+
+        return Child()
+
+
+def test_prometheus_listener():
+    histogram = FakeHistogram()
+    listener = PrometheusListener(histogram)
+    listener(StageEvent("decode", "ok", 10.0, 0.002))
+    assert histogram.observations == [({"stage": "decode", "outcome": "ok"}, 0.002)]
+
+
+class FakeSpan:
+    def __init__(self, name, start_time, attributes):
+        self.name = name
+        self.start_time = start_time
+        self.attributes = attributes
+        self.end_time = None
+        self.exceptions = []
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def set_status(self, status):
+        self.status = status
+
+    def end(self, end_time=None):
+        self.end_time = end_time
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, start_time=None, attributes=None):
+        span = FakeSpan(name, start_time, attributes)
+        self.spans.append(span)
+        return span
+
+
+def test_opentelemetry_listener():
+    tracer = FakeTracer()
+    listener = OpenTelemetryListener(tracer)
+    error = ValueError("bad token")
+    listener(StageEvent("decode", "ok", 10.0, 0.002))
+    listener(StageEvent("extract", "ValueError", 11.0, 0.001, error))
+
+    decode, extract = tracer.spans
+    assert decode.name == "fastjwt.decode"
+    assert decode.attributes == {"fastjwt.stage": "decode", "fastjwt.outcome": "ok"}
+    assert decode.end_time - decode.start_time == 2_000_000
+    assert extract.start_time - decode.start_time == 1_000_000_000
+    assert decode.exceptions == []
+    assert extract.exceptions == [error]
@@ -0,0 +1,169 @@
+import os
+import json
+import base64
+
+import jwt
+import pytest
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fastjwt.config import FJWTConfig
+from fastjwt.models import RequestToken
+from fastjwt.fastjwt import FastJWT
+from fastjwt.keyring import KeyRing
+from fastjwt.exceptions import JWTDecodeError
+from fastjwt.exceptions import BadConfigurationError
+
+
+def oct_jwk(kid: str, secret: bytes) -> dict:
+    k = base64.urlsafe_b64encode(secret).rstrip(b"=").decode()
+    return {"kty": "oct", "kid": kid, "alg": "HS256", "k": k}
+
+
+@pytest.fixture(scope="module")
+def rsa_private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="function")
+def jwks(rsa_private_key):
+    rsa_jwk = RSAAlgorithm.to_jwk(rsa_private_key, as_dict=True)
+    rsa_jwk.update({"kid": "rsa-1", "alg": "RS256"})
+    return {"keys": [oct_jwk("oct-1", b"A" * 32), oct_jwk("oct-2", b"B" * 32), rsa_jwk]}
+
+
+@pytest.fixture(scope="function")
+def fjwt(jwks):
+    config = FJWTConfig()
+    config.JWT_JWKS = jwks
+    config.JWT_JWKS_SIGNING_KID = "oct-2"
+    return FastJWT(config=config)
+
+
+def test_keyring_index(jwks, rsa_private_key):
+    keyring = KeyRing(jwks=jwks)
+
+    assert sorted(keyring.kids) == ["oct-1", "oct-2", "rsa-1"]
+    assert keyring.get("oct-1").verifying_key == b"A" * 32
+    assert keyring.get("oct-1").algorithms == ["HS256"]
+    entry = keyring.get("rsa-1")
+    assert entry.algorithm == "RS256"
+    assert isinstance(entry.signing_key, rsa.RSAPrivateKey)
+    assert isinstance(entry.verifying_key, rsa.RSAPublicKey)
+    assert keyring.get("unknown") is None
+
+
+def test_keyring_bad_documents():
+    with pytest.raises(BadConfigurationError):
+        KeyRing()
+    with pytest.raises(BadConfigurationError):
+        KeyRing(jwks={"keys": "bad"})
+    with pytest.raises(BadConfigurationError):
+        KeyRing(jwks={"keys": [{"kty": "oct", "k": "QQ"}]})
+    with pytest.raises(BadConfigurationError):
+        KeyRing(path="/nonexistent/jwks.json")
+
+
+def test_keyring_file_reload(tmp_path, jwks):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": jwks["keys"][:1]}))
+    now = [0.0]
+    keyring = KeyRing(path=str(path), refresh_interval=10, timer=lambda: now[0])
+    assert keyring.kids == ["oct-1"]
+
+    path.write_text(json.dumps(jwks))
+    os.utime(path, ns=(1, 1))
+    # Modification is only checked once per refresh interval
+    now[0] = 5
+    assert keyring.get("oct-2") is None
+    now[0] = 11
+    assert keyring.get("oct-2") is not None
+
+    # An invalid document keeps the current keys
+    path.write_text("{")
+    os.utime(path, ns=(2, 2))
+    now[0] = 22
+    assert sorted(keyring.kids) == ["oct-1", "oct-2", "rsa-1"]
+
+
+def test_keyring_reload_evicts_cached_tokens(tmp_path, jwks):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(jwks))
+    config = FJWTConfig(
+        JWT_JWKS_FILE=str(path),
+        JWT_JWKS_SIGNING_KID="oct-2",
+        JWT_DECODE_CACHE_SIZE=8,
+    )
+    fjwt = FastJWT(config=config)
+    keyring = fjwt._signer.keyring
+    now = [0.0]
+    keyring.timer = lambda: now[0]
+    request_token = RequestToken(
+        token=fjwt.create_access_token(uid="test"), location="headers"
+    )
+    fjwt.verify_token(request_token, verify_csrf=False)
+    assert len(fjwt.token_cache) == 1
+
+    # The signing key is revoked from the JWKS
+    path.write_text(json.dumps({"keys": jwks["keys"][:1]}))
+    os.utime(path, ns=(1, 1))
+    now[0] = 10
+    with pytest.raises(JWTDecodeError):
+        fjwt.verify_token(request_token, verify_csrf=False)
+    assert keyring.version == 2
+
+
+def test_create_token_stamps_kid(fjwt: FastJWT):
+    token = fjwt.create_access_token(uid="test")
+    assert jwt.get_unverified_header(token)["kid"] == "oct-2"
+    assert fjwt._decode_token(token).sub == "test"
+
+    fjwt.config.JWT_JWKS_SIGNING_KID = "rsa-1"
+    token = fjwt.create_access_token(uid="test")
+    header = jwt.get_unverified_header(token)
+    assert header["kid"] == "rsa-1"
+    assert header["alg"] == "RS256"
+    request_token = RequestToken(token=token, location="headers")
+    assert fjwt.verify_token(request_token, verify_csrf=False).sub == "test"
+
+
+def test_decode_with_rotated_keys(fjwt: FastJWT):
+    token = jwt.encode(
+        {"sub": "test", "type": "access"},
+        key=b"A" * 32,
+        algorithm="HS256",
+        headers={"kid": "oct-1"},
+    )
+    assert fjwt._decode_token(token).sub == "test"
+
+    # Wrong key for the announced kid
+    token = jwt.encode(
+        {"sub": "test"}, key=b"A" * 32, algorithm="HS256", headers={"kid": "oct-2"}
+    )
+    with pytest.raises(JWTDecodeError):
+        fjwt._decode_token(token)
+
+
+def test_decode_unknown_or_missing_kid(fjwt: FastJWT):
+    token = jwt.encode(
+        {"sub": "test"}, key=b"A" * 32, algorithm="HS256", headers={"kid": "oct-3"}
+    )
+    with pytest.raises(JWTDecodeError):
+        fjwt._decode_token(token)
+
+    token = jwt.encode({"sub": "test"}, key=b"A" * 32, algorithm="HS256")
+    with pytest.raises(JWTDecodeError):
+        fjwt._decode_token(token)
+
+    # Tokens without kid are verified with the configured secret
+    fjwt.config.JWT_SECRET_KEY = "S" * 32
+    token = jwt.encode({"sub": "test"}, key="S" * 32, algorithm="HS256")
+    assert fjwt._decode_token(token).sub == "test"
+
+
+def test_signing_kid_requires_jwks():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_JWKS_SIGNING_KID = "oct-1"
+    with pytest.raises(BadConfigurationError):
+        FastJWT(config=config).create_access_token(uid="test")
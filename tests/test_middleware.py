@@ -0,0 +1,225 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from fastjwt.config import FJWTConfig
+from fastjwt.models import RequestToken
+from fastjwt.fastjwt import FastJWT
+from fastjwt.middleware import FastJWTMiddleware
+
+
+@pytest.fixture(scope="function")
+def fjwt():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_TOKEN_LOCATION = ["headers", "cookies", "json"]
+    config.JWT_IMPLICIT_REFRESH_DELTATIME = config.JWT_ACCESS_TOKEN_EXPIRES
+    return FastJWT(config=config)
+
+
+@pytest.fixture(scope="function")
+def app(fjwt: FastJWT):
+    app = FastAPI()
+    app.add_middleware(FastJWTMiddleware, security=fjwt)
+
+    @app.get("/protected")
+    def protected(payload=fjwt.ACCESS_REQUIRED):
+        return {"sub": payload.sub}
+
+    @app.get("/public")
+    def public(request: Request):
+        verified = fjwt.get_verified_token(request)
+        return {"verified": verified is not None}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    @app.post("/json")
+    def json(payload=fjwt.ACCESS_REQUIRED):
+        return {"sub": payload.sub}
+
+    return app
+
+
+def test_middleware_verifies_once(monkeypatch, fjwt: FastJWT, app: FastAPI):
+    decodes = []
+    decode = RequestToken.decode
+
+    def counting_decode(self, *args, **kwargs):
+        decodes.append(self.token)
+        return decode(self, *args, **kwargs)
+
+    monkeypatch.setattr(RequestToken, "decode", counting_decode)
+    token = fjwt.create_access_token(uid="test")
+    client = TestClient(app)
+    response = client.get("/protected", headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"sub": "test"}
+    assert decodes == [token]
+    # Only cookies are refreshed
+    assert "set-cookie" not in response.headers
+
+    assert client.get("/public").json() == {"verified": False}
+    response = client.get("/public", headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"verified": True}
+
+
+def test_middleware_refreshes_streaming_responses(fjwt: FastJWT, app: FastAPI):
+    token = fjwt.create_access_token(uid="test")
+    client = TestClient(app)
+    client.cookies.set(fjwt.config.JWT_ACCESS_COOKIE_NAME, token)
+    response = client.get("/stream")
+    assert response.content == b"abc"
+    assert response.headers["set-cookie"].startswith(
+        f"{fjwt.config.JWT_ACCESS_COOKIE_NAME}="
+    )
+    new_token = response.headers["set-cookie"].split(";")[0].split("=", 1)[1]
+    assert new_token != token
+    assert fjwt._decode_token(new_token).sub == "test"
+
+    # No refresh for tokens far from expiry
+    fjwt.config.JWT_IMPLICIT_REFRESH_DELTATIME = (
+        fjwt.config.JWT_ACCESS_TOKEN_EXPIRES / 2
+    )
+    assert "set-cookie" not in client.get("/stream").headers
+
+
+@pytest.mark.asyncio
+async def test_middleware_single_flight_refresh(fjwt: FastJWT, app: FastAPI):
+    signed = []
+    issue_tokens = fjwt._issue_tokens_async
+
+    async def counting_issue_tokens(specs):
+        tokens = await issue_tokens(specs)
+        signed.extend(tokens)
+        return tokens
+
+    fjwt._issue_tokens_async = counting_issue_tokens
+    token = fjwt.create_access_token(uid="test")
+    cookies = {fjwt.config.JWT_ACCESS_COOKIE_NAME: token}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test", cookies=cookies
+    ) as client:
+        responses = await asyncio.gather(*(client.get("/stream") for _ in range(20)))
+        responses.append(await client.get("/stream", cookies=cookies))
+
+    assert len(signed) == 1
+    cookies = {tuple(response.headers.get_list("set-cookie")) for response in responses}
+    assert len(cookies) == 1
+    assert cookies.pop()[0].startswith(
+        f"{fjwt.config.JWT_ACCESS_COOKIE_NAME}={signed[0].token};"
+    )
+    assert fjwt.refresh_registry.info().currsize == 1
+
+
+def test_middleware_invalid_tokens(fjwt: FastJWT, app: FastAPI):
+    client = TestClient(app, raise_server_exceptions=False)
+    response = client.get("/protected", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 500
+    assert "set-cookie" not in response.headers
+
+    refresh_token = fjwt.create_refresh_token(uid="test")
+    client.cookies.set(fjwt.config.JWT_ACCESS_COOKIE_NAME, refresh_token)
+    response = client.get("/stream")
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+
+
+def test_middleware_leaves_body_to_dependencies(fjwt: FastJWT, app: FastAPI):
+    fjwt.config.JWT_TOKEN_LOCATION = ["json", "headers"]
+    token = fjwt.create_access_token(uid="test")
+    client = TestClient(app)
+    response = client.post("/json", json={"access_token": token})
+    assert response.json() == {"sub": "test"}
+
+
+@pytest.mark.parametrize(
+    "options,expected",
+    [
+        ({}, {"/stream": True, "/api/a": True}),
+        (
+            {"JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE": ["/api/*", "/stream"]},
+            {"/stream": False, "/api/a": False, "/api/a/b": False, "/apix": True},
+        ),
+        (
+            {
+                "JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE": ["/api/private/*"],
+                "JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE": ["/api/*"],
+                "JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE": ["GET"],
+            },
+            {"/api/private/a": False, "/api/a": True, "/stream": False},
+        ),
+        (
+            {
+                "JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE": ["POST"],
+                "JWT_IMPLICIT_REFRESH_METHOD_INCLUDE": ["GET"],
+            },
+            {"/stream": True, "/api/a": True},
+        ),
+        (
+            {"JWT_IMPLICIT_REFRESH_METHOD_INCLUDE": ["POST", "PUT"]},
+            {"/stream": False, "/api/a": False},
+        ),
+        (
+            {
+                "JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE": ["/api/*"],
+                "JWT_IMPLICIT_REFRESH_METHOD_INCLUDE": ["POST"],
+            },
+            {"/stream": False, "/api/a": True},
+        ),
+        (
+            {"JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE": ["/items/?", "/v[12]/*"]},
+            {"/items/1": False, "/items/12": True, "/v2/a": False, "/v3/a": True},
+        ),
+    ],
+)
+def test_implicit_refresh_rules(fjwt: FastJWT, options: dict, expected: dict):
+    for name, value in options.items():
+        setattr(fjwt.config, name, value)
+    for path, enabled in expected.items():
+        request = Request(
+            {"type": "http", "method": "GET", "path": path, "headers": []}
+        )
+        assert fjwt._implicit_refresh_enabled_for_request(request) is enabled
+        request = Request(
+            {"type": "http", "method": "get", "path": path, "headers": []}
+        )
+        assert fjwt._implicit_refresh_enabled_for_request(request) is enabled
+    rules = fjwt.config._memoize("implicit_refresh_rules", None)
+    if rules.route_exclude or rules.route_include:
+        assert rules.route_decision.cache_info().hits == len(expected)
+
+
+def test_implicit_refresh_rules_apply_to_middleware(fjwt: FastJWT, app: FastAPI):
+    fjwt.config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE = ["/st*"]
+    fjwt.config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE = ["GET"]
+    fjwt.config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE = ["POST"]
+    client = TestClient(app)
+    client.cookies.set(
+        fjwt.config.JWT_ACCESS_COOKIE_NAME, fjwt.create_access_token(uid="test")
+    )
+    assert "set-cookie" not in client.get("/stream").headers
+    assert "set-cookie" not in client.get("/public").headers
+    fjwt.config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE = []
+    # Only the included methods are refreshed
+    assert "set-cookie" not in client.get("/public").headers
+    fjwt.config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE = ["GET", "POST"]
+    assert "set-cookie" not in client.get("/stream").headers
+    assert "set-cookie" in client.get("/public").headers
+
+
+def test_implicit_refresh_rules_exact_paths_not_memoized(fjwt: FastJWT):
+    fjwt.config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE = ["/stream"]
+    for item in range(3):
+        request = Request(
+            {"type": "http", "method": "GET", "path": f"/items/{item}", "headers": []}
+        )
+        assert fjwt._implicit_refresh_enabled_for_request(request)
+    rules = fjwt.config._memoize("implicit_refresh_rules", None)
+    assert not hasattr(rules.route_decision, "cache_info")
@@ -1,3 +1,5 @@
+import copy
+import pickle
 import datetime
 
 import jwt
@@ -5,6 +7,7 @@ import pytest
 
 from fastjwt.models import RequestToken
 from fastjwt.models import TokenPayload
+from fastjwt.models import VerifiedClaims
 from fastjwt.exceptions import CSRFError
 from fastjwt.exceptions import JWTDecodeError
 from fastjwt.exceptions import TokenTypeError
@@ -266,3 +269,126 @@ def test_validation_error_on_verify():
             verify_type=False,
             verify_jwt=False,
         )
+
+
+def test_verified_claims(valid_token: RequestToken, valid_payload: TokenPayload):
+    claims = valid_token.verify("SECRET", ["HS256"], verify_csrf=False)
+    assert isinstance(claims, VerifiedClaims)
+    assert claims.sub == valid_payload.sub
+    assert claims.jti == valid_payload.jti
+    assert claims.exp == valid_payload.exp
+    assert claims.fresh is True
+    assert claims.copy() is claims
+    assert claims.issued_at is claims.issued_at
+    assert claims.expiry_datetime == datetime.datetime.fromtimestamp(
+        valid_payload.exp, tz=datetime.timezone.utc
+    )
+    assert claims.time_until_expiry > datetime.timedelta(0)
+    with pytest.raises(AttributeError):
+        claims.sub = "other"
+    with pytest.raises(AttributeError):
+        claims.unknown
+
+    payload = claims.to_payload()
+    assert isinstance(payload, TokenPayload)
+    assert payload.sub == claims.sub
+    assert claims.to_payload() is not payload
+
+
+def test_verified_claims_extra_data():
+    claims = VerifiedClaims(
+        {"sub": "test", "iat": 0, "foo": "bar", "scopes": ["read", "write"]}
+    )
+    assert claims.foo == "bar"
+    assert claims.extra_dict == {"foo": "bar"}
+    assert claims.extra_dict is claims.extra_dict
+    assert claims.has_scopes("read", "write")
+    assert not claims.has_scopes("admin")
+    assert claims.dict() == {
+        "sub": "test",
+        "iat": 0,
+        "foo": "bar",
+        "scopes": ["read", "write"],
+    }
+    assert claims.to_payload().foo == "bar"
+    with pytest.raises(TypeError):
+        claims.expiry_datetime
+    with pytest.raises(JWTDecodeError):
+        VerifiedClaims({"exp": "tomorrow"})
+
+
+def test_verified_claims_projection():
+    claims = VerifiedClaims({"sub": "test", "exp": 1, "foo": "bar", "baz": [1, 2]})
+    view = claims.project(["sub", "foo", "missing"])
+    assert view.dict() == {"sub": "test", "foo": "bar"}
+    assert view.extra_dict == {"foo": "bar"}
+    assert view.exp == 1
+    assert view.baz == [1, 2]
+    assert view.to_payload().exp == 1
+    assert view.to_payload().foo == "bar"
+    assert not hasattr(view.to_payload(), "baz")
+    assert view.project(["sub", "baz"]).dict() == {"sub": "test"}
+    assert claims.dict() == {"sub": "test", "exp": 1, "foo": "bar", "baz": [1, 2]}
+
+
+def test_verified_claims_mapping():
+    claims = VerifiedClaims({"sub": "test", "exp": 1, "foo": "bar"})
+    assert dict(claims) == {"sub": "test", "exp": 1, "foo": "bar"}
+    assert claims["foo"] == "bar"
+    assert len(claims) == 3
+    assert "foo" in claims
+    view = claims.project(["sub", "foo"])
+    assert dict(view) == {"sub": "test", "foo": "bar"}
+    assert "exp" not in view
+    with pytest.raises(KeyError):
+        view["exp"]
+    with pytest.raises(AttributeError):
+        claims._unknown
+
+
+def test_verified_claims_dict_arguments():
+    claims = {"sub": "test", "exp": 1, "csrf": None, "fresh": False, "foo": "bar"}
+    verified = VerifiedClaims(claims)
+    payload = TokenPayload.parse_obj(claims)
+    for kwargs in (
+        {"include": {"sub", "foo"}},
+        {"exclude": {"exp", "foo"}},
+        {"include": {"sub": True, "csrf": True}, "exclude_none": True},
+    ):
+        # Only the decoded claims are set
+        assert verified.dict(**kwargs) == payload.dict(exclude_unset=True, **kwargs)
+    assert verified.dict(exclude_defaults=True) == {
+        "sub": "test",
+        "exp": 1,
+        "foo": "bar",
+    }
+    assert verified.project(["sub", "exp"]).dict(exclude={"exp"}) == {"sub": "test"}
+
+
+def test_verified_claims_copy_pickle():
+    claims = VerifiedClaims({"sub": "test", "iat": 0, "foo": [1, 2]})
+    claims.issued_at
+    for clone in (
+        copy.copy(claims),
+        copy.deepcopy(claims),
+        pickle.loads(pickle.dumps(claims)),
+    ):
+        assert clone == claims
+        assert clone.foo == [1, 2]
+        assert clone.issued_at == claims.issued_at
+    assert copy.deepcopy(claims).foo is not claims.foo
+
+    view = pickle.loads(pickle.dumps(claims.project(["sub"])))
+    assert view.dict() == {"sub": "test"}
+    assert view.foo == [1, 2]
+
+
+def test_verified_claims_projection_to_payload(
+    valid_token: RequestToken, valid_payload: TokenPayload
+):
+    claims = valid_token.verify("SECRET", ["HS256"], verify_csrf=False)
+    payload = claims.project(["sub"]).to_payload()
+    assert payload.jti == valid_payload.jti
+    assert payload.iat == valid_payload.iat
+    assert payload.exp == valid_payload.exp
+    assert payload.fresh is True
@@ -0,0 +1,183 @@
+import time
+import asyncio
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fastjwt.config import FJWTConfig
+from fastjwt.models import RequestToken
+from fastjwt.fastjwt import FastJWT
+from fastjwt.offload import LoopLagMonitor
+from fastjwt.offload import CryptoOffloader
+
+
+@pytest.fixture(scope="module")
+def rsa_keys():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def offload_fjwt(rsa_keys, mode: str) -> FastJWT:
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PRIVATE_KEY, config.JWT_PUBLIC_KEY = rsa_keys
+    config.JWT_CRYPTO_OFFLOAD = mode
+    config.JWT_CRYPTO_OFFLOAD_THRESHOLD = datetime.timedelta(0)
+    return FastJWT(config=config)
+
+
+def test_offloader_from_config():
+    config = FJWTConfig()
+    assert CryptoOffloader.from_config(config) is None
+    config.JWT_CRYPTO_OFFLOAD_LAG_INTERVAL = datetime.timedelta(milliseconds=10)
+    offload = CryptoOffloader.from_config(config)
+    assert offload.mode == "inline"
+    assert offload.monitor.interval == 0.01
+    config.JWT_CRYPTO_OFFLOAD = "thread"
+    config.JWT_CRYPTO_OFFLOAD_WORKERS = 2
+    offload = FastJWT(config=config).crypto_offload
+    assert offload.mode == "thread"
+    assert offload.workers == 2
+    assert offload.threshold == 0.0001
+
+
+def test_offloader_shutdown_on_config_update():
+    config = FJWTConfig(JWT_CRYPTO_OFFLOAD="thread")
+    fjwt = FastJWT(config=config)
+    offload = fjwt.crypto_offload
+    executor = offload.thread_executor
+    assert fjwt.crypto_offload is offload
+
+    config.JWT_CRYPTO_OFFLOAD_WORKERS = 2
+    assert offload._thread_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+    assert fjwt.crypto_offload is not offload
+    fjwt.crypto_offload.shutdown()
+
+
+def test_offloader_shutdown_on_load_config():
+    fjwt = FastJWT(config=FJWTConfig(JWT_CRYPTO_OFFLOAD="thread"))
+    offload = fjwt.crypto_offload
+    executor = offload.thread_executor
+
+    fjwt.load_config(FJWTConfig(JWT_CRYPTO_OFFLOAD="thread"))
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+    assert fjwt.crypto_offload is not offload
+    fjwt.crypto_offload.shutdown()
+
+
+def test_offloader_should_offload():
+    offload = CryptoOffloader(mode="thread", threshold=0.001)
+    assert not offload.should_offload("sign", "RS256")
+    offload._record("sign", "RS256", 0.002)
+    assert offload.should_offload("sign", "RS256")
+    offload._record("verify", "RS256", 0.0001)
+    assert not offload.should_offload("verify", "RS256")
+    offload._record("sign", "HS256", 1)
+    assert not offload.should_offload("sign", "HS256")
+    assert not CryptoOffloader(mode="inline", threshold=0).should_offload(
+        "sign", "RS256"
+    )
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor():
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.05)
+    await asyncio.sleep(0.02)
+    monitor.stop()
+    stats = monitor.stats
+    assert stats.samples >= 2
+    assert stats.max >= 0.03
+    assert 0 < stats.mean <= stats.max
+    monitor.reset()
+    assert monitor.stats == (0, 0.0, 0.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_offload_sign_and_verify(rsa_keys, mode: str):
+    fjwt = offload_fjwt(rsa_keys, mode)
+    offload = fjwt.crypto_offload
+    try:
+        # First operations are measured inline, the next ones offloaded
+        bundle = await fjwt.create_token_pair_async(uid="test", data={"foo": "bar"})
+        token = await fjwt.create_access_token_async(uid="test", fresh=True)
+        refresh = await fjwt.create_refresh_token_async(uid="test")
+        assert offload.stats.inline == 2
+        assert offload.stats.offloaded == 2
+        assert offload.stats.costs[("sign", "RS256")] > 0
+
+        for encoded, type in (
+            (bundle.access_token, "access"),
+            (token, "access"),
+            (refresh, "refresh"),
+        ):
+            request_token = RequestToken(token=encoded, location="headers", type=type)
+            payload = await fjwt.verify_token_async(request_token)
+            assert payload.sub == "test"
+        assert payload.type == "refresh"
+        assert offload.stats.offloaded == 4
+        assert fjwt._decode_token(bundle.access_token).foo == "bar"
+        assert fjwt._decode_token(token).fresh
+    finally:
+        offload.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_offload_symmetric_stays_inline():
+    config = FJWTConfig(
+        JWT_SECRET_KEY="SECRET" * 6,
+        JWT_CRYPTO_OFFLOAD="thread",
+        JWT_CRYPTO_OFFLOAD_THRESHOLD=datetime.timedelta(0),
+    )
+    fjwt = FastJWT(config=config)
+    for _ in range(3):
+        token = await fjwt.create_access_token_async(uid="test")
+        request_token = RequestToken(token=token, location="headers")
+        await fjwt.verify_token_async(request_token)
+    assert fjwt.crypto_offload.stats.offloaded == 0
+    assert fjwt.crypto_offload._thread_executor is None
+
+
+def test_offload_dependencies(rsa_keys):
+    fjwt = offload_fjwt(rsa_keys, "thread")
+    fjwt.config.JWT_CRYPTO_OFFLOAD_LAG_INTERVAL = datetime.timedelta(milliseconds=1)
+    app = FastAPI()
+
+    @app.get("/protected")
+    async def protected(payload=fjwt.ACCESS_REQUIRED):
+        await asyncio.sleep(0.01)
+        return {"sub": payload.sub}
+
+    headers = {"Authorization": f"Bearer {fjwt.create_access_token(uid='test')}"}
+    with TestClient(app) as client:
+        for _ in range(3):
+            assert client.get("/protected", headers=headers).json() == {"sub": "test"}
+    stats = fjwt.crypto_offload.stats
+    assert stats.inline == 1
+    assert stats.offloaded == 2
+    assert stats.loop_lag.samples > 0
+    fjwt.crypto_offload.shutdown()
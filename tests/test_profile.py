@@ -0,0 +1,185 @@
+import pickle
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastjwt.codec import get_codec
+from fastjwt.token import decode_token
+from fastjwt.config import FJWTConfig
+from fastjwt.models import RequestToken
+from fastjwt.fastjwt import FastJWT
+from fastjwt.profile import ProfileCodec
+from fastjwt.profile import compact_claims
+from fastjwt.exceptions import BadConfigurationError
+from fastjwt.exceptions import AccessTokenRequiredError
+
+KEY = "SECRET" * 6
+ALIASES = {"permissions": "p", "tenant": "t"}
+
+
+def profile_fjwt(profile: str = "standard", **options) -> FastJWT:
+    config = FJWTConfig(JWT_SECRET_KEY=KEY, JWT_TOKEN_PROFILE=profile, **options)
+    return FastJWT(config=config)
+
+
+def test_compact_claims():
+    claims = {
+        "sub": "test",
+        "iat": 1_600_000_000.7,
+        "nbf": 1_600_000_000.2,
+        "exp": 1_600_000_900.7,
+        "type": "access",
+        "fresh": False,
+        "csrf": None,
+        "scopes": None,
+        "permissions": ["read"],
+        "extra": None,
+    }
+    compact = compact_claims(claims, ALIASES)
+    assert compact == {
+        "sub": "test",
+        "iat": 1_600_000_000,
+        "nbf": 1_600_000_001,
+        "exp": 1_600_000_900,
+        "p": ["read"],
+        "extra": None,
+    }
+    assert all(isinstance(compact[name], int) for name in ("iat", "nbf", "exp"))
+    refresh = compact_claims({"type": "refresh", "fresh": True})
+    assert refresh == {"type": "refresh", "fresh": True}
+
+
+def test_profile_codec_round_trip():
+    codec = ProfileCodec(get_codec("json"), aliases=ALIASES)
+    claims = {"sub": "test", "type": "refresh", "permissions": ["read"], "x": 1}
+    assert codec.loads(codec.dumps(claims)) == claims
+    assert b'"p":["read"]' in codec.dumps(claims)
+    with pytest.raises(ValueError):
+        codec.dumps({"sub": "test", "t": 1})
+
+    standard = ProfileCodec(get_codec("json"), "standard", ALIASES)
+    assert standard.dumps({"fresh": False, "tenant": "a"}) == b'{"fresh":false,"t":"a"}'
+
+
+def test_profile_codec_pickle():
+    codec = ProfileCodec(get_codec("json"), aliases=ALIASES)
+    clone = pickle.loads(pickle.dumps(codec))
+    assert clone.name == "compact+json"
+    assert clone.aliases == ALIASES
+    assert clone.dumps({"tenant": "a"}) == b'{"t":"a"}'
+
+
+@pytest.mark.parametrize(
+    "aliases",
+    [
+        {"sub": "s"},
+        {"tenant": "exp"},
+        {"tenant": "t", "team": "t"},
+        {"tenant": "team", "team": "t"},
+    ],
+)
+def test_profile_codec_bad_aliases(aliases: dict):
+    with pytest.raises(BadConfigurationError):
+        ProfileCodec(get_codec("json"), aliases=aliases)
+
+
+def test_signer_profile_codec():
+    assert not isinstance(profile_fjwt()._signer.codec, ProfileCodec)
+    codec = profile_fjwt("compact")._signer.codec
+    assert isinstance(codec, ProfileCodec)
+    assert codec.profile == "compact"
+    codec = profile_fjwt(JWT_CLAIM_ALIASES=ALIASES)._signer.codec
+    assert isinstance(codec, ProfileCodec)
+    assert codec.profile == "standard"
+
+
+@pytest.mark.parametrize("native", [False, True])
+def test_compact_tokens_are_smaller(native: bool):
+    options = {"JWT_HMAC_ENGINE": "native" if native else "pyjwt"}
+    standard = profile_fjwt(**options)
+    compact = profile_fjwt("compact", JWT_CLAIM_ALIASES=ALIASES, **options)
+    data = {"permissions": ["read", "write"], "tenant": "acme"}
+
+    standard_token = standard.create_access_token(uid="test")
+    compact_token = compact.create_access_token(uid="test")
+    assert len(compact_token) < len(standard_token)
+    claims = decode_token(compact_token, key=KEY)
+    assert "type" not in claims and "fresh" not in claims
+    assert isinstance(claims["iat"], int)
+
+    bundle = compact.create_token_pair(uid="test", data=data)
+    assert len(bundle.access_token) < len(
+        standard.create_token_pair(uid="test", data=data).access_token
+    )
+    assert compact._decode_token(bundle.access_token).tenant == "acme"
+
+
+def test_profiles_interoperate():
+    standard = profile_fjwt()
+    compact = profile_fjwt("compact")
+    for issuer, verifier in ((standard, compact), (compact, compact)):
+        for type, token in (
+            ("access", issuer.create_access_token(uid="test", fresh=True)),
+            ("access", issuer.create_access_token(uid="test")),
+            ("refresh", issuer.create_refresh_token(uid="test")),
+        ):
+            request_token = RequestToken(token=token, location="headers", type=type)
+            payload = verifier.verify_token(request_token)
+            assert payload.sub == "test"
+            assert payload.type == type
+            assert verifier._decode_token(token).type == type
+            assert payload.to_payload().type == type
+
+    # Compact refresh tokens keep their type claim
+    token = compact.create_refresh_token(uid="test")
+    request_token = RequestToken(token=token, location="headers", type="refresh")
+    assert standard.verify_token(request_token).type == "refresh"
+
+
+def test_standard_profile_requires_type_claim():
+    standard = profile_fjwt()
+    tokens = [
+        jwt.encode({"sub": "test", "jti": "a", "iat": 0}, KEY, algorithm="HS256"),
+        profile_fjwt("compact").create_access_token(uid="test"),
+    ]
+    app = FastAPI()
+    standard.handle_errors(app)
+
+    @app.get("/protected")
+    def protected(payload=standard.ACCESS_REQUIRED):
+        return {"sub": payload.sub}
+
+    client = TestClient(app)
+    for token in tokens:
+        request_token = RequestToken(token=token, location="headers")
+        with pytest.raises(AccessTokenRequiredError):
+            standard.verify_token(request_token)
+        assert standard._decode_token(token).type is None
+        response = client.get(
+            "/protected", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 401
+
+
+def test_compact_profile_dependencies():
+    fjwt = profile_fjwt("compact", JWT_CLAIM_ALIASES=ALIASES)
+    app = FastAPI()
+    fjwt.handle_errors(app)
+
+    @app.get("/protected")
+    async def protected(payload=fjwt.ACCESS_REQUIRED):
+        return {"sub": payload.sub, "tenant": payload.tenant}
+
+    token = fjwt.create_token_pair(uid="test", data={"tenant": "acme"}).access_token
+    with TestClient(app) as client:
+        response = client.get(
+            "/protected", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.json() == {"sub": "test", "tenant": "acme"}
+        refresh = fjwt.create_refresh_token(uid="test")
+        response = client.get(
+            "/protected", headers={"Authorization": f"Bearer {refresh}"}
+        )
+        assert response.status_code == 401
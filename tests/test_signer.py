@@ -0,0 +1,127 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fastjwt.config import FJWTConfig
+from fastjwt.models import RequestToken
+from fastjwt.signer import TokenSigner
+from fastjwt.fastjwt import FastJWT
+from fastjwt.exceptions import BadConfigurationError
+
+
+@pytest.fixture(scope="module")
+def rsa_keys():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def test_signer_symmetric_keys():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    signer = TokenSigner(config)
+
+    assert signer.algorithm == "HS256"
+    assert signer.algorithms == ["HS256"]
+    assert signer.signing_key == b"SECRET"
+    assert signer.verifying_key == b"SECRET"
+
+
+def test_signer_asymmetric_keys_are_parsed_once(rsa_keys):
+    private_pem, public_pem = rsa_keys
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PRIVATE_KEY = private_pem
+    config.JWT_PUBLIC_KEY = public_pem
+    signer = TokenSigner(config)
+
+    assert isinstance(signer.signing_key, rsa.RSAPrivateKey)
+    assert isinstance(signer.verifying_key, rsa.RSAPublicKey)
+    assert signer.signing_key is signer.signing_key
+    assert signer.verifying_key is signer.verifying_key
+
+
+def test_signer_verification_only(rsa_keys):
+    _, public_pem = rsa_keys
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PUBLIC_KEY = public_pem
+    signer = TokenSigner(config)
+
+    assert isinstance(signer.verifying_key, rsa.RSAPublicKey)
+    with pytest.raises(BadConfigurationError):
+        signer.signing_key
+
+
+def test_signer_bad_configuration():
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "BAD_ALGO"
+    with pytest.raises(BadConfigurationError):
+        TokenSigner(config)
+
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PRIVATE_KEY = "NOT A PEM KEY"
+    with pytest.raises(BadConfigurationError):
+        TokenSigner(config).signing_key
+
+
+def test_signer_decode_options():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    config.JWT_DECODE_AUDIENCE = "aud"
+    config.JWT_DECODE_ISSUER = "iss"
+    config.JWT_DECODE_LEEWAY = 3
+    signer = TokenSigner(config)
+
+    assert signer.decode_options() == {
+        "key": b"SECRET",
+        "algorithms": ["HS256"],
+        "audience": "aud",
+        "issuer": "iss",
+        "leeway": 3,
+        "codec": signer.codec,
+        "engine": None,
+    }
+    options = signer.decode_options(audience="other", issuer="other")
+    assert options["audience"] == "other"
+    assert options["issuer"] == "other"
+
+
+def test_fastjwt_asymmetric_round_trip(rsa_keys):
+    private_pem, public_pem = rsa_keys
+    config = FJWTConfig()
+    config.JWT_ALGORITHM = "RS256"
+    config.JWT_PRIVATE_KEY = private_pem
+    config.JWT_PUBLIC_KEY = public_pem
+    config.JWT_ENCODE_AUDIENCE = "api"
+    config.JWT_DECODE_AUDIENCE = "api"
+    fjwt = FastJWT(config=config)
+
+    token = fjwt.create_access_token(uid="test")
+    assert fjwt._decode_token(token).sub == "test"
+    request_token = RequestToken(token=token, location="headers")
+    assert fjwt.verify_token(request_token, verify_csrf=False).aud == "api"
+
+
+def test_fastjwt_signer_reset_on_config_update():
+    config = FJWTConfig()
+    config.JWT_SECRET_KEY = "SECRET"
+    fjwt = FastJWT(config=config)
+    signer = fjwt._signer
+    assert signer is fjwt._signer
+
+    config.JWT_SECRET_KEY = "OTHER_SECRET"
+    assert fjwt._signer is not signer
+    assert fjwt._signer.signing_key == b"OTHER_SECRET"
@@ -7,8 +7,13 @@ from typing import Coroutine
 import pytest
 from fastapi import Request
 
+from fastjwt.core import MISSING_CSRF
+from fastjwt.core import MISSING_HEADER
+from fastjwt.core import _TokenResolver
 from fastjwt.core import _get_token_from_json
 from fastjwt.core import _get_token_from_query
+from fastjwt.core import _find_token_in_cookies
+from fastjwt.core import _find_token_in_headers
 from fastjwt.core import _get_token_from_cookies
 from fastjwt.core import _get_token_from_headers
 from fastjwt.core import _get_token_from_request
@@ -189,6 +194,49 @@ async def test_get_token_from_headers_with_token_exception(config: FJWTConfig):
         await _get_token_from_headers(request=req, config=config)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (b"Bearer TOKEN", "TOKEN"),
+        (b"bearer TOKEN", "TOKEN"),
+        (b"BEARER   TOKEN ", "TOKEN"),
+        (b"Basic dXNlcg==, Bearer TOKEN", "TOKEN"),
+        (b"Bearer TOKEN, Basic dXNlcg==", "TOKEN"),
+        (b"TOKEN", None),
+        (b"BearerTOKEN", None),
+        (b"Bearer ", None),
+        (b"Basic dXNlcg==", None),
+    ],
+)
+async def test_get_token_from_headers_strict_type(
+    config: FJWTConfig, value: bytes, expected: str
+):
+    req = Request(scope={"type": "http", "headers": [[b"authorization", value]]})
+    if expected is None:
+        with pytest.raises(MissingTokenError):
+            await _get_token_from_headers(request=req, config=config)
+    else:
+        request_token = await _get_token_from_headers(request=req, config=config)
+        assert request_token.token == expected
+
+
+@pytest.mark.asyncio
+async def test_get_token_from_headers_scanned_once(config: FJWTConfig):
+    scope = {"type": "http", "headers": [[b"authorization", b"Bearer TOKEN"]]}
+    await _get_token_from_headers(request=Request(scope=scope), config=config)
+    scope["headers"] = []
+    request_token = await _get_token_from_headers(
+        request=Request(scope=scope), config=config
+    )
+    assert request_token.token == "TOKEN"
+
+    # Headers are scanned again for another configuration
+    config.JWT_HEADER_NAME = "X-Authorization"
+    with pytest.raises(MissingTokenError):
+        await _get_token_from_headers(request=Request(scope=scope), config=config)
+
+
 # endregion
 
 # region Cookies
@@ -307,6 +355,39 @@ async def test_get_token_from_cookies_post_with_missing_token_exception(
         await _get_token_from_cookies(request=req, config=config)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cookies,expected",
+    [
+        ([b"access_token_cookie=TOKEN"], "TOKEN"),
+        ([b"a=1; access_token_cookie=TOKEN; b=2"], "TOKEN"),
+        ([b"a=1;access_token_cookie=TOKEN"], "TOKEN"),
+        ([b'access_token_cookie="TOKEN"'], "TOKEN"),
+        ([b"a=1", b"access_token_cookie=TOKEN"], "TOKEN"),
+        ([b"access_token_cookie=OLD; access_token_cookie=TOKEN"], "TOKEN"),
+        ([b"my_access_token_cookie=TOKEN"], None),
+        ([b"a=access_token_cookie=TOKEN"], None),
+        ([b"access_token_cookie="], None),
+    ],
+)
+async def test_get_token_from_cookies_raw(
+    config: FJWTConfig, cookies: List[bytes], expected: str
+):
+    req = Request(
+        scope={
+            "method": "GET",
+            "type": "http",
+            "headers": [[b"cookie", cookie] for cookie in cookies],
+        }
+    )
+    if expected is None:
+        with pytest.raises(MissingTokenError):
+            await _get_token_from_cookies(request=req, config=config)
+    else:
+        request_token = await _get_token_from_cookies(request=req, config=config)
+        assert request_token.token == expected
+
+
 # endregion
 
 
@@ -480,3 +561,51 @@ async def test_get_token_from_request_with_locations(
 
 
 # endregion
+
+
+@pytest.mark.asyncio
+async def test_token_finders_return_misses(config: FJWTConfig):
+    req = Request(
+        scope={
+            "method": "POST",
+            "type": "http",
+            "headers": [[b"cookie", f"{config.JWT_ACCESS_COOKIE_NAME}=TOKEN".encode()]],
+        }
+    )
+    config.JWT_CSRF_CHECK_FORM = False
+    assert await _find_token_in_headers(req, config) is MISSING_HEADER
+    assert await _find_token_in_cookies(req, config) is MISSING_CSRF
+    with pytest.raises(MissingCSRFTokenError):
+        await _get_token_from_cookies(request=req, config=config)
+
+
+def test_token_resolver_compiled_once(config: FJWTConfig):
+    config.JWT_TOKEN_LOCATION = ["json", "headers", "cookies"]
+    resolver = config._memoize("token_resolver", _TokenResolver)
+    assert config._memoize("token_resolver", _TokenResolver) is resolver
+    assert [location for location, _ in resolver.access] == [
+        "json",
+        "headers",
+        "cookies",
+    ]
+    # Refresh tokens follow the configured order
+    assert [location for location, _ in resolver.refresh] == ["json", "cookies"]
+
+    config.JWT_TOKEN_LOCATION = ["headers"]
+    resolver = config._memoize("token_resolver", _TokenResolver)
+    assert resolver.refresh == ()
+
+
+@pytest.mark.asyncio
+async def test_get_token_from_request_aggregated_error(config: FJWTConfig):
+    config.JWT_TOKEN_LOCATION = ["headers", "query"]
+    req = Request(scope={"type": "http", "headers": [], "query_string": b""})
+    with pytest.raises(MissingTokenError) as exc_info:
+        await _get_token_from_request(request=req, config=config)
+    assert exc_info.value.args == (
+        "Missing 'Bearer' in 'Authorization' header.",
+        "Missing 'token' in query parameters",
+    )
+    with pytest.raises(MissingTokenError) as exc_info:
+        await _get_token_from_request(request=req, config=config, refresh=True)
+    assert exc_info.value.args == ("No token found in request from '[]'",)
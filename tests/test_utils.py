@@ -1,10 +1,15 @@
+import os
+import uuid
+import base64
 import datetime
 
-import pytest
-
+from fastjwt import utils
+from fastjwt.utils import IDGenerator
 from fastjwt.utils import get_now
 from fastjwt.utils import get_uuid
 from fastjwt.utils import get_now_ts
+from fastjwt.utils import get_compact_id
+from fastjwt.utils import get_id_factory
 
 
 def test_util_get_now():
@@ -19,3 +24,43 @@ def test_util_get_now_ts():
 def test_util_get_uuid():
     assert isinstance(get_uuid(), str)
     assert len(get_uuid()) >= 1
+
+
+def test_util_id_generator(monkeypatch):
+    calls = []
+    real_urandom = os.urandom
+
+    def urandom(size: int) -> bytes:
+        calls.append(size)
+        return real_urandom(size)
+
+    monkeypatch.setattr(utils.os, "urandom", urandom)
+    generator = IDGenerator(batch=4)
+    ids = [generator.uuid4() for _ in range(5)] + [generator.compact()]
+    assert calls == [64, 64]
+    assert len(set(ids)) == 6
+    for value in ids[:5]:
+        assert str(uuid.UUID(value)) == value
+        assert uuid.UUID(value).version == 4
+    assert len(ids[5]) == 22
+    assert len(base64.urlsafe_b64decode(ids[5] + "==")) == 16
+
+    generator.reset()
+    generator.compact()
+    assert calls == [64, 64, 64]
+
+
+def test_util_id_generator_fork():
+    generator = IDGenerator()
+    generator.uuid4()
+    assert generator._offset == 16
+    utils._reset_generators()
+    assert generator._offset == 0
+    assert generator._buffer == b""
+
+
+def test_util_get_id_factory():
+    assert get_id_factory() is get_uuid
+    assert get_id_factory("uuid") is get_uuid
+    assert get_id_factory("compact") is get_compact_id
+    assert len(get_compact_id()) == 22